@@ -0,0 +1,103 @@
+"""
+Cost of one PnL summary refresh as `closed_positions` grows: recomputing it
+from the table versus reading the incrementally maintained `analytics`
+rollup.
+
+    python benchmarks/bench_analytics.py [rows ...]
+
+Output is milliseconds per refresh (median of 10) per history size, plus
+the cost of folding one new trade in.
+"""
+
+import asyncio, datetime as dt, json, os, pathlib, statistics, sys, tempfile, time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+for var in ["HELIUS_WSS", "RUGCHECK_KEY", "BIRDEYE_KEY", "BASE_WALLET", "KEYPAIR_PATH"]:
+    os.environ.setdefault(var, "bench")
+os.environ.setdefault("ENV_PATH", "/dev/null")
+_TMP = tempfile.mkdtemp(prefix="bench-analytics-")
+os.environ["DB_DSN"] = f"sqlite+aiosqlite:///{_TMP}/analytics.db"  # never the live DB
+
+from sqlalchemy import delete, insert, select
+
+from pumpfun_sniper import db
+from pumpfun_sniper.analytics import Analytics, Rollup
+
+T0 = dt.datetime(2026, 1, 1)
+
+
+async def _seed(rows: int) -> None:
+    async with db.session_ctx() as s:
+        await s.execute(delete(db.ClosedPos))
+        await s.execute(
+            insert(db.ClosedPos),
+            [
+                dict(
+                    mint=f"m{i}",
+                    qty=1.0,
+                    entry_price=1.0,
+                    exit_price=1.1,
+                    pnl=0.1 if i % 3 else -0.2,
+                    opened_at=T0 + dt.timedelta(seconds=30 * i),
+                    closed_at=T0 + dt.timedelta(seconds=30 * i + i % 900),
+                )
+                for i in range(rows)
+            ],
+        )
+        await s.commit()
+
+
+async def _recompute() -> dict:
+    """What a summary costs without the rollup: read every trade."""
+    cols = (db.ClosedPos.id, db.ClosedPos.pnl, db.ClosedPos.opened_at)
+    async with db.session_ctx() as s:
+        rows = (
+            await s.execute(select(*cols, db.ClosedPos.closed_at).order_by(cols[0]))
+        ).all()
+    r = Rollup()
+    for row in rows:
+        r.add(*row)
+    return r.summary()
+
+
+async def _ms(fn, n: int = 10) -> float:
+    out = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        await fn()
+        out.append((time.perf_counter() - t0) * 1000)
+    return round(statistics.median(out), 3)
+
+
+async def _run(sizes: list[int]) -> dict:
+    await db.init()
+    res = {}
+    for rows in sizes:
+        await _seed(rows)
+        a = Analytics()
+        await a.load()
+
+        async def rollup():
+            a.summary()
+
+        t0 = time.perf_counter()
+        for i in range(1000):
+            a.record(rows + 1 + i, 0.1, T0, T0 + dt.timedelta(seconds=60))
+        record_us = (time.perf_counter() - t0) * 1e6 / 1000
+
+        res[rows] = {
+            "recompute_ms": await _ms(_recompute),
+            "rollup_ms": await _ms(rollup),
+            "record_us": round(record_us, 2),
+        }
+    await db.log_sink.close()
+    await db.engine.dispose()
+    return res
+
+
+def run(sizes: list[int] | None = None) -> dict:
+    return asyncio.run(_run(sizes or [1_000, 10_000, 100_000]))
+
+
+if __name__ == "__main__":
+    print(json.dumps(run([int(a) for a in sys.argv[1:]] or None), indent=2))
@@ -0,0 +1,125 @@
+"""
+Frames/sec of the Helius frame decoder: the original `json.loads` + regex
+path versus the `decoder` fast path (create pre‑filter, orjson, Borsh).
+
+    python benchmarks/bench_decoder.py [frames] [--corpus frames.jsonl]
+
+Without `--corpus` a deterministic synthetic corpus is used (~5 % creates,
+the rest trades), which mirrors the pump.fun log mix. A recorded corpus is
+one raw websocket frame per line.
+"""
+
+import base64, json, os, pathlib, random, re, struct, sys, time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+for var in ["HELIUS_WSS", "RUGCHECK_KEY", "BIRDEYE_KEY", "BASE_WALLET", "KEYPAIR_PATH"]:
+    os.environ.setdefault(var, "bench")
+os.environ.setdefault("DB_DSN", "sqlite+aiosqlite://")
+os.environ.setdefault("ENV_PATH", "/dev/null")
+
+from solders.pubkey import Pubkey
+
+from pumpfun_sniper import decoder
+from pumpfun_sniper.debug import dbg
+from pumpfun_sniper.pricefeed import TRADE_DISCRIMINATOR
+
+NAME_RE = re.compile(rb"name\x04(.+?)\x00")
+SYMB_RE = re.compile(rb"symbol\x06(.+?)\x00")
+
+
+def _borsh(s: str) -> bytes:
+    b = s.encode()
+    return struct.pack("<I", len(b)) + b
+
+
+def _frame(i: int, logs: list[str]) -> str:
+    value = {"signature": f"sig{i}", "err": None, "logs": logs}
+    msg = {"jsonrpc": "2.0", "method": "logsNotification"}
+    msg["params"] = {
+        "result": {"context": {"slot": i}, "value": value},
+        "subscription": 1,
+    }
+    return json.dumps(msg)
+
+
+def make_corpus(n: int, create_ratio: float = 0.05, seed: int = 7) -> list[str]:
+    rnd = random.Random(seed)
+    keys = [bytes(Pubkey.new_unique()) for _ in range(64)]
+    frames = []
+    for i in range(n):
+        head = [
+            "Program ComputeBudget111111111111111111111111111111 invoke [1]",
+            "Program ComputeBudget111111111111111111111111111111 success",
+            "Program 6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P invoke [1]",
+        ]
+        if rnd.random() < create_ratio:
+            ev = decoder.CREATE_DISCRIMINATOR + _borsh(f"Token {i}") + _borsh(f"T{i}")
+            ev += _borsh(f"https://ipfs.io/ipfs/{i}") + b"".join(rnd.sample(keys, 3))
+            body = ["Program log: Instruction: Create"]
+        else:
+            ev = (
+                TRADE_DISCRIMINATOR
+                + rnd.choice(keys)
+                + struct.pack(
+                    "<QQ?32sqQQ",
+                    10**8,
+                    10**12,
+                    True,
+                    rnd.choice(keys),
+                    i,
+                    3 * 10**10,
+                    10**15,
+                )
+            )
+            body = ["Program log: Instruction: Buy"]
+        body.append("Program data: " + base64.b64encode(ev).decode())
+        tail = ["Program 6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P success"]
+        frames.append(_frame(i, head + body + tail))
+    return frames
+
+
+def legacy(raw: str):
+    """The pre‑decoder hot path, for comparison."""
+    dbg(f"HELIUS recv {raw}")
+    data = json.loads(raw)
+    if "params" not in data:
+        return None
+    logs = data["params"]["result"]["value"]["logs"]
+    try:
+        b64 = next(l.split(" ")[-1] for l in logs if "base64" in l)
+        meta = base64.b64decode(b64)
+        return NAME_RE.search(meta).group(1), SYMB_RE.search(meta).group(1)
+    except Exception:
+        return None
+
+
+def fast(raw: str):
+    if not decoder.is_create(raw):
+        return None
+    value = decoder.parse(raw)
+    return decoder.find_create(value["logs"]) if value else None
+
+
+def run(frames: int = 50_000, corpus: list[str] | None = None) -> dict:
+    corpus = corpus or make_corpus(frames)
+    out = {}
+    for label, fn in (("legacy", legacy), ("fast", fast)):
+        t0 = time.perf_counter()
+        for raw in corpus:
+            fn(raw)
+        out[f"{label}_frames_per_sec"] = len(corpus) / (time.perf_counter() - t0)
+    out["creates_decoded"] = sum(fast(r) is not None for r in corpus)
+    out["json_backend"] = decoder.loads.__module__
+    return out
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    corpus = None
+    if "--corpus" in args:
+        path = args.pop(args.index("--corpus") + 1)
+        args.remove("--corpus")
+        corpus = pathlib.Path(path).read_text().splitlines()
+    res = run(int(args[0]) if args else 50_000, corpus)
+    for k, v in res.items():
+        print(f"{k:24s} {v:14,.1f}" if isinstance(v, float) else f"{k:24s} {v:>14}")
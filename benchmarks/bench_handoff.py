@@ -0,0 +1,80 @@
+"""
+Latency from a create frame arriving to its candidate being queued in the
+evaluator, through the real `handle_frame` → SQLite insert → `bus` path.
+
+    python benchmarks/bench_handoff.py [candidates]
+
+Before the bus, a candidate waited for the next 5 s `_eval_loop` poll
+(2.5 s on average, 5 s worst case) on top of the insert shown here.
+"""
+
+import asyncio, base64, json, os, pathlib, statistics, sys, time
+
+HERE = pathlib.Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+sys.path.insert(0, str(HERE))
+for var in ["HELIUS_WSS", "RUGCHECK_KEY", "BIRDEYE_KEY", "BASE_WALLET", "KEYPAIR_PATH"]:
+    os.environ.setdefault(var, "bench")
+os.environ.setdefault("ENV_PATH", "/dev/null")
+
+from bench_replay import _borsh, _frame  # sets a scratch DB_DSN
+
+from solders.pubkey import Pubkey
+
+from pumpfun_sniper import db, decoder, strategy
+from pumpfun_sniper.bus import bus
+from pumpfun_sniper.evaluator import Evaluator
+from pumpfun_sniper.helius_watcher import handle_frame
+from pumpfun_sniper.seen_index import index
+
+
+def _creates(n: int) -> list[str]:
+    user = bytes(Pubkey.new_unique())
+    out = []
+    for i in range(n):
+        ev = decoder.CREATE_DISCRIMINATOR + _borsh(f"Handoff {i}") + _borsh("H")
+        ev += _borsh("https://ipfs.io/ipfs/h")
+        ev += bytes(Pubkey.new_unique()) + bytes(Pubkey.new_unique()) + user
+        logs = [
+            "Program log: Instruction: Create",
+            "Program data: " + base64.b64encode(ev).decode(),
+        ]
+        out.append(_frame(f"h{i}", logs))
+    return out
+
+
+async def _run(n: int) -> dict:
+    await db.init()
+    await index.load()
+    engine = Evaluator(strategy.step_candidate)
+    queued: dict[str, float] = {}
+    strategy.subscribe(engine)
+    bus.subscribe(
+        "candidate", lambda row: queued.setdefault(row.mint, time.perf_counter())
+    )
+    lat = []
+    try:
+        for raw in _creates(n):
+            before = len(queued)
+            t0 = time.perf_counter()
+            await handle_frame(raw)
+            if len(queued) > before:
+                lat.append((list(queued.values())[-1] - t0) * 1000)
+    finally:
+        await db.log_sink.close()
+        await db.engine.dispose()
+    return {
+        "candidates": len(lat),
+        "in_flight": engine.stats()["in_flight"],
+        "handoff_ms_p50": round(statistics.median(lat), 3),
+        "handoff_ms_p95": round(statistics.quantiles(lat, n=20)[-1], 3),
+        "handoff_ms_max": round(max(lat), 3),
+    }
+
+
+def run(n: int = 500) -> dict:
+    return asyncio.run(_run(n))
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(int(sys.argv[1]) if len(sys.argv) > 1 else 500), indent=2))
@@ -0,0 +1,120 @@
+"""
+Query latency of the NEW‑candidate sweep and the dashboard window queries
+as the tables grow, with and without the secondary indexes.
+
+    python benchmarks/bench_indexes.py [rows ...]
+
+For each size the candidates table holds `rows` REJECTED / BOUGHT rows plus
+20 NEW ones and `logs` / `closed_positions` hold `rows` rows each. Output is
+milliseconds per query (median of 20) per size, indexed vs. unindexed.
+"""
+
+import asyncio, datetime as dt, json, os, pathlib, statistics, sys, tempfile, time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+for var in ["HELIUS_WSS", "RUGCHECK_KEY", "BIRDEYE_KEY", "BASE_WALLET", "KEYPAIR_PATH"]:
+    os.environ.setdefault(var, "bench")
+os.environ.setdefault("ENV_PATH", "/dev/null")
+_TMP = tempfile.mkdtemp(prefix="bench-indexes-")
+os.environ["DB_DSN"] = f"sqlite+aiosqlite:///{_TMP}/indexes.db"  # never the live DB
+
+from sqlalchemy import delete, insert, select
+
+from pumpfun_sniper import db
+
+QUERIES = {
+    "new_sweep": lambda: select(db.Candidate).where(db.Candidate.status == "NEW"),
+    "candidates_window": lambda: select(db.Candidate)
+    .order_by(db.Candidate.created_at.desc())
+    .limit(500),
+    "closed_window": lambda: select(db.ClosedPos)
+    .order_by(db.ClosedPos.closed_at.desc())
+    .limit(500),
+    "logs_window": lambda: select(db.LogEntry)
+    .order_by(db.LogEntry.ts.desc())
+    .limit(500),
+}
+
+
+async def _seed(rows: int) -> None:
+    t0 = dt.datetime(2026, 1, 1)
+    async with db.session_ctx() as s:
+        for model in (db.Candidate, db.ClosedPos, db.LogEntry):
+            await s.execute(delete(model))
+        cands = [
+            dict(
+                mint=f"m{i}",
+                name=f"n{i}",
+                symbol="S",
+                creator="c",
+                created_at=t0 + dt.timedelta(seconds=i),
+                status="NEW" if i % max(rows // 20, 1) == 0 else "REJECTED",
+            )
+            for i in range(rows)
+        ]
+        await s.execute(insert(db.Candidate), cands)
+        await s.execute(
+            insert(db.ClosedPos),
+            [
+                dict(
+                    mint=f"m{i}",
+                    qty=1.0,
+                    entry_price=1.0,
+                    exit_price=1.1,
+                    pnl=0.1,
+                    opened_at=t0,
+                    closed_at=t0 + dt.timedelta(seconds=i),
+                )
+                for i in range(rows)
+            ],
+        )
+        await s.execute(
+            insert(db.LogEntry),
+            [
+                dict(ts=t0 + dt.timedelta(seconds=i), level="INFO", msg=f"l{i}")
+                for i in range(rows)
+            ],
+        )
+        await s.commit()
+
+
+async def _time(stmt, reps: int = 20) -> float:
+    samples = []
+    for _ in range(reps):
+        async with db.session_ctx() as s:
+            t0 = time.perf_counter()
+            (await s.scalars(stmt)).all()
+            samples.append((time.perf_counter() - t0) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def _drop_indexes(conn) -> None:
+    for table in db.Base.metadata.sorted_tables:
+        for idx in table.indexes:
+            idx.drop(conn, checkfirst=True)
+
+
+async def run(sizes: list[int]) -> dict:
+    await db.init()
+    out = {}
+    try:
+        for rows in sizes:
+            await _seed(rows)
+            res = {"indexed": {}, "unindexed": {}}
+            async with db.engine.begin() as conn:
+                await conn.run_sync(db._create_indexes)
+            for name, q in QUERIES.items():
+                res["indexed"][name] = await _time(q())
+            async with db.engine.begin() as conn:
+                await conn.run_sync(_drop_indexes)
+            for name, q in QUERIES.items():
+                res["unindexed"][name] = await _time(q())
+            out[rows] = res
+    finally:
+        await db.engine.dispose()
+    return out
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or [10_000, 100_000, 500_000]
+    print(json.dumps(asyncio.run(run(sizes)), indent=2))
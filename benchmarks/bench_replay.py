@@ -0,0 +1,116 @@
+"""
+Replay throughput of the full watcher → strategy → executor pipeline over a
+synthetic recording (or a real one from `RECORD_PATH`).
+
+    python benchmarks/bench_replay.py [minutes] [--launches N] [--recording F]
+
+The synthetic market launches N tokens per minute; each trades every ~2 s
+on a random walk for ten minutes and gets RugCheck reports after its grace
+period (about a third pass). Output is the replay summary (its `digest` is
+stable across runs) plus frames/sec and speed‑up over real time.
+"""
+
+import base64, json, os, pathlib, random, struct, sys, tempfile
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+for var in ["HELIUS_WSS", "RUGCHECK_KEY", "BIRDEYE_KEY", "BASE_WALLET", "KEYPAIR_PATH"]:
+    os.environ.setdefault(var, "bench")
+os.environ.setdefault("ENV_PATH", "/dev/null")
+_TMP = tempfile.mkdtemp(prefix="bench-replay-")
+os.environ["DB_DSN"] = f"sqlite+aiosqlite:///{_TMP}/replay.db"  # never the live DB
+
+import asyncio
+
+from solders.pubkey import Pubkey
+
+from pumpfun_sniper import decoder, replay
+from pumpfun_sniper.pricefeed import TRADE_DISCRIMINATOR
+from pumpfun_sniper.recorder import Recorder
+
+T0 = 1_700_000_000.0
+_SOL = replay._SOL
+_GOOD = {
+    "totalHolders": 120,
+    "lpLockedPct": 100,
+    "creatorBalance": 0,
+    "price": 0.0001,
+    "token": {"decimals": 6},
+    "markets": [{"lp": {"tokenSupply": 10**15}}],
+}
+
+
+def _borsh(s: str) -> bytes:
+    b = s.encode()
+    return struct.pack("<I", len(b)) + b
+
+
+def _frame(sig: str, logs: list[str]) -> str:
+    value = {"signature": sig, "err": None, "logs": logs}
+    params = {"result": {"context": {"slot": 0}, "value": value}, "subscription": 1}
+    return json.dumps(
+        {"jsonrpc": "2.0", "method": "logsNotification", "params": params}
+    )
+
+
+def make_recording(
+    path: str, minutes: float = 30, launches: int = 5, seed: int = 7
+) -> int:
+    """Write a synthetic recording; returns the number of events."""
+    rnd = random.Random(seed)
+    user = bytes(Pubkey.new_unique())
+    events = []
+    for n in range(int(minutes * launches)):
+        t = T0 + n * 60 / launches + rnd.random()
+        mint, curve = bytes(Pubkey.new_unique()), bytes(Pubkey.new_unique())
+        ev = decoder.CREATE_DISCRIMINATOR + _borsh(f"Token {n}") + _borsh(f"T{n}")
+        ev += _borsh(f"https://ipfs.io/ipfs/{n}") + mint + curve + user
+        logs = [
+            "Program log: Instruction: Create",
+            "Program data: " + base64.b64encode(ev).decode(),
+        ]
+        events.append((t, "frame", _frame(f"c{n}", logs)))
+
+        v_sol, v_tok = 30 * 10**9, 1_073_000_000 * 10**6
+        drift = rnd.choice([0.01, 0.002, -0.004])  # mooners, crabs and rugs
+        good = rnd.random() < 0.35
+        mint_s = str(Pubkey.from_bytes(mint))
+        for k, dt in enumerate((25, 55, 85)):
+            report = _GOOD if good and k >= 1 else {**_GOOD, "totalHolders": 10}
+            events.append((t + dt, "rug", {"mint": mint_s, "report": report}))
+        ts = t
+        for k in range(300):
+            ts += rnd.uniform(1, 3)
+            v_sol = max(int(v_sol * (1 + drift + rnd.gauss(0, 0.03))), 10**6)
+            data = TRADE_DISCRIMINATOR + mint
+            data += struct.pack(
+                "<QQ?32sqQQ", 10**8, 10**12, True, user, 0, v_sol, v_tok
+            )
+            logs = [
+                "Program log: Instruction: Buy",
+                "Program data: " + base64.b64encode(data).decode(),
+            ]
+            events.append((ts, "frame", _frame(f"t{n}.{k}", logs)))
+    events.sort(key=lambda e: e[0])
+    rec = Recorder(path)
+    for ts, kind, payload in events:
+        rec.record(kind, payload, ts=ts)
+    rec.close()
+    return len(events)
+
+
+def run(minutes: float = 30, launches: int = 5, recording: str | None = None) -> dict:
+    if recording is None:
+        recording = os.path.join(_TMP, "synthetic.jsonl.gz")
+        make_recording(recording, minutes, launches)
+    return asyncio.run(replay.replay(recording))
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    kw = {}
+    for flag, cast in (("--launches", int), ("--recording", str)):
+        if flag in args:
+            kw[flag[2:]] = cast(args.pop(args.index(flag) + 1))
+            args.remove(flag)
+    res = run(float(args[0]) if args else 30, **kw)
+    print(json.dumps(res, indent=2))
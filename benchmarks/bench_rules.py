@@ -0,0 +1,103 @@
+"""
+Reports/sec of the token filter: the original hard‑coded `is_good` versus
+the compiled `rules` closures and the NumPy batch path.
+
+    python benchmarks/bench_rules.py [reports]
+
+Reports are synthetic RugCheck responses (deterministic seed); about 7 %
+pass the default `FILTER_RULES`.
+"""
+
+import os, pathlib, random, sys, time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+for var in ["HELIUS_WSS", "RUGCHECK_KEY", "BIRDEYE_KEY", "BASE_WALLET", "KEYPAIR_PATH"]:
+    os.environ.setdefault(var, "bench")
+os.environ.setdefault("DB_DSN", "sqlite+aiosqlite://")
+os.environ.setdefault("ENV_PATH", "/dev/null")
+
+from pumpfun_sniper import rules
+
+THRESHOLDS = {
+    "holders": 50,
+    "lp_locked_pct": 70,
+    "creator_balance_pct": 10,
+    "market_cap_usd": 2000,
+}
+
+
+def make_reports(n: int, seed: int = 7) -> list[dict]:
+    rnd = random.Random(seed)
+    out = []
+    for _ in range(n):
+        supply = rnd.choice([0, 10**12, 10**15])
+        out.append(
+            {
+                "totalHolders": rnd.randint(0, 200),
+                "lpLockedPct": rnd.uniform(0, 100),
+                "creatorBalance": int(supply * rnd.uniform(0, 0.2)),
+                "price": rnd.uniform(0, 0.01),
+                "token": {"decimals": 6},
+                "markets": [{"lp": {"tokenSupply": supply}}] if supply else [],
+                "risks": [{}] * rnd.randint(0, 3),
+                "score": rnd.randint(0, 1000),
+            }
+        )
+    return out
+
+
+def legacy(tok: dict) -> bool:
+    """The pre‑rules `rugcheck.is_good`, for comparison."""
+    try:
+        holders = tok.get("totalHolders", 0)
+        lp_locked = tok.get("lpLockedPct") or 0
+        token_info = tok.get("token") or {}
+        decimals = token_info.get("decimals", 0) if isinstance(token_info, dict) else 0
+        markets = tok.get("markets") or []
+        supply = 0
+        if markets and isinstance(markets[0], dict):
+            supply = markets[0].get("lp", {}).get("tokenSupply", 0)
+        creator_balance = tok.get("creatorBalance", 0)
+        creator_pct = creator_balance / supply * 100 if supply else 0
+        price = tok.get("price", 0)
+        market_cap = price * (supply / (10**decimals)) if supply else 0
+        return (
+            holders >= THRESHOLDS["holders"]
+            and lp_locked >= THRESHOLDS["lp_locked_pct"]
+            and creator_pct <= THRESHOLDS["creator_balance_pct"]
+            and market_cap >= THRESHOLDS["market_cap_usd"]
+        )
+    except (KeyError, TypeError, ZeroDivisionError):
+        return False
+
+
+def run(n: int = 100_000) -> dict:
+    reports = make_reports(n)
+    rs = rules.RuleSet(rules.parse(rules.settings.FILTER_RULES))
+    out = {}
+
+    t0 = time.perf_counter()
+    expected = [legacy(t) for t in reports]
+    out["legacy_reports_per_sec"] = n / (time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    single = [not rs.failures(t) for t in reports]
+    out["compiled_reports_per_sec"] = n / (time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    feats = rs.matrix(reports)
+    t1 = time.perf_counter()
+    first = rs.first_failure(feats)
+    t2 = time.perf_counter()
+    out["batch_reports_per_sec"] = n / (t2 - t0)
+    out["batch_eval_only_per_sec"] = n / (t2 - t1)  # features already extracted
+
+    assert single == expected == list(first < 0), "rule paths disagree"
+    out["passing"] = sum(expected)
+    return out
+
+
+if __name__ == "__main__":
+    res = run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
+    for k, v in res.items():
+        print(f"{k:26s} {v:14,.1f}" if isinstance(v, float) else f"{k:26s} {v:>14}")
@@ -0,0 +1,78 @@
+"""
+Events/sec of the Helius name/creator filter: per‑event DB lookups
+(`name_seen` + `creator_blocked`) versus the in‑memory `seen_index`.
+
+    python benchmarks/bench_seen_index.py [history] [events]
+
+Runs against a throw‑away SQLite file, fully offline.
+"""
+
+import asyncio, os, pathlib, sys, tempfile, time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+_DB = pathlib.Path(tempfile.gettempdir()) / "bench_seen_index.db"
+for var in ["HELIUS_WSS", "RUGCHECK_KEY", "BIRDEYE_KEY", "BASE_WALLET", "KEYPAIR_PATH"]:
+    os.environ.setdefault(var, "bench")
+os.environ.setdefault("DB_DSN", f"sqlite+aiosqlite:///{_DB}")
+os.environ.setdefault("ENV_PATH", "/dev/null")
+
+from sqlalchemy import insert
+
+from pumpfun_sniper import db, helius_watcher
+from pumpfun_sniper.seen_index import SeenIndex
+
+
+async def run(history: int = 50_000, events: int = 2_000) -> dict:
+    _DB.unlink(missing_ok=True)
+    await db.init()
+    async with db.session_ctx() as s:
+        await s.execute(
+            insert(db.SeenName), [{"name": f"tok{i}"} for i in range(history)]
+        )
+        await s.execute(
+            insert(db.BlockedCreator), [{"creator": f"bad{i}"} for i in range(100)]
+        )
+        await s.commit()
+    # half the events hit a seen name, the rest are fresh
+    sample = [
+        (f"tok{i * 7 % history}" if i % 2 else f"new{i}", f"c{i}")
+        for i in range(events)
+    ]
+
+    t0 = time.perf_counter()
+    for name, creator in sample:
+        await helius_watcher.name_seen(name) or await helius_watcher.creator_blocked(
+            creator
+        )
+    db_rate = events / (time.perf_counter() - t0)
+
+    idx = SeenIndex(bloom=False)
+    t0 = time.perf_counter()
+    await idx.load()
+    load_sec = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for name, creator in sample * 100:
+        idx.check(name, creator)
+    mem_rate = events * 100 / (time.perf_counter() - t0)
+
+    bloom = SeenIndex(bloom=True, capacity=history * 2)
+    await bloom.load()
+    t0 = time.perf_counter()
+    for name, creator in sample * 100:
+        bloom.check(name, creator)
+    bloom_rate = events * 100 / (time.perf_counter() - t0)
+
+    await db.engine.dispose()
+    _DB.unlink(missing_ok=True)
+    return {
+        "db_events_per_sec": db_rate,
+        "index_events_per_sec": mem_rate,
+        "bloom_events_per_sec": bloom_rate,
+        "index_load_sec": load_sec,
+    }
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    for k, v in asyncio.run(run(*args)).items():
+        print(f"{k:24s} {v:14,.1f}")
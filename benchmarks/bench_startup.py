@@ -0,0 +1,135 @@
+"""
+Time to first event after a (re)start: a watcher process is spawned against
+a local stand‑in websocket and the clock runs from `Popen` until
+
+* `subscribed_ms` – its `logsSubscribe` reaches the stand‑in;
+* `first_event_ms` – the create frame sent right after is a candidate row.
+
+    python benchmarks/bench_startup.py [seen_names] [runs]
+
+The DB is seeded with `seen_names` rows (a bot that has been running for a
+while), since warming the seen‑name index is part of every restart. Output
+is the median over `runs` cold starts.
+"""
+
+import asyncio, base64, json, os, pathlib, signal, sqlite3, statistics, subprocess
+import shutil, sys, tempfile, time
+
+HERE = pathlib.Path(__file__).resolve().parent
+ROOT = HERE.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(HERE))
+for var in ["HELIUS_WSS", "RUGCHECK_KEY", "BIRDEYE_KEY", "BASE_WALLET", "KEYPAIR_PATH"]:
+    os.environ.setdefault(var, "bench")
+os.environ.setdefault("ENV_PATH", "/dev/null")
+
+from bench_replay import _borsh, _frame  # sets a scratch DB_DSN
+
+import websockets
+from solders.pubkey import Pubkey
+
+from pumpfun_sniper import decoder
+
+
+def _create_frame() -> str:
+    ev = decoder.CREATE_DISCRIMINATOR + _borsh("Startup") + _borsh("UP")
+    ev += _borsh("https://ipfs.io/ipfs/up")
+    ev += bytes(Pubkey.new_unique()) * 3
+    logs = [
+        "Program log: Instruction: Create",
+        "Program data: " + base64.b64encode(ev).decode(),
+    ]
+    return _frame("startup-sig", logs)
+
+
+def _seed(path: pathlib.Path, names: int) -> None:
+    con = sqlite3.connect(path)
+    con.execute(
+        "CREATE TABLE seen_names (name VARCHAR(128) PRIMARY KEY, first_seen DATETIME)"
+    )
+    con.executemany(
+        "INSERT INTO seen_names VALUES (?, '2026-01-01')",
+        ((f"old token {i}",) for i in range(names)),
+    )
+    con.commit()
+    con.close()
+
+
+async def _once(names: int) -> dict:
+    tmp = pathlib.Path(tempfile.mkdtemp(prefix="bench-startup-"))
+    dbfile = tmp / "startup.db"
+    _seed(dbfile, names)
+    subscribed = asyncio.get_running_loop().create_future()
+    frame = _create_frame()
+
+    async def serve(ws):
+        await ws.recv()  # logsSubscribe
+        if not subscribed.done():
+            subscribed.set_result(time.perf_counter())
+        await ws.send(json.dumps({"jsonrpc": "2.0", "result": 1, "id": 1}))
+        await ws.send(frame)
+        await ws.wait_closed()
+
+    async with websockets.serve(serve, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        env = {
+            **os.environ,
+            "ENV_PATH": "/dev/null",
+            "HELIUS_WSS": f"ws://127.0.0.1:{port}",
+            "HELIUS_WSS_URLS": "",
+            "DB_DSN": f"sqlite+aiosqlite:///{dbfile}",
+            "SIMULATION": "true",
+            "RPC_HTTP": "http://127.0.0.1:9",
+            "JITO_TIP_FLOOR_URL": "http://127.0.0.1:9",
+            "PYTHONPATH": str(ROOT),
+        }
+        t0 = time.perf_counter()
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "pumpfun_sniper.launcher", "--roles", "watcher"],
+            env=env,
+            cwd=tmp,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            t_sub = await asyncio.wait_for(subscribed, 60)
+            con = sqlite3.connect(dbfile, timeout=5)
+            while True:
+                try:
+                    if con.execute("SELECT 1 FROM candidates").fetchone():
+                        break
+                except sqlite3.OperationalError:
+                    pass  # table not created yet
+                if time.perf_counter() - t0 > 60:
+                    raise TimeoutError("no candidate within 60 s")
+                await asyncio.sleep(0.002)
+            t_event = time.perf_counter()
+            con.close()
+        finally:
+            proc.send_signal(signal.SIGINT)
+            try:
+                proc.wait(10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+            shutil.rmtree(tmp, ignore_errors=True)
+    return {
+        "subscribed_ms": (t_sub - t0) * 1000,
+        "first_event_ms": (t_event - t0) * 1000,
+    }
+
+
+def run(names: int = 200_000, runs: int = 3) -> dict:
+    samples = [asyncio.run(_once(names)) for _ in range(runs)]
+    return {
+        "seen_names": names,
+        "runs": runs,
+        **{
+            k: round(statistics.median(s[k] for s in samples), 1)
+            for k in ("subscribed_ms", "first_event_ms")
+        },
+    }
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    print(json.dumps(run(*args), indent=2))
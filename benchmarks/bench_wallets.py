@@ -0,0 +1,92 @@
+"""
+Swaps/sec of a burst of buys through `jupiter.buy` with 1…N pool wallets
+against a local stand‑in RPC.
+
+    python benchmarks/bench_wallets.py [swaps] [land_ms]
+
+The stand‑in replaces `broadcaster.submit` and models the contention that
+serialised swaps on one wallet: a transaction write‑locks its fee payer
+(balance and token accounts) until it lands `land_ms` later, so swaps from
+the same account queue while swaps from different accounts land in
+parallel. Transactions are really built and signed per wallet; only the
+network is simulated.
+"""
+
+import asyncio, json, os, pathlib, sys, tempfile, time
+from collections import defaultdict
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+for var in ["HELIUS_WSS", "RUGCHECK_KEY", "BIRDEYE_KEY", "BASE_WALLET", "KEYPAIR_PATH"]:
+    os.environ.setdefault(var, "bench")
+_DB = pathlib.Path(tempfile.gettempdir()) / "bench_wallets.db"  # never written
+os.environ.setdefault("DB_DSN", f"sqlite+aiosqlite:///{_DB}")
+os.environ.setdefault("ENV_PATH", "/dev/null")
+
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.message import MessageV0
+from solders.transaction import VersionedTransaction
+
+from pumpfun_sniper import jupiter
+from pumpfun_sniper.config import settings
+from pumpfun_sniper.wallets import WalletPool
+
+
+class StandInRPC:
+    """`broadcaster.submit` stand‑in with per‑fee‑payer write locks."""
+
+    def __init__(self, land_ms: float):
+        self.land = land_ms / 1000
+        self.locks: dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self.landed = 0
+
+    async def submit(self, raw: bytes, sig: str, last_valid=None) -> str:
+        payer = jupiter._payer(raw)
+        async with self.locks[payer]:
+            await asyncio.sleep(self.land)
+        self.landed += 1
+        return sig
+
+
+async def _swap_tx(route, urgency="entry", wallet=None):
+    msg = MessageV0.try_compile(wallet.keypair.pubkey(), [], [], Hash.default())
+    return bytes(VersionedTransaction(msg, [wallet.keypair])), None
+
+
+async def _nolog(*a, **k):
+    return None
+
+
+async def _burst(n_wallets: int, swaps: int, land_ms: float) -> dict:
+    rpc = StandInRPC(land_ms)
+    jupiter.pool = WalletPool([Keypair() for _ in range(n_wallets)])
+    jupiter.broadcaster.submit = rpc.submit
+    route = {"outAmount": 1_000_000}
+    t0 = time.perf_counter()
+    await asyncio.gather(*(jupiter.buy(0.01, f"m{i}", route) for i in range(swaps)))
+    wall = time.perf_counter() - t0
+    return {
+        "wallets": n_wallets,
+        "swaps_per_sec": round(rpc.landed / wall, 1),
+        "per_wallet": sorted(w.swaps for w in jupiter.pool.wallets),
+    }
+
+
+def run(swaps: int = 200, land_ms: float = 20.0, sizes=(1, 2, 4, 8)) -> dict:
+    settings.SIMULATION = False
+    settings.WALLET_ASSIGN = "least_loaded"
+    jupiter._swap_tx = _swap_tx
+    jupiter.log = _nolog
+    rows = [asyncio.run(_burst(n, swaps, land_ms)) for n in sizes]
+    base = rows[0]["swaps_per_sec"]
+    for r in rows:
+        r["speedup"] = round(r["swaps_per_sec"] / base, 2)
+    return {"swaps": swaps, "land_ms": land_ms, "runs": rows}
+
+
+if __name__ == "__main__":
+    args = [float(a) for a in sys.argv[1:3]]
+    kw = {"swaps": int(args[0])} if args else {}
+    if len(args) > 1:
+        kw["land_ms"] = args[1]
+    print(json.dumps(run(**kw), indent=2))
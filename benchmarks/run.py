@@ -0,0 +1,295 @@
+"""
+Offline hot‑path benchmark suite with baseline regression tracking.
+
+    python benchmarks/run.py [--quick] [--only case,…] [--repeat N] [--out FILE]
+                             [--baseline FILE] [--save-baseline] [--tolerance 0.4]
+
+Cases: Helius frame decoding, RugCheck filter rules (single and batch), a
+monitor tick over N open positions with stubbed Birdeye / bonding / sell,
+`sse_hub._row` + JSON for a large table, SQLite insert paths, the
+`metrics` instrumentation overhead and the vectorised position book pass. Every
+metric is a throughput (`*_per_sec`, higher is better) and the best of
+`--repeat` runs is kept to damp scheduler noise. Results go to
+`--out` as JSON; metrics more than `--tolerance` below `baseline.json` are
+flagged and the run exits 1.
+"""
+
+import argparse, asyncio, datetime as dt, itertools, json, os, pathlib, platform
+import sys, tempfile, time
+
+HERE = pathlib.Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+sys.path.insert(0, str(HERE))
+for var in ["HELIUS_WSS", "RUGCHECK_KEY", "BIRDEYE_KEY", "BASE_WALLET", "KEYPAIR_PATH"]:
+    os.environ.setdefault(var, "bench")
+os.environ.setdefault("ENV_PATH", "/dev/null")
+_DB = pathlib.Path(tempfile.mkdtemp(prefix="bench-suite-")) / "suite.db"
+os.environ["DB_DSN"] = f"sqlite+aiosqlite:///{_DB}"  # never the live DB
+
+from solders.pubkey import Pubkey
+from sqlalchemy import delete, insert
+
+import bench_decoder, bench_rules
+from pumpfun_sniper import db, executor, metrics
+from pumpfun_sniper.positions import Position, PositionBook, book
+from pumpfun_sniper.sse_hub import _row
+
+BASELINE = HERE / "baseline.json"
+SIZES = {  # full / --quick
+    "decoder": (50_000, 5_000),
+    "rules": (100_000, 10_000),
+    "monitor_tick": (1_000, 200),
+    "sse_row": (50_000, 5_000),
+    "db_insert": (5_000, 500),
+    "metrics": (200_000, 20_000),
+    "position_book": (10_000, 1_000),
+}
+
+
+_serial = itertools.count()  # keeps repeated insert runs on fresh keys
+
+
+def _rate(n: int, t0: float) -> float:
+    return n / (time.perf_counter() - t0)
+
+
+# ─── cases ────────────────────────────────────────────────────────────────
+async def case_decoder(n: int) -> dict:
+    res = bench_decoder.run(n)
+    return {"decoder_frames_per_sec": res["fast_frames_per_sec"]}
+
+
+async def case_rules(n: int) -> dict:
+    res = bench_rules.run(n)
+    return {
+        "is_good_reports_per_sec": res["compiled_reports_per_sec"],
+        "rules_batch_reports_per_sec": res["batch_reports_per_sec"],
+    }
+
+
+async def case_monitor_tick(n: int, ticks: int = 10) -> dict:
+    """`executor.tick` over `n` positions whose price creeps up every tick,
+    so every stop trails, and the write‑behind flush of those moves."""
+    now = dt.datetime.utcnow()
+    mints = [str(Pubkey.new_unique()) for _ in range(n)]
+    async with db.session_ctx() as s:
+        await s.execute(delete(db.OpenPos))
+        await s.execute(
+            insert(db.OpenPos),
+            [
+                dict(
+                    mint=m,
+                    qty=1000.0,
+                    avg_price=1.0,
+                    cost=0.01,
+                    stop_price=0.65,
+                    take_profit=3.0,
+                    opened_at=now,
+                )
+                for m in mints
+            ],
+        )
+        await s.commit()
+    await book.load()
+
+    level = {"px": 1.0}
+
+    async def get_prices(ms):
+        return {m: level["px"] for m in ms}
+
+    async def no_pcts(ms):
+        return {}
+
+    async def no_sell(*a, **k):
+        raise AssertionError("benchmark positions must not exit")
+
+    saved = executor.get_prices, executor.bonding_pcts, executor.sell
+    executor.get_prices, executor.bonding_pcts, executor.sell = (
+        get_prices,
+        no_pcts,
+        no_sell,
+    )
+    try:
+        await executor.tick()  # warm the ORM / statement caches
+        t0 = time.perf_counter()
+        for _ in range(ticks):
+            level["px"] *= 1.01
+            await executor.tick()
+        elapsed = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        flushed = await book.flush()
+        flush_rate = _rate(flushed, t0)
+    finally:
+        executor.get_prices, executor.bonding_pcts, executor.sell = saved
+        book.clear()
+    return {
+        "monitor_ticks_per_sec": ticks / elapsed,
+        "monitor_positions_per_sec": ticks * n / elapsed,
+        "book_flush_rows_per_sec": flush_rate,
+    }
+
+
+async def case_sse_row(n: int) -> dict:
+    now = dt.datetime.utcnow()
+    rows = [
+        db.ClosedPos(id=i, mint=f"mint{i}", qty=1e6, pnl=i * 1e-4, closed_at=now)
+        for i in range(n)
+    ]
+    cols = ["id", "mint", "qty", "pnl", "closed_at"]
+    t0 = time.perf_counter()
+    json.dumps([_row(r, cols) for r in rows])
+    return {"sse_rows_per_sec": _rate(n, t0)}
+
+
+async def case_db_insert(n: int) -> dict:
+    now = dt.datetime.utcnow()
+    logs = [{"ts": now, "level": "INFO", "msg": f"line {i}"} for i in range(n)]
+    t0 = time.perf_counter()
+    await db.log_sink._write(logs)  # one executemany, as the log sink flushes
+    log_rate = _rate(n, t0)
+
+    k = max(n // 10, 1)  # one session per candidate, as handle_frame does
+    start = next(_serial) * k
+    t0 = time.perf_counter()
+    for i in range(start, start + k):
+        async with db.session_ctx() as s:
+            s.add(
+                db.Candidate(
+                    mint=f"bench{i}",
+                    name=f"Bench {i}",
+                    symbol="B",
+                    creator="c",
+                    created_at=now,
+                    status="NEW",
+                )
+            )
+            s.add(db.SeenName(name=f"Bench {i}"))
+            await s.commit()
+    return {
+        "db_log_rows_per_sec": log_rate,
+        "db_candidate_inserts_per_sec": _rate(k, t0),
+    }
+
+
+async def case_metrics(n: int) -> dict:
+    """One frame counter plus one stage timer inside a trade context, the
+    per‑operation instrumentation cost on the buy path."""
+    t0 = time.perf_counter()
+    with metrics.trade("bench", "entry"):
+        for _ in range(n):
+            metrics.inc("frames_total")
+            with metrics.timer("quote"):
+                pass
+    rate = _rate(n, t0)
+    metrics.registry.clear()
+    metrics._spans.clear()
+    return {"metrics_ops_per_sec": rate}
+
+
+async def case_position_book(n: int, passes: int = 50) -> dict:
+    """`PositionBook.evaluate` alone: trail and exit checks over `n`
+    positions per pass, no I/O."""
+    pb, now = PositionBook(), dt.datetime.utcnow()
+    for i in range(n):
+        pb.add(Position(f"m{i}", 1000.0, 1.0, 0.01, 0.65, 3.0, now))
+    px = {m: 1.0 for m in pb.mints}
+    pb.set_prices(px)
+    t0 = time.perf_counter()
+    for _ in range(passes):
+        pb.last[: pb.n] *= 1.001  # stream trades moved every price
+        pb.evaluate(35.0)
+    elapsed = time.perf_counter() - t0
+    return {"book_eval_positions_per_sec": passes * n / elapsed}
+
+
+CASES = {
+    "decoder": case_decoder,
+    "rules": case_rules,
+    "monitor_tick": case_monitor_tick,
+    "sse_row": case_sse_row,
+    "db_insert": case_db_insert,
+    "metrics": case_metrics,
+    "position_book": case_position_book,
+}
+
+
+# ─── suite ────────────────────────────────────────────────────────────────
+async def run(
+    only: list[str] | None = None, quick: bool = False, repeat: int = 3
+) -> dict:
+    await db.init()
+    metrics: dict[str, float] = {}
+    try:
+        for name, fn in CASES.items():
+            if only and name not in only:
+                continue
+            for _ in range(repeat):
+                for k, v in (await fn(SIZES[name][quick])).items():
+                    metrics[k] = max(v, metrics.get(k, 0.0))
+    finally:
+        await db.engine.dispose()
+        _DB.unlink(missing_ok=True)
+    return {
+        "created": dt.datetime.utcnow().isoformat(timespec="seconds"),
+        "quick": quick,
+        "repeat": repeat,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "metrics": metrics,
+    }
+
+
+def compare(metrics: dict, baseline: dict, tolerance: float) -> list[dict]:
+    """Metrics that dropped more than `tolerance` below the baseline."""
+    out = []
+    for k, base in baseline.items():
+        cur = metrics.get(k)
+        if cur is None or not base:
+            continue
+        change = cur / base - 1
+        if change < -tolerance:
+            out.append(
+                {"metric": k, "baseline": base, "current": cur, "change": change}
+            )
+    return out
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="offline hot-path benchmarks")
+    ap.add_argument("--quick", action="store_true", help="small sizes (smoke run)")
+    ap.add_argument("--only", help="comma-separated cases: " + ",".join(CASES))
+    ap.add_argument("--repeat", type=int, default=3, help="runs per case (best kept)")
+    ap.add_argument("--out", default=str(HERE / "results.json"))
+    ap.add_argument("--baseline", default=str(BASELINE))
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--tolerance", type=float, default=0.4)
+    args = ap.parse_args(argv)
+
+    only = args.only.split(",") if args.only else None
+    res = asyncio.run(run(only, args.quick, args.repeat))
+    base_path = pathlib.Path(args.baseline)
+    baseline = json.loads(base_path.read_text()) if base_path.exists() else None
+    if baseline is not None and baseline.get("quick") != res["quick"]:
+        print("baseline was recorded with different sizes; not comparing")
+        baseline = None
+    res["regressions"] = (
+        compare(res["metrics"], baseline["metrics"], args.tolerance) if baseline else []
+    )
+    pathlib.Path(args.out).write_text(json.dumps(res, indent=2))
+
+    base = baseline["metrics"] if baseline else {}
+    flagged = {r["metric"] for r in res["regressions"]}
+    for k, v in res["metrics"].items():
+        delta = f"{v / base[k] - 1:+7.1%}" if base.get(k) else ""
+        mark = "  REGRESSION" if k in flagged else ""
+        print(f"{k:32s} {v:16,.1f} {delta}{mark}")
+    if args.save_baseline:
+        res.pop("regressions")
+        base_path.write_text(json.dumps(res, indent=2) + "\n")
+        print(f"baseline saved to {base_path}")
+        return 0
+    return 1 if res["regressions"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
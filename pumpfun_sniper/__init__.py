@@ -1,14 +1,36 @@
 __all__ = [
     "config",
+    "clock",
     "db",
     "helius_watcher",
+    "decoder",
+    "discovery",
     "strategy",
+    "evaluator",
+    "bus",
+    "ipc",
+    "launcher",
     "executor",
+    "positions",
+    "analytics",
     "dashboard",
+    "sse_hub",
     "jupiter",
+    "wallets",
+    "quotecache",
+    "broadcast",
+    "netstats",
     "birdeye",
     "bonding",
+    "pricefeed",
     "rugcheck",
+    "rules",
     "debug",
+    "metrics",
+    "recorder",
+    "replay",
+    "retention",
+    "seen_index",
+    "clients",
 ]
 __version__ = "0.2.0"
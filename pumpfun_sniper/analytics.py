@@ -0,0 +1,272 @@
+"""
+Incrementally maintained PnL rollups over `closed_positions`.
+
+`executor._close` hands each trade to `analytics.record`, which folds it
+into in‑memory aggregates: totals, win rate, profit factor, drawdown, PnL
+per hour (last `ANALYTICS_HOURS`) and a holding‑time histogram. A summary
+therefore costs the same however long the history is. `sync` folds in
+trades closed by another process. Ids are assigned before commit, so a row
+can appear after higher ids were already seen; each sync re‑reads the last
+`ANALYTICS_RESCAN_IDS` ids below the cursor and skips the ones already
+counted. The state is checkpointed to `analytics_state` every
+`ANALYTICS_CHECKPOINT_SEC` with the counted ids of that window; start‑up
+loads the checkpoint and replays only the window and newer rows.
+"""
+
+import asyncio, json, math, datetime as dt
+from collections import OrderedDict, deque
+
+from pumpfun_sniper import clock
+from pumpfun_sniper.config import settings
+from pumpfun_sniper.debug import dbg
+
+HOLD_BUCKETS = (10, 30, 60, 120, 300, 600, 1800, 3600, 14400, math.inf)  # seconds
+_RECENT = 10_000  # ids remembered to drop a trade seen by record and sync
+
+
+def _hour(ts: dt.datetime) -> str:
+    return ts.strftime("%Y-%m-%dT%H:00")
+
+
+class Rollup:
+    def __init__(self):
+        self.floor = 0  # every id <= floor is final (in the checkpoint)
+        self.cursor = 0  # highest id applied
+        self.trades = 0
+        self.wins = 0
+        self.pnl = 0.0
+        self.gross_win = 0.0
+        self.gross_loss = 0.0
+        self.best: float | None = None
+        self.worst: float | None = None
+        self.peak = 0.0
+        self.max_drawdown = 0.0
+        self.hold_counts = [0] * len(HOLD_BUCKETS)
+        self.hold_sum = 0.0
+        # hour → [trades, wins, pnl]
+        self.hourly: OrderedDict[str, list] = OrderedDict()
+        self.version = 0
+        self._recent: deque[int] = deque(maxlen=_RECENT)
+        self._recent_set: set[int] = set()
+
+    def add(
+        self,
+        trade_id: int,
+        pnl: float,
+        opened_at: dt.datetime,
+        closed_at: dt.datetime,
+    ) -> bool:
+        """Fold one closed trade in; False if it was already counted."""
+        if trade_id <= self.floor or trade_id in self._recent_set:
+            return False
+        if len(self._recent) == _RECENT:
+            self._recent_set.discard(self._recent[0])
+        self._recent.append(trade_id)
+        self._recent_set.add(trade_id)
+        self.cursor = max(self.cursor, trade_id)
+
+        self.trades += 1
+        win = pnl > 0
+        if win:
+            self.wins += 1
+            self.gross_win += pnl
+        else:
+            self.gross_loss -= pnl
+        self.pnl += pnl
+        self.best = pnl if self.best is None else max(self.best, pnl)
+        self.worst = pnl if self.worst is None else min(self.worst, pnl)
+        self.peak = max(self.peak, self.pnl)
+        self.max_drawdown = max(self.max_drawdown, self.peak - self.pnl)
+
+        hold = max((closed_at - opened_at).total_seconds(), 0.0)
+        self.hold_sum += hold
+        self.hold_counts[next(i for i, b in enumerate(HOLD_BUCKETS) if hold <= b)] += 1
+
+        key = _hour(closed_at)
+        bucket = self.hourly.get(key)
+        if bucket is None:
+            bucket = self.hourly[key] = [0, 0, 0.0]
+            if len(self.hourly) > settings.ANALYTICS_HOURS:
+                del self.hourly[min(self.hourly)]
+        bucket[0] += 1
+        bucket[1] += win
+        bucket[2] += pnl
+        self.version += 1
+        return True
+
+    def summary(self) -> dict:
+        n = self.trades
+        cum, by_hour = self.pnl, []
+        for hour in sorted(self.hourly, reverse=True):  # bounded by ANALYTICS_HOURS
+            t, w, p = self.hourly[hour]
+            by_hour.append(
+                {"hour": hour, "trades": t, "wins": w, "pnl": p, "cum_pnl": cum}
+            )
+            cum -= p
+        return {
+            "trades": n,
+            "wins": self.wins,
+            "losses": n - self.wins,
+            "win_rate": self.wins / n if n else None,
+            "pnl": self.pnl,
+            "avg_pnl": self.pnl / n if n else None,
+            "gross_win": self.gross_win,
+            "gross_loss": self.gross_loss,
+            "profit_factor": (
+                self.gross_win / self.gross_loss if self.gross_loss else None
+            ),
+            "best": self.best,
+            "worst": self.worst,
+            "max_drawdown": self.max_drawdown,
+            "avg_hold_sec": self.hold_sum / n if n else None,
+            "hold_hist": [
+                {"le": "+Inf" if math.isinf(b) else b, "count": c}
+                for b, c in zip(HOLD_BUCKETS, self.hold_counts)
+            ],
+            "by_hour": by_hour[::-1],
+            "last_id": self.cursor,
+        }
+
+    # ─── checkpoint ────────────────────────────────────────────────────
+    _FIELDS = (
+        "cursor trades wins pnl gross_win gross_loss best worst peak "
+        "max_drawdown hold_counts hold_sum"
+    ).split()
+
+    def window(self) -> int:
+        """Lowest id a late commit may still fill in (exclusive)."""
+        rescan = min(settings.ANALYTICS_RESCAN_IDS, _RECENT // 2)
+        return max(self.floor, self.cursor - rescan)
+
+    def state(self) -> str:
+        d = {f: getattr(self, f) for f in self._FIELDS}
+        d["hourly"] = list(self.hourly.items())
+        d["floor"] = lo = self.window()
+        d["window_ids"] = sorted(i for i in self._recent_set if i > lo)
+        return json.dumps(d)
+
+    @classmethod
+    def from_state(cls, raw: str) -> "Rollup":
+        r, d = cls(), json.loads(raw)
+        for f in cls._FIELDS:
+            setattr(r, f, d[f])
+        r.hourly = OrderedDict((k, v) for k, v in d["hourly"])
+        r.floor = d.get("floor", r.cursor)  # older checkpoints: no window
+        r._recent.extend(d.get("window_ids", ()))
+        r._recent_set.update(r._recent)
+        return r
+
+
+class Analytics:
+    def __init__(self):
+        self.rollup = Rollup()
+        self.checkpoints = 0
+        self._saved_version = 0
+        self._payload: tuple[int, str] | None = None
+
+    def record(
+        self,
+        trade_id: int,
+        pnl: float,
+        opened_at: dt.datetime,
+        closed_at: dt.datetime,
+    ) -> None:
+        self.rollup.add(trade_id, pnl, opened_at, closed_at)
+
+    def summary(self) -> dict:
+        return self.rollup.summary()
+
+    # ─── persistence ───────────────────────────────────────────────────
+    async def load(self) -> None:
+        """Restore the checkpoint and replay newer trades."""
+        from pumpfun_sniper.db import session_ctx, AnalyticsState
+
+        async with session_ctx() as s:
+            row = await s.get(AnalyticsState, "pnl")
+        if row is not None:
+            prev, self.rollup = self.rollup, Rollup.from_state(row.state)
+            self.rollup.version = prev.version + 1  # stream clients resend
+        self._saved_version = self.rollup.version
+        n = await self.sync()
+        dbg(f"ANALYTICS loaded {self.rollup.trades} trades ({n} replayed)")
+
+    async def sync(self) -> int:
+        """Fold in trades closed by any process: past the cursor, or late
+        commits in the re‑scanned window below it."""
+        from sqlalchemy import select
+        from pumpfun_sniper.db import session_ctx, ClosedPos
+
+        cols = (ClosedPos.id, ClosedPos.pnl, ClosedPos.opened_at, ClosedPos.closed_at)
+        n, lo = 0, self.rollup.window()
+        async with session_ctx() as s:
+            while True:
+                rows = (
+                    await s.execute(
+                        select(*cols)
+                        .where(ClosedPos.id > lo)
+                        .order_by(ClosedPos.id)
+                        .limit(5000)
+                    )
+                ).all()
+                for r in rows:
+                    n += self.rollup.add(*r)
+                if len(rows) < 5000:
+                    return n
+                lo = rows[-1][0]
+
+    async def checkpoint(self) -> bool:
+        if self.rollup.version == self._saved_version:
+            return False
+        from pumpfun_sniper.db import session_ctx, AnalyticsState
+
+        version, state = self.rollup.version, self.rollup.state()
+        async with session_ctx() as s:
+            await s.merge(
+                AnalyticsState(
+                    name="pnl",
+                    last_id=self.rollup.cursor,
+                    state=state,
+                    updated_at=clock.utcnow(),
+                )
+            )
+            await s.commit()
+        self._saved_version = version
+        self.checkpoints += 1
+        return True
+
+    async def run(self, checkpoint: bool = True) -> None:
+        """Keep up with other processes; the process that closes trades
+        also checkpoints."""
+        await self.load()
+        last = clock.monotonic()
+        while True:
+            await asyncio.sleep(settings.ANALYTICS_SYNC_SEC)
+            try:
+                await self.sync()
+                if checkpoint and (
+                    clock.monotonic() - last >= settings.ANALYTICS_CHECKPOINT_SEC
+                ):
+                    await self.checkpoint()
+                    last = clock.monotonic()
+            except Exception as e:
+                dbg(f"ANALYTICS sync failed: {e}")
+
+    # ─── dashboard stream ──────────────────────────────────────────────
+    def payload(self) -> str:
+        """Serialised summary, built once per change for every client."""
+        v = self.rollup.version
+        if self._payload is None or self._payload[0] != v:
+            self._payload = (v, json.dumps(self.summary()))
+        return self._payload[1]
+
+    async def stream(self):
+        """SSE events: the summary on connect, then on every change."""
+        sent = None
+        while True:
+            if self.rollup.version != sent:
+                sent = self.rollup.version
+                yield {"event": "summary", "data": self.payload()}
+            await asyncio.sleep(settings.SSE_POLL_SEC)
+
+
+analytics = Analytics()
@@ -1,30 +1,47 @@
 """
 Batched price polling (≤40 tokens per HTTP call) via Birdeye REST endpoint.
+
+Birdeye quotes USD; prices are converted to lamports per token base unit
+(the unit of the trade stream, the position book and `jupiter.buy`'s entry
+price) with the SOL price fetched in the same call.
 """
 
-import httpx
+from pumpfun_sniper import clients
 from pumpfun_sniper.config import settings
 from pumpfun_sniper.debug import dbg
+from pumpfun_sniper.recorder import recorder
 
 ENDPOINT = "https://public-api.birdeye.so/defi/price_volume/multi"
+TOKEN_DECIMALS = 6  # every pump.fun mint
+_SOL = "So11111111111111111111111111111111111111112"
 
 
 async def get_prices(mints: list[str]) -> dict[str, float]:
+    """Prices of `mints` in lamports per token base unit; mints Birdeye has
+    no price for (or every mint, if SOL has none) are left out."""
     if not mints:
         return {}
-    prices: dict[str, float] = {}
-    async with httpx.AsyncClient(timeout=10) as cli:
-        for i in range(0, len(mints), 40):
-            chunk = mints[i : i + 40]
-            params = [("network", "solana")] + [("address", m) for m in chunk]
-            dbg(f"BIRDEYE GET {ENDPOINT} {params}")
-            r = await cli.get(
-                ENDPOINT,
-                params=params,
-                headers={"X-API-KEY": settings.BIRDEYE_KEY},
-            )
-            dbg(f"BIRDEYE RESPONSE {r.status_code} {r.text[:200]}")
-            r.raise_for_status()
-            data = r.json()["data"]
-            prices.update({row["address"]: row["price_usd"] for row in data})
+    wanted = [*mints, _SOL] if _SOL not in mints else list(mints)
+    usd: dict[str, float] = {}
+    for i in range(0, len(wanted), 40):
+        chunk = wanted[i : i + 40]
+        params = [("network", "solana")] + [("address", m) for m in chunk]
+        dbg(f"BIRDEYE GET {ENDPOINT} {params}")
+        r = await clients.get(
+            ENDPOINT,
+            params=params,
+            headers={"X-API-KEY": settings.BIRDEYE_KEY},
+        )
+        dbg(f"BIRDEYE RESPONSE {r.status_code} {r.text[:200]}")
+        r.raise_for_status()
+        data = r.json()["data"]
+        usd.update({row["address"]: row["price_usd"] for row in data})
+    sol = usd.get(_SOL)
+    if not sol:
+        dbg("BIRDEYE no SOL price, cannot convert")
+        return {}
+    scale = 1e9 / sol / 10**TOKEN_DECIMALS  # USD per token → lamports per unit
+    prices = {m: usd[m] * scale for m in mints if usd.get(m) is not None}
+    if recorder.active:
+        recorder.record("price", prices)
     return prices
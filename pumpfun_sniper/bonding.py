@@ -1,19 +1,220 @@
 """
-Fetch bonding‑curve percentage from Moralis' PumpFun endpoint.
+Local pump.fun bonding‑curve state.
+
+Decodes the bonding‑curve account (virtual/real reserves, `complete` flag)
+and computes curve progress locally instead of asking a REST API. Accounts
+of held mints are kept fresh by a websocket `accountSubscribe` feed; any
+entry older than `BONDING_TTL_SEC` is refreshed through batched RPC
+`getMultipleAccounts` calls.
 """
 
-import httpx
+import asyncio, base64, json, random, struct, time
+from dataclasses import dataclass
+
+import websockets
+from solders.pubkey import Pubkey
+
+from pumpfun_sniper import clients
 from pumpfun_sniper.config import settings
 from pumpfun_sniper.debug import dbg
 
+DISCRIMINATOR = bytes([23, 183, 248, 55, 96, 216, 172, 96])  # account:BondingCurve
+_LAYOUT = struct.Struct("<8s5Q?")
+# real token reserves of a fresh curve; progress is the share sold off it
+INITIAL_REAL_TOKEN_RESERVES = 793_100_000_000_000
+_BATCH = 100  # getMultipleAccounts limit
 
-async def bonding_pct(mint: str) -> float | None:
-    if not settings.MORALIS_KEY:
+
+@dataclass(frozen=True)
+class CurveState:
+    virtual_token_reserves: int
+    virtual_sol_reserves: int
+    real_token_reserves: int
+    real_sol_reserves: int
+    token_total_supply: int
+    complete: bool
+
+    @property
+    def progress_pct(self) -> float:
+        if self.complete:
+            return 100.0
+        left = self.real_token_reserves * 100 / INITIAL_REAL_TOKEN_RESERVES
+        return min(100.0, max(0.0, 100.0 - left))
+
+    @property
+    def price(self) -> float:
+        """Spot price in lamports per token base unit."""
+        if not self.virtual_token_reserves:
+            return 0.0
+        return self.virtual_sol_reserves / self.virtual_token_reserves
+
+
+def decode(data: bytes) -> CurveState:
+    """Decode a raw bonding‑curve account."""
+    if len(data) < _LAYOUT.size or data[:8] != DISCRIMINATOR:
+        raise ValueError("not a pump.fun bonding-curve account")
+    return CurveState(*_LAYOUT.unpack_from(data)[1:])
+
+
+def curve_address(mint: str) -> str:
+    """PDA of the bonding‑curve account for `mint`."""
+    program = Pubkey.from_string(settings.PUMP_BONDING_PROGRAM)
+    seeds = [b"bonding-curve", bytes(Pubkey.from_string(mint))]
+    return str(Pubkey.find_program_address(seeds, program)[0])
+
+
+class CurveCache:
+    def __init__(self, wss_url: str | None = None, rpc_url: str | None = None):
+        self.wss_url = wss_url or settings.BONDING_WSS or settings.HELIUS_WSS
+        self.rpc_url = rpc_url or settings.RPC_HTTP
+        self._addr: dict[str, str] = {}  # mint -> curve account
+        self._mint: dict[str, str] = {}  # curve account -> mint
+        self._states: dict[str, tuple[CurveState, float]] = {}
+        self._sub_ids: dict[int, str] = {}  # subscription id -> mint
+        self._pending: dict[int, str] = {}  # request id -> mint
+        self._req = 0
+        self._ws = None
+        self._task: asyncio.Task | None = None
+
+    # ─── cache access ──────────────────────────────────────────────────
+    def get(self, mint: str) -> CurveState | None:
+        """Cached state if it is younger than BONDING_TTL_SEC."""
+        hit = self._states.get(mint)
+        if hit and time.monotonic() - hit[1] <= settings.BONDING_TTL_SEC:
+            return hit[0]
         return None
-    url = f"https://solana-gateway.moralis.com/pumpfun/bonding/{mint}"
-    async with httpx.AsyncClient(timeout=10) as cli:
-        dbg(f"MORALIS GET {url}")
-        r = await cli.get(url, headers={"X-API-Key": settings.MORALIS_KEY})
-        dbg(f"MORALIS RESPONSE {r.status_code} {r.text[:200]}")
-        r.raise_for_status()
-        return r.json().get("bonding_curve_pct")
+
+    def _store(self, mint: str, data: bytes) -> None:
+        try:
+            self._states[mint] = (decode(data), time.monotonic())
+        except ValueError as e:
+            dbg(f"BONDING decode {mint} failed: {e}")
+
+    async def pcts(self, mints: list[str]) -> dict[str, float]:
+        """Curve progress % per mint, refreshing stale entries in batches."""
+        self.watch(mints)
+        stale = [m for m in mints if self.get(m) is None]
+        if stale:
+            await self.refresh(stale)
+        out = {}
+        for m in mints:
+            st = self.get(m)
+            if st is not None:
+                out[m] = st.progress_pct
+        return out
+
+    async def refresh(self, mints: list[str]) -> None:
+        """Fetch curve accounts via `getMultipleAccounts`, 100 per call."""
+        for i in range(0, len(mints), _BATCH):
+            chunk = mints[i : i + _BATCH]
+            payload = {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "getMultipleAccounts",
+                "params": [
+                    [self._address(m) for m in chunk],
+                    {"encoding": "base64", "commitment": "processed"},
+                ],
+            }
+            dbg(f"BONDING getMultipleAccounts {len(chunk)}")
+            r = await clients.post(self.rpc_url, json=payload)
+            r.raise_for_status()
+            for m, acc in zip(chunk, r.json()["result"]["value"]):
+                if acc:
+                    self._store(m, base64.b64decode(acc["data"][0]))
+
+    # ─── subscriptions ─────────────────────────────────────────────────
+    def _address(self, mint: str) -> str:
+        addr = self._addr.get(mint)
+        if addr is None:
+            addr = self._addr[mint] = curve_address(mint)
+            self._mint[addr] = mint
+        return addr
+
+    def watch(self, mints: list[str]) -> None:
+        """Keep `mints` fresh through the websocket feed."""
+        new = [m for m in mints if m not in self._addr]
+        for m in new:
+            self._address(m)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run())
+        elif new and self._ws is not None:
+            for m in new:
+                asyncio.get_running_loop().create_task(self._subscribe(m))
+
+    def unwatch(self, mint: str) -> None:
+        addr = self._addr.pop(mint, None)
+        self._mint.pop(addr, None)
+        self._states.pop(mint, None)
+        for sid, m in list(self._sub_ids.items()):
+            if m == mint:
+                del self._sub_ids[sid]
+                if self._ws is not None:
+                    msg = {
+                        "jsonrpc": "2.0",
+                        "id": 0,
+                        "method": "accountUnsubscribe",
+                        "params": [sid],
+                    }
+                    loop = asyncio.get_running_loop()
+                    loop.create_task(self._ws.send(json.dumps(msg)))
+
+    async def _subscribe(self, mint: str) -> None:
+        addr = self._addr.get(mint)
+        if addr is None or self._ws is None:
+            return
+        self._req += 1
+        self._pending[self._req] = mint
+        msg = {
+            "jsonrpc": "2.0",
+            "id": self._req,
+            "method": "accountSubscribe",
+            "params": [addr, {"encoding": "base64", "commitment": "processed"}],
+        }
+        await self._ws.send(json.dumps(msg))
+
+    def _on_message(self, data: dict) -> None:
+        if "id" in data and data["id"] in self._pending:
+            mint = self._pending.pop(data["id"])
+            if "result" in data and mint in self._addr:
+                self._sub_ids[data["result"]] = mint
+            return
+        if data.get("method") != "accountNotification":
+            return
+        params = data["params"]
+        mint = self._sub_ids.get(params["subscription"])
+        if mint is not None:
+            self._store(mint, base64.b64decode(params["result"]["value"]["data"][0]))
+
+    async def run(self) -> None:
+        """Maintain the websocket feed, reconnecting with jittered backoff."""
+        backoff = 1.0
+        while self._addr:
+            try:
+                async with websockets.connect(self.wss_url, ping_interval=20) as ws:
+                    self._ws, backoff = ws, 1.0
+                    self._sub_ids.clear()
+                    self._pending.clear()
+                    for m in list(self._addr):
+                        await self._subscribe(m)
+                    async for raw in ws:
+                        self._on_message(json.loads(raw))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                dbg(f"BONDING websocket error: {e}")
+            finally:
+                self._ws = None
+            await asyncio.sleep(backoff * (0.5 + random.random()))
+            backoff = min(backoff * 2, 30.0)
+
+
+curves = CurveCache()
+
+
+async def bonding_pct(mint: str) -> float | None:
+    return (await curves.pcts([mint])).get(mint)
+
+
+async def bonding_pcts(mints: list[str]) -> dict[str, float]:
+    return await curves.pcts(mints)
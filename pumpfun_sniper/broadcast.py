@@ -0,0 +1,313 @@
+"""
+Fan‑out transaction submission with websocket confirmation.
+
+A signed transaction is sent in parallel to every configured RPC /
+block‑engine endpoint (`RPC_SEND_URLS`) over the pooled HTTP clients and
+rebroadcast every `TX_REBROADCAST_SEC` until it confirms or its blockhash
+expires. Confirmation comes from one shared `signatureSubscribe` websocket,
+backed by batched `getSignatureStatuses` polling. Endpoints are plain
+objects with `send` / `statuses` / `block_height`, so tests can plug in
+stand‑ins.
+
+Once a send may have gone out, `submit` only gives up with an error that
+allows a rebuild (`RESENDABLE`) when the transaction provably cannot swap:
+it was refused everywhere, landed with an error, or its blockhash expired
+and a status lookup shows it did not land. Anything else is
+`TxUnconfirmed`, and the caller must not send a second swap.
+"""
+
+import asyncio, base64, json, random, time
+from typing import Protocol
+
+import websockets
+
+from pumpfun_sniper import clients, metrics
+from pumpfun_sniper.config import settings
+from pumpfun_sniper.debug import dbg
+
+_STATUS_BATCH = 256  # getSignatureStatuses limit
+_CONFIRMED = ("confirmed", "finalized")
+_BLOCKHASH_BLOCKS = 150  # a blockhash is valid for this many blocks
+_HEIGHT_SLACK = 50  # RPC nodes disagree on the tip by a few blocks
+
+
+class RpcError(RuntimeError):
+    """The endpoint answered with a JSON‑RPC error: the request was refused."""
+
+
+class TxRejected(RuntimeError):
+    """Every endpoint refused the first send; the transaction never went out."""
+
+
+class TxFailed(RuntimeError):
+    """The transaction landed with an error (fee paid, nothing swapped)."""
+
+
+class TxExpired(TimeoutError):
+    """The blockhash expired and the signature did not land."""
+
+
+class TxUnconfirmed(TimeoutError):
+    """Gave up without proof either way; the transaction may still land."""
+
+
+RESENDABLE = (TxRejected, TxFailed, TxExpired)  # a rebuilt swap cannot double up
+
+
+class Endpoint(Protocol):
+    async def send(self, wire_b64: str) -> str: ...
+
+    async def statuses(self, sigs: list[str]) -> list[dict | None]: ...
+
+    async def block_height(self) -> int: ...
+
+
+class RpcEndpoint:
+    """JSON‑RPC endpoint reached through the shared HTTP client pool."""
+
+    def __init__(self, url: str):
+        self.url = url
+
+    async def _call(self, method: str, params: list):
+        payload = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
+        r = await clients.post(self.url, json=payload)
+        r.raise_for_status()
+        body = r.json()
+        if "error" in body:
+            raise RpcError(f"{method}: {body['error']}")
+        return body["result"]
+
+    async def send(self, wire_b64: str) -> str:
+        opts = {"encoding": "base64", "skipPreflight": True, "maxRetries": 0}
+        return await self._call("sendTransaction", [wire_b64, opts])
+
+    async def statuses(self, sigs: list[str]) -> list[dict | None]:
+        res = await self._call("getSignatureStatuses", [sigs])
+        return res["value"]
+
+    async def block_height(self) -> int:
+        return await self._call("getBlockHeight", [{"commitment": "confirmed"}])
+
+
+def _send_urls() -> list[str]:
+    urls = [u.strip() for u in settings.RPC_SEND_URLS.split(",") if u.strip()]
+    return urls or [settings.RPC_HTTP]
+
+
+class Broadcaster:
+    def __init__(
+        self,
+        endpoints: list[Endpoint] | None = None,
+        status_endpoint: Endpoint | None = None,
+        wss_url: str | None = None,
+    ):
+        self.endpoints = endpoints or [RpcEndpoint(u) for u in _send_urls()]
+        self.status_endpoint = status_endpoint or (
+            self.endpoints[0] if endpoints else RpcEndpoint(settings.RPC_HTTP)
+        )
+        self.wss_url = wss_url or settings.RPC_WSS or settings.HELIUS_WSS
+        self.block_height: int | None = None
+        self.height_at = 0.0  # monotonic time of the last block height sample
+        self.sent = {i: 0 for i in range(len(self.endpoints))}
+        self.failed = {i: 0 for i in range(len(self.endpoints))}
+        self._waiters: dict[str, asyncio.Future] = {}
+        self._pending: dict[int, str] = {}  # subscribe request id -> signature
+        self._subs: dict[int, str] = {}  # subscription id -> signature
+        self._req = 0
+        self._ws = None
+        self._tasks: list[asyncio.Task] = []
+
+    # ─── public API ────────────────────────────────────────────────────
+    async def submit(
+        self, wire: bytes, sig: str, last_valid_block_height: int | None = None
+    ) -> str:
+        """Broadcast until `sig` confirms. Raises one of `RESENDABLE` when it
+        provably cannot swap and `TxUnconfirmed` when `TX_EXPIRY_SEC` passes
+        without proof either way. Failed rebroadcasts only count in `stats`."""
+        self._start()
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters[sig] = fut
+        await self._subscribe(sig)
+        wire_b64 = base64.b64encode(wire).decode()
+        started = time.monotonic()
+        limit = last_valid_block_height
+        try:
+            with metrics.timer("send"):
+                errors = await self._fanout(wire_b64)
+            if len(errors) == len(self.endpoints) and all(
+                isinstance(e, RpcError) for e in errors
+            ):
+                raise TxRejected(f"{sig[:8]}… refused: {errors[0]}") from errors[0]
+            with metrics.timer("confirm"):
+                while True:
+                    try:
+                        await asyncio.wait_for(
+                            asyncio.shield(fut), settings.TX_REBROADCAST_SEC
+                        )
+                        return fut.result()
+                    except asyncio.TimeoutError:
+                        pass
+                    if limit is None and self.height_at > started:
+                        # the blockhash is older than any height seen since
+                        limit = self.block_height + _BLOCKHASH_BLOCKS + _HEIGHT_SLACK
+                    expired = (
+                        limit is not None
+                        and self.block_height is not None
+                        and self.block_height > limit
+                    )
+                    overdue = time.monotonic() - started > settings.TX_EXPIRY_SEC
+                    if expired or overdue:
+                        landed = await self._landed(sig)
+                        if fut.done():
+                            return fut.result()
+                        if landed is False and expired:
+                            raise TxExpired(f"{sig[:8]}… expired unconfirmed")
+                        if overdue and not landed:
+                            raise TxUnconfirmed(f"{sig[:8]}… outcome unknown")
+                    if not expired:
+                        dbg(f"BROADCAST rebroadcast {sig[:8]}…")
+                        await self._fanout(wire_b64)
+        finally:
+            self._waiters.pop(sig, None)
+            fut.cancel()
+
+    async def close(self) -> None:
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    # ─── sending ───────────────────────────────────────────────────────
+    async def _fanout(self, wire_b64: str) -> list[Exception]:
+        """Send to every endpoint; returns the errors (counted in `stats`)."""
+        res = await asyncio.gather(
+            *(ep.send(wire_b64) for ep in self.endpoints), return_exceptions=True
+        )
+        errors = []
+        for i, r in enumerate(res):
+            if isinstance(r, Exception):
+                self.failed[i] += 1
+                errors.append(r)
+            else:
+                self.sent[i] += 1
+        if len(errors) == len(res):
+            dbg(f"BROADCAST every endpoint failed: {errors[0]}")
+        return errors
+
+    # ─── confirmation ──────────────────────────────────────────────────
+    def _start(self) -> None:
+        if not self._tasks or all(t.done() for t in self._tasks):
+            loop = asyncio.get_running_loop()
+            self._tasks = [
+                loop.create_task(self._ws_loop()),
+                loop.create_task(self._poll()),
+            ]
+
+    def observe_height(self, height: int) -> None:
+        self.block_height = max(self.block_height or 0, height)
+        self.height_at = time.monotonic()
+
+    def _resolve(self, sig: str, err) -> None:
+        fut = self._waiters.get(sig)
+        if fut is None or fut.done():
+            return
+        if err:
+            fut.set_exception(TxFailed(f"transaction {sig[:8]}… failed: {err}"))
+        else:
+            fut.set_result(sig)
+
+    async def _landed(self, sig: str) -> bool | None:
+        """Direct status lookup: True if `sig` is in a block (resolving it once
+        confirmed), False if not, None if the lookup failed."""
+        try:
+            st = (await self.status_endpoint.statuses([sig]))[0]
+        except Exception as e:
+            dbg(f"BROADCAST status lookup failed: {e}")
+            return None
+        if st is None:
+            return False
+        if st.get("confirmationStatus") in _CONFIRMED:
+            self._resolve(sig, st.get("err"))
+        return True
+
+    async def _subscribe(self, sig: str) -> None:
+        if self._ws is None:
+            return  # (re)subscribed by _ws_loop once connected
+        self._req += 1
+        self._pending[self._req] = sig
+        msg = {
+            "jsonrpc": "2.0",
+            "id": self._req,
+            "method": "signatureSubscribe",
+            "params": [sig, {"commitment": "confirmed"}],
+        }
+        try:
+            await self._ws.send(json.dumps(msg))
+        except Exception as e:  # polling still covers this signature
+            dbg(f"BROADCAST signatureSubscribe failed: {e}")
+
+    def _on_message(self, data: dict) -> None:
+        if data.get("id") in self._pending:
+            sig = self._pending.pop(data["id"])
+            if "result" in data:
+                self._subs[data["result"]] = sig
+            return
+        if data.get("method") != "signatureNotification":
+            return
+        params = data["params"]
+        sig = self._subs.pop(params["subscription"], None)
+        if sig is not None:
+            self._resolve(sig, params["result"]["value"].get("err"))
+
+    async def _ws_loop(self) -> None:
+        backoff = 0.5
+        while True:
+            try:
+                async with websockets.connect(self.wss_url, ping_interval=20) as ws:
+                    self._ws, backoff = ws, 0.5
+                    self._pending.clear()
+                    self._subs.clear()
+                    for sig in list(self._waiters):
+                        await self._subscribe(sig)
+                    async for raw in ws:
+                        self._on_message(json.loads(raw))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                dbg(f"BROADCAST websocket error: {e}")
+            finally:
+                self._ws = None
+            await asyncio.sleep(backoff * (0.5 + random.random()))
+            backoff = min(backoff * 2, 30.0)
+
+    async def _poll(self) -> None:
+        """Fallback: batched getSignatureStatuses + block height for expiry."""
+        while True:
+            await asyncio.sleep(settings.TX_STATUS_POLL_SEC)
+            if not self._waiters:
+                continue
+            sigs = list(self._waiters)
+            try:
+                self.observe_height(await self.status_endpoint.block_height())
+                for i in range(0, len(sigs), _STATUS_BATCH):
+                    chunk = sigs[i : i + _STATUS_BATCH]
+                    for sig, st in zip(
+                        chunk, await self.status_endpoint.statuses(chunk)
+                    ):
+                        if st and st.get("confirmationStatus") in _CONFIRMED:
+                            self._resolve(sig, st.get("err"))
+            except Exception as e:
+                dbg(f"BROADCAST status poll failed: {e}")
+
+    def stats(self) -> list[dict]:
+        return [
+            {
+                "endpoint": getattr(ep, "url", repr(ep)).split("?")[0],
+                "sent": self.sent[i],
+                "failed": self.failed[i],
+            }
+            for i, ep in enumerate(self.endpoints)
+        ]
+
+
+broadcaster = Broadcaster()
@@ -0,0 +1,185 @@
+"""
+In‑process event bus for pipeline handoffs (new candidate → evaluator).
+
+`publish` calls every subscriber of a topic inline, so a candidate is
+queued for evaluation the moment the watcher commits it. The database stays
+the durable journal: NEW rows are resubmitted on start‑up and by a slow
+safety sweep (`EVAL_SWEEP_SEC`).
+
+With `BUS_BACKEND=postgres`, `journal` also issues `pg_notify` inside the
+publishing transaction and `listen` turns notifications from other
+processes into deliveries; each subscriber's `load` resolves the key back
+into the object (or None to skip it). A process ignores its own
+notifications, which it has already delivered locally.
+
+With `BUS_BACKEND=ipc` (role‑split runs, see `launcher`), `publish` also
+forwards the key over the supervisor's Unix socket broker (`ipc`) once the
+row is committed, and `listen` keeps that connection open.
+"""
+
+import asyncio, uuid
+from collections import defaultdict
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import text
+
+from pumpfun_sniper.config import settings
+from pumpfun_sniper.debug import dbg
+
+Handler = Callable[[Any], Any]
+Loader = Callable[[str], Awaitable[Any]]
+CHANNEL = "sniper_{topic}"
+
+
+class Bus:
+    def __init__(self, backend: str | None = None):
+        self.backend = backend or settings.BUS_BACKEND
+        self.origin = uuid.uuid4().hex[:12]
+        self._subs: dict[str, list[tuple[Handler, Loader | None]]] = defaultdict(list)
+        self.published = 0
+        self.delivered = 0
+        self.remote = 0
+        self.errors = 0
+        self._ipc: asyncio.StreamWriter | None = None
+
+    def subscribe(
+        self, topic: str, handler: Handler, load: Loader | None = None
+    ) -> Callable[[], None]:
+        """Register `handler` for `topic`; returns an unsubscribe function."""
+        entry = (handler, load)
+        self._subs[topic].append(entry)
+        return lambda: self._subs[topic].remove(entry)
+
+    def publish(self, topic: str, obj: Any, key: str | None = None) -> int:
+        """Deliver `obj` to every local subscriber; returns deliveries. With
+        the ipc backend, `key` is also sent to the other processes."""
+        self.published += 1
+        if key is not None and self._ipc is not None and not self._ipc.is_closing():
+            from pumpfun_sniper.ipc import encode
+
+            self._ipc.write(encode(topic, self.origin, key))
+        n = 0
+        for handler, _load in list(self._subs[topic]):
+            try:
+                handler(obj)
+                n += 1
+            except Exception as e:  # a bad subscriber must not stop the watcher
+                self.errors += 1
+                dbg(f"BUS {topic} handler failed: {e}")
+        self.delivered += n
+        return n
+
+    # ─── Postgres LISTEN / NOTIFY ──────────────────────────────────────
+    async def journal(self, session, topic: str, key: str) -> None:
+        """Queue a notification for other processes; it is sent when
+        `session` commits, so listeners never see an uncommitted row."""
+        if self.backend != "postgres":
+            return
+        await session.execute(
+            text("SELECT pg_notify(:ch, :payload)"),
+            {"ch": CHANNEL.format(topic=topic), "payload": f"{self.origin}:{key}"},
+        )
+
+    async def _deliver_remote(self, topic: str, payload: str) -> None:
+        origin, _, key = payload.partition(":")
+        if origin == self.origin:
+            return
+        self.remote += 1
+        for handler, load in list(self._subs[topic]):
+            if load is None:
+                continue
+            try:
+                obj = await load(key)
+                if obj is not None:
+                    handler(obj)
+                    self.delivered += 1
+            except Exception as e:
+                self.errors += 1
+                dbg(f"BUS {topic} remote delivery of {key} failed: {e}")
+
+    async def listen(self) -> None:
+        """Receive notifications from other processes (postgres / ipc)."""
+        if self.backend == "ipc":
+            return await self._listen_ipc()
+        if self.backend != "postgres":
+            return
+        from pumpfun_sniper.db import engine
+
+        loop = asyncio.get_running_loop()
+        tasks: set[asyncio.Task] = set()
+        backoff = 0.5
+        while True:
+            closed = asyncio.Event()
+            try:
+                async with engine.connect() as conn:
+                    raw = (await conn.get_raw_connection()).driver_connection
+                    on_close = lambda *_: closed.set()
+                    raw.add_termination_listener(on_close)
+                    listeners = []
+                    for topic in list(self._subs):
+
+                        def on_notify(_c, _pid, _ch, payload, topic=topic):
+                            t = loop.create_task(self._deliver_remote(topic, payload))
+                            tasks.add(t)
+                            t.add_done_callback(tasks.discard)
+
+                        ch = CHANNEL.format(topic=topic)
+                        await raw.add_listener(ch, on_notify)
+                        listeners.append((ch, on_notify))
+                    dbg(f"BUS listening on {', '.join(self._subs)}")
+                    backoff = 0.5
+                    try:
+                        await closed.wait()
+                    finally:  # the connection goes back to the pool
+                        raw.remove_termination_listener(on_close)
+                        if not raw.is_closed():
+                            for ch, cb in listeners:
+                                await raw.remove_listener(ch, cb)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                dbg(f"BUS listener error: {e}")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    # ─── Unix socket broker ────────────────────────────────────────────
+    async def _listen_ipc(self) -> None:
+        from pumpfun_sniper.ipc import decode
+
+        backoff = 0.1
+        while True:
+            try:
+                reader, self._ipc = await asyncio.open_unix_connection(
+                    settings.IPC_SOCKET
+                )
+                dbg(f"BUS connected to {settings.IPC_SOCKET}")
+                backoff = 0.1
+                while line := await reader.readline():
+                    msg = decode(line)
+                    if msg is not None:
+                        topic, origin, key = msg
+                        await self._deliver_remote(topic, f"{origin}:{key}")
+            except asyncio.CancelledError:
+                raise
+            except OSError as e:
+                dbg(f"BUS ipc error: {e}")
+            finally:
+                if self._ipc is not None:
+                    self._ipc.close()
+                    self._ipc = None
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 5.0)
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend,
+            "ipc_connected": self._ipc is not None,
+            "topics": {t: len(s) for t, s in self._subs.items()},
+            "published": self.published,
+            "delivered": self.delivered,
+            "remote": self.remote,
+            "errors": self.errors,
+        }
+
+
+bus = Bus()
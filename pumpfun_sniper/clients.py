@@ -0,0 +1,148 @@
+"""
+Process‑wide pooled HTTP clients.
+
+One long‑lived `httpx.AsyncClient` per upstream origin (scheme + host) with
+HTTP/2 where available, tuned keep‑alive, a per‑host connection limit and
+start‑up pre‑warming, so the buy path and monitor ticks reuse warm TCP+TLS
+connections instead of handshaking on every call.
+"""
+
+import asyncio, time
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+import httpx
+
+from pumpfun_sniper import metrics
+from pumpfun_sniper.config import settings
+from pumpfun_sniper.debug import dbg
+
+try:  # HTTP/2 needs the optional `h2` package (httpx[http2])
+    import h2  # noqa: F401
+
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+
+@dataclass
+class HostStats:
+    requests: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_ms: float = 0.0
+
+
+_clients: dict[str, httpx.AsyncClient] = {}
+_stats: dict[str, HostStats] = {}
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def client(url: str) -> httpx.AsyncClient:
+    """Return the shared client for `url`'s origin, creating it on first use."""
+    origin = _origin(url)
+    cli = _clients.get(origin)
+    if cli is None or cli.is_closed:
+        cli = _clients[origin] = httpx.AsyncClient(
+            http2=_HTTP2 and settings.HTTP2,
+            timeout=settings.HTTP_TIMEOUT_SEC,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONN_PER_HOST,
+                max_keepalive_connections=settings.HTTP_MAX_CONN_PER_HOST,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_SEC,
+            ),
+        )
+        _stats.setdefault(origin, HostStats())
+        dbg(f"HTTP new client {origin} http2={_HTTP2 and settings.HTTP2}")
+    return cli
+
+
+async def request(method: str, url: str, **kw) -> httpx.Response:
+    """Send a request through the pooled client, recording per‑host latency,
+    status codes and throttling."""
+    cli = client(url)
+    origin = _origin(url)
+    host = origin.split("://", 1)[-1]
+    st = _stats[origin]
+    st.in_flight += 1
+    st.peak_in_flight = max(st.peak_in_flight, st.in_flight)
+    t0 = time.perf_counter()
+    try:
+        r = await cli.request(method, url, **kw)
+    except httpx.HTTPError:
+        st.errors += 1
+        metrics.inc("http_errors_total", host=host)
+        raise
+    finally:
+        ms = (time.perf_counter() - t0) * 1000
+        st.in_flight -= 1
+        st.requests += 1
+        st.total_ms += ms
+        st.last_ms = ms
+        st.max_ms = max(st.max_ms, ms)
+        metrics.observe("http_request_seconds", ms / 1000, host=host)
+    metrics.inc("http_requests_total", host=host, code=str(r.status_code))
+    if r.status_code == 429:
+        metrics.inc("http_throttled_total", host=host)
+    elif r.status_code >= 500:
+        metrics.inc("http_errors_total", host=host)
+    return r
+
+
+async def get(url: str, **kw) -> httpx.Response:
+    return await request("GET", url, **kw)
+
+
+async def post(url: str, **kw) -> httpx.Response:
+    return await request("POST", url, **kw)
+
+
+async def prewarm(urls: list[str]) -> None:
+    """Open a connection to every upstream origin ahead of the first real call."""
+
+    async def _one(url: str) -> None:
+        try:
+            await request("HEAD", _origin(url))
+        except httpx.HTTPError as e:
+            dbg(f"HTTP prewarm {_origin(url)} failed: {e}")
+
+    await asyncio.gather(*(_one(u) for u in {_origin(u): u for u in urls}.values()))
+
+
+def _pool_size(cli: httpx.AsyncClient) -> int:
+    # httpcore keeps its connection list private; report 0 if that changes
+    pool = getattr(getattr(cli, "_transport", None), "_pool", None)
+    return len(getattr(pool, "connections", ()))
+
+
+def stats() -> dict[str, dict]:
+    """Per‑host request counts, latency and pool utilisation."""
+    out = {}
+    for origin, st in _stats.items():
+        cli = _clients.get(origin)
+        conns = _pool_size(cli) if cli is not None else 0
+        out[origin] = {
+            "requests": st.requests,
+            "errors": st.errors,
+            "avg_ms": st.total_ms / st.requests if st.requests else 0.0,
+            "last_ms": st.last_ms,
+            "max_ms": st.max_ms,
+            "in_flight": st.in_flight,
+            "peak_in_flight": st.peak_in_flight,
+            "connections": conns,
+            "utilisation": st.in_flight / settings.HTTP_MAX_CONN_PER_HOST,
+        }
+    return out
+
+
+async def aclose_all() -> None:
+    clients = list(_clients.values())
+    _clients.clear()
+    await asyncio.gather(*(c.aclose() for c in clients), return_exceptions=True)
@@ -0,0 +1,51 @@
+"""
+Swappable time source. Pipeline code reads time through `clock.monotonic()`
+and `clock.utcnow()` so a replay (see `replay`) can drive grace periods,
+rechecks, stops and stream staleness from recorded timestamps instead of
+the wall clock.
+"""
+
+import datetime as dt
+import time
+
+
+class SystemClock:
+    @staticmethod
+    def monotonic() -> float:
+        return time.monotonic()
+
+    @staticmethod
+    def utcnow() -> dt.datetime:
+        return dt.datetime.utcnow()
+
+
+class VirtualClock:
+    """Manually advanced clock; `now` is epoch seconds."""
+
+    def __init__(self, now: float):
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def utcnow(self) -> dt.datetime:
+        return dt.datetime.utcfromtimestamp(self.now)
+
+    def advance(self, to: float) -> None:
+        self.now = max(self.now, to)
+
+
+_clock: SystemClock | VirtualClock = SystemClock()
+
+
+def use(c: SystemClock | VirtualClock) -> None:
+    global _clock
+    _clock = c
+
+
+def monotonic() -> float:
+    return _clock.monotonic()
+
+
+def utcnow() -> dt.datetime:
+    return _clock.utcnow()
@@ -5,34 +5,146 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     # ─── External endpoints ──────────────────────────────────────────────
     HELIUS_WSS: str  # wss://mainnet.helius-rpc.com/?api-key=…
+    HELIUS_WSS_URLS: str = ""  # comma-separated discovery URLs (default HELIUS_WSS)
     PUMP_FUN_PROGRAM: str = "Pump1111111111111111111111111111111111111111"
+    PUMP_BONDING_PROGRAM: str = "6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P"
     RUGCHECK_KEY: str
     BIRDEYE_KEY: str
     RPC_HTTP: str = "https://api.mainnet-beta.solana.com"
+    RPC_WSS: str | None = None  # signatureSubscribe feed (default HELIUS_WSS)
+    RPC_SEND_URLS: str = (
+        ""  # comma-separated RPC / block-engine URLs (default RPC_HTTP)
+    )
     JUPITER_QUOTE: str = "https://quote-api.jup.ag/v6/quote"
     JUPITER_SWAP: str = "https://quote-api.jup.ag/v6/swap"
-    MORALIS_KEY: str | None = None  # optional (bonding check)
+    BONDING_WSS: str | None = None  # accountSubscribe feed (default HELIUS_WSS)
 
     # ─── Wallet and auth ────────────────────────────────────────────────
     BASE_WALLET: str
     KEYPAIR_PATH: str  # filesystem path to id.json (array of ints)
+    KEYPAIR_PATHS: str = ""  # comma-separated extra wallets for parallel swaps
 
     # ─── Trading parameters (runtime‑tunable via .env) ──────────────────
     BUY_SIZE_SOL: float = 0.01
     SLIPPAGE_BPS: int = 75
-    JITO_TIP_LAMPORTS: int = 2_000_000
+    JITO_TIP_LAMPORTS: int = 2_000_000  # fallback before netstats has samples
     TAKE_PROFIT_PCT: float = 200.0
     TRAIL_STOP_PCT: float = 35.0
     BONDING_EXIT_THRESHOLD: float = 90.0
     CREATION_GRACE_SEC: int = 20
     RUG_RECHECK_SEC: int = 30
     MIGRATION_WAIT_SEC: int = 15
+    BONDING_TTL_SEC: float = 10.0  # refresh curve state via RPC when older
+    PRICE_STALE_SEC: float = 5.0  # trade stream silent → fall back to Birdeye
+    POSITIONS_FLUSH_SEC: float = 1.0  # write‑behind interval for stop moves
+    POSITIONS_SWEEP_SEC: float = 30.0  # adopt open positions the bus missed
+    RUG_TIMEOUT_SEC: int = 180
+
+    # ─── Token filter rules (see rules.py) ──────────────────────────────
+    FILTER_RULES: str = (
+        "holders >= 50; lp_locked_pct >= 70; "
+        "creator_balance_pct <= 10; market_cap_usd >= 2000"
+    )
+    FILTER_RULES_PATH: str = ""  # rules file, hot-reloaded; overrides FILTER_RULES
+    FILTER_RULES_RELOAD_SEC: float = 2.0  # mtime check interval
+
+    # ─── RugCheck scheduler ─────────────────────────────────────────────
+    RUGCHECK_RATE_PER_SEC: float = 5.0  # token‑bucket refill rate
+    RUGCHECK_BURST: int = 10
+    RUGCHECK_WORKERS: int = 4  # concurrent report requests
+    RUGCHECK_CACHE_SEC: float = 10.0  # report reuse window
+
+    # ─── Mint discovery ─────────────────────────────────────────────────
+    DISCOVERY_COPIES: int = 1  # concurrent subscriptions per discovery URL
+    DISCOVERY_DEDUPE_SIZE: int = 50_000  # signatures remembered for dedupe
+    DISCOVERY_MAX_BACKOFF_SEC: float = 30.0
+
+    # ─── Candidate evaluation engine ────────────────────────────────────
+    EVAL_WORKERS: int = 8  # concurrent candidate evaluations
+    EVAL_SWEEP_SEC: float = 30.0  # safety sweep for NEW rows the bus missed
+    BUS_BACKEND: str = "local"  # local | postgres (LISTEN/NOTIFY) | ipc (launcher)
+
+    # ─── Role‑split launcher (see launcher.py) ─────────────────────────
+    ROLES: str = ""  # e.g. "watcher+evaluator,executor,dashboard"; "" = one process
+    IPC_SOCKET: str = "/tmp/pumpfun-sniper.sock"  # supervisor's pub/sub broker
+    SUPERVISOR_BACKOFF_MAX_SEC: float = 30.0  # restart delay cap for crashed roles
+
+    # ─── Network conditions / tips ──────────────────────────────────────
+    JITO_TIP_FLOOR_URL: str = "https://bundles.jito.wtf/api/v1/bundles/tip_floor"
+    NET_SAMPLE_SEC: float = 5.0
+    NET_WINDOW: int = 60  # samples kept in the rolling model
+    NET_CU_ESTIMATE: int = 200_000  # compute units per swap (fee → tip fallback)
+    TIP_ENTRY_PCTL: float = 75.0
+    TIP_EXIT_PCTL: float = 95.0  # stop‑loss exits
+    TIP_MIN_LAMPORTS: int = 10_000
+    TIP_MAX_LAMPORTS: int = 10_000_000
+
+    # ─── Speculative quote prefetch ─────────────────────────────────────
+    QUOTE_REFRESH_SEC: float = 1.0
+    QUOTE_TTL_SEC: float = 3.0  # older prefetched routes are re-quoted
+    QUOTE_MAX_DRIFT_BPS: float = 50.0  # price move that invalidates a route
+    QUOTE_PREFETCH_MAX_SEC: float = 120.0  # stop warming a mint after this
+    QUOTE_PREBUILD_TX: bool = False  # also pre-build the swap transaction
+
+    # ─── Seen‑name / blocked‑creator index ──────────────────────────────
+    SEEN_INDEX_BLOOM: bool = False  # Bloom filter instead of a name set
+    SEEN_INDEX_CAPACITY: int = 10_000_000  # expected names (Bloom sizing)
+
+    # ─── Wallet pool (see wallets.py) ──────────────────────────────────
+    WALLET_ASSIGN: str = "least_loaded"  # least_loaded | sticky (hash of the mint)
+    WALLET_MAX_INFLIGHT: int = 2  # concurrent swaps per wallet
+    WALLET_BALANCE_SEC: float = 30.0  # balance reconciliation interval
+
+    # ─── HTTP client pool ───────────────────────────────────────────────
+    HTTP2: bool = True  # used when the optional h2 package is installed
+    HTTP_TIMEOUT_SEC: float = 10.0
+    HTTP_MAX_CONN_PER_HOST: int = 20
+    HTTP_KEEPALIVE_SEC: float = 60.0
 
     # ─── Persistence / retries ─────────────────────────────────────────
     DB_DSN: str
+    DB_PREWARM_CONNECTIONS: int = 4  # pooled connections opened at start‑up
     MAX_RETRIES: int = 3
+    TX_REBROADCAST_SEC: float = 2.0
+    TX_STATUS_POLL_SEC: float = 1.0
+    TX_EXPIRY_SEC: float = 90.0  # stop waiting (outcome unknown, no resend)
+    LOG_QUEUE_SIZE: int = 10_000
+    LOG_BATCH_SIZE: int = 200
+    LOG_FLUSH_SEC: float = 1.0
+    LOG_OVERFLOW: str = "drop"  # drop | sample | block
+    LOG_SAMPLE_EVERY: int = 10
     BACKOFF_SEC: float = 0.5
 
+    # ─── Retention ──────────────────────────────────────────────────────
+    RETENTION_INTERVAL_SEC: float = 3600.0
+    RETENTION_BATCH: int = 5000  # rows archived + deleted per transaction
+    RETENTION_LOGS_DAYS: float = 7.0  # 0 keeps rows forever
+    RETENTION_REJECTED_DAYS: float = 3.0  # REJECTED candidates
+    RETENTION_SEEN_NAMES_DAYS: float = 0.0  # pruned names may be reused
+    RETENTION_ARCHIVE_DIR: str = "archive"  # gzip JSONL per table/day; "" = delete
+    DB_PARTITION_LOGS: bool = False  # Postgres: daily range partitions for logs
+    PARTITION_DAYS_AHEAD: int = 3
+
+    # ─── PnL analytics (see analytics.py) ───────────────────────────────
+    ANALYTICS_HOURS: int = 168  # hourly PnL buckets kept
+    ANALYTICS_SYNC_SEC: float = 5.0  # pick up trades closed by other processes
+    ANALYTICS_CHECKPOINT_SEC: float = 60.0
+    ANALYTICS_RESCAN_IDS: int = 1000  # ids below the cursor re-read for late commits
+
+    # ─── Dashboard streams ──────────────────────────────────────────────
+    SSE_POLL_SEC: float = 2.0
+    SSE_SNAPSHOT_ROWS: int = 500  # rows sent on connect / kept per stream
+    SSE_PAGE_ROWS: int = 500  # max rows per poll or history page
+    SSE_QUEUE_SIZE: int = 100  # per-client backlog before it is dropped
+
+    # ─── Record / replay ────────────────────────────────────────────────
+    RECORD_PATH: str = ""  # append market data to this .jsonl.gz (empty = off)
+    RECORD_FLUSH_EVERY: int = 1000  # events between flushes
+
+    # ─── Metrics ────────────────────────────────────────────────────────
+    METRICS_ENABLED: bool = True  # latency spans / counters behind /metrics
+    METRICS_SPAN_MINTS: int = 2000  # per-mint timelines kept for /api/latency
+
     # ─── Simulation mode ───────────────────────────────────────────────
     SIMULATION: bool = False
 
@@ -1,76 +1,233 @@
 """
 FastAPI server with Server‑Sent Events (SSE) endpoints plus a static SPA.
+Each stream is served by a shared `sse_hub.StreamHub`, so any number of
+browser tabs cost one DB poll per stream.
+
+Streams, `/api/analytics` and the `open_positions` gauge come from the DB
+and cover every role. The other `/api/*` stats and `/metrics` series
+describe this process: in a split run (see `launcher`) the roles that do
+not share the dashboard's process are left out.
 """
 
-import asyncio, json, datetime as dt, pathlib
-from fastapi import FastAPI
-from fastapi.responses import HTMLResponse
+import pathlib
+from sqlalchemy import func, select
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import HTMLResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from sse_starlette.sse import EventSourceResponse
 from fastapi.staticfiles import StaticFiles
-from pumpfun_sniper.db import async_session, Candidate, OpenPos, ClosedPos, LogEntry
+from pumpfun_sniper import clients, executor, metrics, rugcheck
+from pumpfun_sniper.analytics import analytics
+from pumpfun_sniper.bus import bus
+from pumpfun_sniper.db import Candidate, OpenPos, ClosedPos, LogEntry, session_ctx
+from pumpfun_sniper.netstats import netstats
+from pumpfun_sniper.positions import book
+from pumpfun_sniper.quotecache import quotes
+from pumpfun_sniper.retention import retention
+from pumpfun_sniper.sse_hub import StreamHub
+from pumpfun_sniper.wallets import pool
 
 BASE = pathlib.Path(__file__).parent
 app = FastAPI()
 app.add_middleware(CORSMiddleware, allow_origins=["*"])
 app.mount("/static", StaticFiles(directory=BASE / "static"), name="static")
-HTML = (BASE / "static" / "index.html").read_text()
+_html: str | None = None  # read on the first page load, not at import
+
+
+def _local(role: str) -> bool:
+    """Whether `role` runs in this process (`main` sets `app.state.roles`;
+    all of them otherwise)."""
+    roles = getattr(app.state, "roles", None)
+    return roles is None or role in roles
+
+
+async def _open_positions() -> int:
+    async with session_ctx() as s:
+        return await s.scalar(select(func.count()).select_from(OpenPos))
 
 
 @app.get("/", response_class=HTMLResponse)
 async def index():
-    return HTML
+    global _html
+    if _html is None:
+        _html = (BASE / "static" / "index.html").read_text()
+    return _html
+
+
+@app.get("/api/evaluator")
+async def evaluator_stats():
+    """Evaluation queue depth and per-candidate wait times."""
+    engine = getattr(app.state, "evaluator", None)
+    if engine is None:
+        return {}
+    return {**engine.stats(), "candidates": engine.waits()}
+
+
+@app.get("/api/bus")
+async def bus_stats():
+    """Candidate handoffs published / delivered on the event bus."""
+    return bus.stats()
+
+
+@app.get("/api/wallets")
+async def wallet_stats():
+    """Per‑wallet swaps in flight, balance and failures."""
+    return pool.stats()
+
+
+@app.get("/api/discovery")
+async def discovery_stats():
+    """Per‑endpoint win rate and arrival lag of the discovery websockets."""
+    disc = getattr(app.state, "discovery", None)
+    return disc.report() if disc is not None else []
+
+
+@app.get("/api/executor")
+async def executor_stats():
+    """Duration of recent position‑monitor ticks."""
+    return executor.tick_stats()
+
+
+@app.get("/api/positions")
+async def position_stats():
+    """Size of the in‑memory position book and its write‑behind backlog
+    (only the DB count when the executor runs in another process)."""
+    if not _local("executor"):
+        return {"positions": await _open_positions()}
+    return book.stats()
+
+
+@app.get("/api/quotes")
+async def quote_stats():
+    """Hit / stale / drift counts of the speculative quote cache."""
+    return quotes.stats()
+
+
+@app.get("/api/network")
+async def network_stats():
+    """Current tip / priority‑fee recommendations and sample freshness."""
+    return netstats.stats()
 
 
-def _row(obj, cols):  # serialize SQLAlchemy row
-    d = {}
-    for c in cols:
-        v = getattr(obj, c)
-        if isinstance(v, dt.datetime):
-            v = v.isoformat(sep=" ", timespec="seconds")
-        d[c] = v
-    return d
+@app.get("/api/rugcheck")
+async def rugcheck_stats():
+    """RugCheck scheduler queue depth, cache hits and throttling."""
+    return rugcheck.scheduler.stats()
 
 
-async def _stream(model, cols, order_col):
-    while True:
-        async with async_session() as s:
-            rows = (
-                await s.scalars(model.__table__.select().order_by(order_col.desc()))
-            ).all()
-        yield "data:" + json.dumps([_row(r, cols) for r in rows]) + "\n\n"
-        await asyncio.sleep(2)
+@app.get("/api/retention")
+async def retention_stats():
+    """Rows archived / deleted by the retention job and its last run."""
+    return retention.stats()
+
+
+@app.get("/api/http")
+async def http_stats():
+    """Per‑host latency and connection‑pool utilisation of upstream APIs."""
+    return clients.stats()
+
+
+@app.get("/api/latency")
+async def latency_stats():
+    """p50 / p95 per pipeline stage and time‑since‑seen per lifecycle event."""
+    return metrics.summary()
+
+
+@app.get("/api/latency/{mint}")
+async def latency_spans(mint: str):
+    """Stage timeline of one mint, relative to its websocket receipt."""
+    spans = metrics.spans(mint)
+    if spans is None:
+        raise HTTPException(404, f"no timeline for {mint}")
+    return spans
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus():
+    """Prometheus text exposition of counters, gauges and histograms."""
+    metrics.gauge("open_positions", await _open_positions())  # any role
+    engine = getattr(app.state, "evaluator", None)
+    if engine is not None:
+        st = engine.stats()
+        metrics.gauge("evaluator_in_flight", st["in_flight"])
+        metrics.gauge("evaluator_ready", st["ready"])
+    if _local("evaluator"):  # the scheduler is idle elsewhere
+        rc = rugcheck.scheduler.stats()
+        metrics.gauge("rugcheck_queued", rc["queued"])
+        metrics.gauge("rugcheck_in_flight", rc["in_flight"])
+    for origin, st in clients.stats().items():
+        host = origin.split("://", 1)[-1]
+        metrics.gauge("http_in_flight", st["in_flight"], host=host)
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+HUBS = {
+    "candidates": StreamHub(
+        Candidate,
+        ["mint", "name", "status", "created_at"],
+        Candidate.created_at,
+        key="mint",
+    ),
+    "open": StreamHub(
+        OpenPos,
+        ["mint", "qty", "avg_price", "stop_price", "take_profit", "updated_at"],
+        OpenPos.updated_at,
+        key="mint",
+    ),
+    "closed": StreamHub(
+        ClosedPos,
+        ["mint", "qty", "pnl", "closed_at"],
+        ClosedPos.closed_at,
+        key="id",
+        append=True,
+    ),
+    "logs": StreamHub(
+        LogEntry, ["ts", "level", "msg"], LogEntry.ts, key="id", append=True
+    ),
+}
 
 
 @app.get("/socket/candidates")
 async def sse_candidates():
-    return EventSourceResponse(
-        _stream(
-            Candidate,
-            ["mint", "name", "status", "created_at"],
-            Candidate.created_at,
-        )
-    )
+    return EventSourceResponse(HUBS["candidates"].subscribe())
 
 
 @app.get("/socket/open")
 async def sse_open():
-    return EventSourceResponse(
-        _stream(
-            OpenPos,
-            ["mint", "qty", "avg_price", "stop_price", "take_profit", "updated_at"],
-            OpenPos.updated_at,
-        )
-    )
+    return EventSourceResponse(HUBS["open"].subscribe())
 
 
 @app.get("/socket/closed")
 async def sse_closed():
-    return EventSourceResponse(
-        _stream(ClosedPos, ["mint", "qty", "pnl", "closed_at"], ClosedPos.closed_at)
-    )
+    return EventSourceResponse(HUBS["closed"].subscribe())
 
 
 @app.get("/socket/logs")
 async def sse_logs():
-    return EventSourceResponse(_stream(LogEntry, ["ts", "level", "msg"], LogEntry.ts))
+    return EventSourceResponse(HUBS["logs"].subscribe())
+
+
+@app.get("/api/analytics")
+async def analytics_summary():
+    """Win rate, PnL, drawdown, PnL by hour and holding times, kept current
+    incrementally (no scan of `closed_positions`)."""
+    return analytics.summary()
+
+
+@app.get("/socket/analytics")
+async def sse_analytics():
+    return EventSourceResponse(analytics.stream())
+
+
+@app.get("/api/history/{stream}")
+async def history(stream: str, before: str | None = None, limit: int | None = None):
+    """Page backwards through a stream's history (`next` feeds `before`)."""
+    hub = HUBS.get(stream)
+    if hub is None:
+        raise HTTPException(404, f"unknown stream {stream}")
+    try:
+        return await hub.history(before, limit)
+    except ValueError as e:  # malformed `before`
+        raise HTTPException(400, str(e)) from None
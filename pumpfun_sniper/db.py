@@ -1,15 +1,32 @@
 """
 Async SQLAlchemy setup + helper CRUD shortcuts.
-Tables are created automatically on first run (no Alembic needed).
+Tables and indexes are created automatically on first run (no Alembic
+needed); indexes added later are created on existing tables at start‑up.
+With `DB_PARTITION_LOGS` on Postgres, `logs` is range‑partitioned by day;
+`init` creates the days up to `PARTITION_DAYS_AHEAD` before the first log
+row and `retention` keeps them ahead.
 """
 
 import os
+import asyncio
 import datetime as dt
 from typing import AsyncGenerator
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import declarative_base, sessionmaker, mapped_column, Mapped
-from sqlalchemy import String, DateTime, Float, Integer, select
+from sqlalchemy import (
+    String,
+    DateTime,
+    Float,
+    Integer,
+    Index,
+    Text,
+    inspect,
+    select,
+    insert,
+    text,
+)
+from pumpfun_sniper import clock
 from pumpfun_sniper.config import settings
 from pumpfun_sniper.debug import dbg
 
@@ -28,7 +45,7 @@ class SeenName(Base):
     __tablename__ = "seen_names"
     name: Mapped[str] = mapped_column(String(128), primary_key=True)
     first_seen: Mapped[dt.datetime] = mapped_column(
-        DateTime, default=dt.datetime.utcnow
+        DateTime, default=dt.datetime.utcnow, index=True
     )
 
 
@@ -46,9 +63,12 @@ class Candidate(Base):
     name: Mapped[str] = mapped_column(String(128))
     symbol: Mapped[str] = mapped_column(String(16))
     creator: Mapped[str] = mapped_column(String(44))
-    created_at: Mapped[dt.datetime] = mapped_column(DateTime)
+    created_at: Mapped[dt.datetime] = mapped_column(DateTime, index=True)
     status: Mapped[str] = mapped_column(String(16), default="NEW")
 
+    # NEW sweep and retention of old REJECTED rows
+    __table_args__ = (Index("ix_candidates_status_created", "status", "created_at"),)
+
 
 class OpenPos(Base):
     __tablename__ = "open_positions"
@@ -60,9 +80,10 @@ class OpenPos(Base):
     take_profit: Mapped[float] = mapped_column(Float)
     opened_at: Mapped[dt.datetime] = mapped_column(DateTime)
     updated_at: Mapped[dt.datetime] = mapped_column(
-        DateTime, default=dt.datetime.utcnow
+        DateTime, default=dt.datetime.utcnow, index=True
     )
     unrealized_pnl: Mapped[float] = mapped_column(Float, default=0.0)
+    wallet: Mapped[str | None] = mapped_column(String(44), nullable=True)
 
 
 class ClosedPos(Base):
@@ -74,22 +95,144 @@ class ClosedPos(Base):
     exit_price: Mapped[float] = mapped_column(Float)
     pnl: Mapped[float] = mapped_column(Float)
     opened_at: Mapped[dt.datetime] = mapped_column(DateTime)
-    closed_at: Mapped[dt.datetime] = mapped_column(DateTime)
+    closed_at: Mapped[dt.datetime] = mapped_column(DateTime, index=True)
+
+
+class AnalyticsState(Base):
+    """Checkpoint of the in‑memory PnL rollups (see analytics.py)."""
+
+    __tablename__ = "analytics_state"
+    name: Mapped[str] = mapped_column(String(32), primary_key=True)
+    last_id: Mapped[int] = mapped_column(Integer)  # closed_positions.id folded in
+    state: Mapped[str] = mapped_column(Text)
+    updated_at: Mapped[dt.datetime] = mapped_column(DateTime)
 
 
 class LogEntry(Base):
     __tablename__ = "logs"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    ts: Mapped[dt.datetime] = mapped_column(DateTime, default=dt.datetime.utcnow)
+    ts: Mapped[dt.datetime] = mapped_column(
+        DateTime, default=dt.datetime.utcnow, index=True
+    )
     level: Mapped[str] = mapped_column(String(8))
     msg: Mapped[str] = mapped_column(String(512))
 
 
 # ─────────────────────────── general helpers ──────────────────────────────────
+# the partition key must be part of the primary key on Postgres
+_PARTITIONED_LOGS = """
+CREATE TABLE IF NOT EXISTS logs (
+    id BIGSERIAL,
+    ts TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT (now() at time zone 'utc'),
+    level VARCHAR(8) NOT NULL,
+    msg VARCHAR(512) NOT NULL,
+    PRIMARY KEY (id, ts)
+) PARTITION BY RANGE (ts)
+"""
+
+
+_logs_partitioned = False
+
+
+def partitioned() -> bool:
+    """True once `init` found `logs` to be a partitioned Postgres table."""
+    return _logs_partitioned
+
+
+async def create_log_partitions(conn, today: dt.date) -> None:
+    """Daily `logs` partitions for `today` and `PARTITION_DAYS_AHEAD` days
+    after it. Rows that already landed in `logs_default` for a new day are
+    moved into its partition, which Postgres requires before attaching it."""
+    # one process at a time (split roles all run `init`)
+    await conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('logs'))"))
+    for i in range(settings.PARTITION_DAYS_AHEAD + 1):
+        day = today + dt.timedelta(days=i)
+        nxt = day + dt.timedelta(days=1)
+        name = f"logs_p{day:%Y%m%d}"
+        if await conn.scalar(text(f"SELECT to_regclass('{name}') IS NOT NULL")):
+            continue
+        await conn.execute(text(f"CREATE TABLE {name} (LIKE logs INCLUDING DEFAULTS)"))
+        await conn.execute(
+            text(
+                "WITH moved AS (DELETE FROM logs_default "
+                f"WHERE ts >= '{day}' AND ts < '{nxt}' RETURNING *) "
+                f"INSERT INTO {name} SELECT * FROM moved"
+            )
+        )
+        await conn.execute(
+            text(
+                f"ALTER TABLE logs ATTACH PARTITION {name} "
+                f"FOR VALUES FROM ('{day}') TO ('{nxt}')"
+            )
+        )
+
+
+def _create_indexes(conn) -> None:
+    """`create_all` skips indexes of tables that already exist."""
+    for table in Base.metadata.sorted_tables:
+        for idx in table.indexes:
+            idx.create(conn, checkfirst=True)
+
+
+def _add_columns(conn) -> None:
+    """Nor does it add new (nullable) columns to existing tables."""
+    insp = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        have = {c["name"] for c in insp.get_columns(table.name)}
+        for col in table.columns:
+            if col.name not in have:
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {col.name} "
+                conn.execute(text(ddl + col.type.compile(conn.dialect)))
+                dbg(f"SQL added {table.name}.{col.name}")
+
+
 async def init() -> None:
-    """Create tables if they do not yet exist."""
+    """Create tables and indexes if they do not yet exist."""
+    global _logs_partitioned
     async with engine.begin() as conn:
+        if settings.DB_PARTITION_LOGS and engine.dialect.name == "postgresql":
+            await conn.execute(text(_PARTITIONED_LOGS))
+            _logs_partitioned = bool(
+                await conn.scalar(
+                    text("SELECT relkind = 'p' FROM pg_class WHERE relname = 'logs'")
+                )
+            )
+            if _logs_partitioned:
+                await conn.execute(
+                    text(
+                        "CREATE TABLE IF NOT EXISTS logs_default "
+                        "PARTITION OF logs DEFAULT"
+                    )
+                )
+                # before the first log row, which would otherwise land in
+                # the default partition until the first retention pass
+                await create_log_partitions(conn, clock.utcnow().date())
+            else:
+                dbg("SQL logs already exists unpartitioned; keeping it")
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_add_columns)
+        await conn.run_sync(_create_indexes)
+
+
+async def prewarm(n: int | None = None) -> None:
+    """Open `n` pooled connections at once so the first burst of writes
+    finds them ready instead of connecting one by one."""
+    n = min(settings.DB_PREWARM_CONNECTIONS if n is None else n, engine.pool.size())
+    if n <= 0:
+        return
+    held = asyncio.Barrier(n)  # keep each open until all are, or they are reused
+
+    async def _one() -> None:
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                await held.wait()
+        except Exception as e:
+            await held.abort()
+            if not isinstance(e, asyncio.BrokenBarrierError):
+                dbg(f"SQL prewarm failed: {e}")
+
+    await asyncio.gather(*(_one() for _ in range(n)))
 
 
 class session_ctx:
@@ -106,8 +249,89 @@ class session_ctx:
 
 
 # tiny logger ------------------------------------------------------------------
+class LogSink:
+    """Background log writer: a bounded queue drained into bulk INSERTs that
+    are flushed once `LOG_BATCH_SIZE` rows are queued or every
+    `LOG_FLUSH_SEC`. When the queue is full, `LOG_OVERFLOW` decides:
+    `drop` the line, `sample` (keep 1 in `LOG_SAMPLE_EVERY` once the queue is
+    half full; ERRORs are always kept) or `block` the caller."""
+
+    def __init__(self):
+        self._queue: asyncio.Queue = asyncio.Queue(settings.LOG_QUEUE_SIZE)
+        self._full = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._seen = 0
+        self._closing = False
+        self.dropped = 0
+        self.written = 0
+
+    def _start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def put(self, level: str, msg: str) -> None:
+        row = {"ts": clock.utcnow(), "level": level[:8], "msg": msg[:510]}
+        self._start()
+        q = self._queue
+        if settings.LOG_OVERFLOW == "block":
+            await q.put(row)
+        else:
+            if settings.LOG_OVERFLOW == "sample" and level != "ERROR":
+                if q.qsize() >= q.maxsize // 2:
+                    self._seen += 1
+                    if self._seen % settings.LOG_SAMPLE_EVERY:
+                        self.dropped += 1
+                        return
+            try:
+                q.put_nowait(row)
+            except asyncio.QueueFull:
+                self.dropped += 1
+                return
+        if q.qsize() >= settings.LOG_BATCH_SIZE:
+            self._full.set()
+
+    async def _run(self) -> None:
+        q = self._queue
+        while True:
+            batch = [await q.get()]
+            if not self._closing and q.qsize() < settings.LOG_BATCH_SIZE - 1:
+                self._full.clear()
+                try:
+                    await asyncio.wait_for(self._full.wait(), settings.LOG_FLUSH_SEC)
+                except asyncio.TimeoutError:
+                    pass
+            while len(batch) < settings.LOG_BATCH_SIZE and not q.empty():
+                batch.append(q.get_nowait())
+            rows = [r for r in batch if r is not None]
+            if rows:
+                await self._write(rows)
+            if self._closing and q.empty():
+                return
+
+    async def _write(self, rows: list[dict]) -> None:
+        try:
+            async with session_ctx() as s:
+                await s.execute(insert(LogEntry), rows)
+                await s.commit()
+            self.written += len(rows)
+        except Exception as e:  # never let logging take the bot down
+            self.dropped += len(rows)
+            dbg(f"SQL LOG flush of {len(rows)} rows failed: {e}")
+
+    async def close(self) -> None:
+        """Flush everything still queued and stop the writer."""
+        if self._task is None or self._task.done():
+            return
+        self._closing = True
+        self._full.set()
+        await self._queue.put(None)  # wake the writer if it is idle
+        await self._task
+
+
+log_sink = LogSink()
+
+
 async def log(level: str, msg: str):
-    async with session_ctx() as s:
-        s.add(LogEntry(level=level[:8], msg=msg[:510]))
-        await s.commit()
+    """Queue a log row; only waits when LOG_OVERFLOW=block and the queue is full."""
+    await log_sink.put(level, msg)
     dbg(f"SQL LOG {level} {msg}")
@@ -3,6 +3,11 @@ import datetime as dt
 from pumpfun_sniper.config import settings
 
 
+def enabled() -> bool:
+    """Guard for call sites whose debug message is costly to format."""
+    return settings.DEBUG == "verbose"
+
+
 def dbg(msg: str) -> None:
     if settings.DEBUG == "verbose":
         ts = dt.datetime.utcnow().isoformat()
@@ -0,0 +1,97 @@
+"""
+Fast‑path decoder for the Helius program‑log stream.
+
+Most pump.fun frames are trades, so raw frames are pre‑filtered with a
+substring test for the create instruction before any JSON parsing. Frames
+that survive are parsed with orjson when it is installed and the
+`CreateEvent` record is decoded straight from its Borsh layout.
+"""
+
+import base64, json, struct
+from dataclasses import dataclass
+
+try:  # optional, ~3x faster than the stdlib parser
+    import orjson
+
+    loads = orjson.loads
+except ImportError:
+    loads = json.loads
+
+from solders.pubkey import Pubkey
+
+CREATE_MARKER = "Program log: Instruction: Create"
+CREATE_DISCRIMINATOR = bytes([27, 114, 169, 77, 222, 235, 99, 118])  # event:CreateEvent
+_PREFIX = "Program data: "
+_U32 = struct.Struct("<I")
+_SIG_KEY = '"signature"'
+
+
+@dataclass(slots=True)
+class MintEvent:
+    mint: str
+    name: str
+    symbol: str
+    uri: str
+    bonding_curve: str
+    creator: str
+    signature: str | None = None
+
+
+def is_create(raw: str | bytes) -> bool:
+    """Cheap pre‑filter on the undecoded frame."""
+    if isinstance(raw, bytes):
+        return CREATE_MARKER.encode() in raw
+    return CREATE_MARKER in raw
+
+
+def signature(raw: str | bytes) -> str | None:
+    """Extract the transaction signature without parsing the frame."""
+    if isinstance(raw, bytes):
+        raw = raw.decode()
+    i = raw.find(_SIG_KEY)
+    if i < 0:
+        return None
+    start = raw.find('"', i + len(_SIG_KEY)) + 1
+    end = raw.find('"', start)
+    return raw[start:end] if start and end > start else None
+
+
+def _string(data: bytes, off: int) -> tuple[str, int]:
+    (n,) = _U32.unpack_from(data, off)
+    off += 4
+    return data[off : off + n].decode(errors="ignore"), off + n
+
+
+def decode_create(data: bytes) -> MintEvent:
+    """Decode a Borsh‑encoded CreateEvent (discriminator included)."""
+    if data[:8] != CREATE_DISCRIMINATOR:
+        raise ValueError("not a CreateEvent")
+    name, off = _string(data, 8)
+    symbol, off = _string(data, off)
+    uri, off = _string(data, off)
+    if len(data) < off + 96:
+        raise ValueError("truncated CreateEvent")
+    mint, curve, user = (
+        str(Pubkey.from_bytes(data[off + i : off + i + 32])) for i in (0, 32, 64)
+    )
+    return MintEvent(mint, name, symbol, uri, curve, user)
+
+
+def find_create(logs: list[str]) -> MintEvent | None:
+    """First CreateEvent in a frame's log lines, if any."""
+    for line in logs:
+        if not line.startswith(_PREFIX):
+            continue
+        data = base64.b64decode(line[len(_PREFIX) :])
+        if data[:8] == CREATE_DISCRIMINATOR:
+            return decode_create(data)
+    return None
+
+
+def parse(raw: str | bytes) -> dict | None:
+    """`params.result.value` of a logsNotification, or None for other frames."""
+    data = loads(raw)
+    params = data.get("params")
+    if params is None:
+        return None
+    return params["result"]["value"]
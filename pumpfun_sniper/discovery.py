@@ -0,0 +1,154 @@
+"""
+Hedged mint discovery: N concurrent `logsSubscribe` connections (several
+Helius‑style URLs and/or duplicate connections per URL), deduplicated by
+transaction signature so whichever copy arrives first is forwarded. Every
+connection reconnects on its own with jittered exponential backoff, and
+per‑endpoint win‑rate and arrival‑lag stats show which endpoints to drop.
+
+A `Discovery()` built without a handler subscribes and buffers frames until
+`attach` is called, so start‑up can get the subscription live before the DB
+and the seen‑name index are warm.
+"""
+
+import asyncio, json, random, time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+import websockets
+
+from pumpfun_sniper.config import settings
+from pumpfun_sniper.debug import dbg
+from pumpfun_sniper.decoder import signature
+
+Handler = Callable[[str | bytes], Awaitable[None]]
+
+
+def endpoints() -> list[str]:
+    """Configured discovery URLs, each repeated DISCOVERY_COPIES times."""
+    urls = [u.strip() for u in settings.HELIUS_WSS_URLS.split(",") if u.strip()]
+    urls = urls or [settings.HELIUS_WSS]
+    return [u for u in urls for _ in range(max(settings.DISCOVERY_COPIES, 1))]
+
+
+@dataclass
+class EndpointStats:
+    url: str
+    connected: bool = False
+    reconnects: int = 0
+    frames: int = 0
+    wins: int = 0
+    lag_total: float = 0.0  # seconds behind the winning copy, summed
+    lag_max: float = 0.0
+
+
+class Discovery:
+    def __init__(self, handler: Handler | None = None, urls: list[str] | None = None):
+        self._handler = handler
+        self._attached = asyncio.Event()
+        if handler is not None:
+            self._attached.set()
+        urls = urls or endpoints()
+        self.stats = [EndpointStats(u) for u in urls]
+        self._seen: OrderedDict[str, float] = OrderedDict()  # signature -> first ts
+        self._queue: asyncio.Queue = asyncio.Queue(10_000)
+
+    def attach(self, handler: Handler) -> None:
+        """Start handing frames (buffered ones first) to `handler`."""
+        self._handler = handler
+        self._attached.set()
+
+    def _subscription(self) -> str:
+        return json.dumps(
+            {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "logsSubscribe",
+                "params": [
+                    {"mentions": [settings.PUMP_FUN_PROGRAM]},
+                    {"commitment": "processed"},
+                ],
+            }
+        )
+
+    def _on_frame(self, st: EndpointStats, raw: str | bytes) -> None:
+        sig = signature(raw)
+        if sig is None:  # subscription confirmations etc.
+            return
+        now = time.monotonic()
+        st.frames += 1
+        first = self._seen.get(sig)
+        if first is not None:
+            lag = now - first
+            st.lag_total += lag
+            st.lag_max = max(st.lag_max, lag)
+            return
+        self._seen[sig] = now
+        if len(self._seen) > settings.DISCOVERY_DEDUPE_SIZE:
+            self._seen.popitem(last=False)
+        st.wins += 1
+        try:
+            self._queue.put_nowait(raw)
+        except asyncio.QueueFull:
+            dbg("DISCOVERY queue full, frame dropped")
+
+    async def _connection(self, st: EndpointStats) -> None:
+        backoff = 0.5
+        while True:
+            try:
+                dbg(f"DISCOVERY connect {st.url}")
+                async with websockets.connect(st.url, ping_interval=20) as ws:
+                    await ws.send(self._subscription())
+                    st.connected, backoff = True, 0.5
+                    async for raw in ws:
+                        self._on_frame(st, raw)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                from pumpfun_sniper.db import log
+
+                await log(
+                    "WARN", f"discovery endpoint {st.url.split('?')[0]} failed: {e}"
+                )
+            st.connected = False
+            st.reconnects += 1
+            await asyncio.sleep(backoff * (0.5 + random.random()))
+            backoff = min(backoff * 2, settings.DISCOVERY_MAX_BACKOFF_SEC)
+
+    async def _dispatch(self) -> None:
+        await self._attached.wait()
+        while True:
+            raw = await self._queue.get()
+            try:
+                await self._handler(raw)
+            except Exception as e:
+                from pumpfun_sniper.db import log
+
+                await log("ERROR", f"discovery handler failed: {e}")
+
+    async def run(self) -> None:
+        tasks = [asyncio.create_task(self._dispatch())]
+        tasks += [asyncio.create_task(self._connection(st)) for st in self.stats]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for t in tasks:
+                t.cancel()
+
+    def report(self) -> list[dict]:
+        """Per‑endpoint win rate and mean/max lag behind the first copy."""
+        out = []
+        for st in self.stats:
+            late = st.frames - st.wins
+            out.append(
+                {
+                    "url": st.url.split("?")[0],  # hide api keys
+                    "connected": st.connected,
+                    "reconnects": st.reconnects,
+                    "frames": st.frames,
+                    "win_rate": st.wins / st.frames if st.frames else 0.0,
+                    "lag_avg_ms": st.lag_total / late * 1000 if late else 0.0,
+                    "lag_max_ms": st.lag_max * 1000,
+                }
+            )
+        return out
@@ -0,0 +1,141 @@
+"""
+Concurrent candidate evaluation engine.
+
+A single deadline heap drives grace periods and RugCheck rechecks; due jobs
+are handed to a bounded pool of workers, so no coroutine is parked in
+`sleep` per candidate. Jobs are deduplicated by key (the mint) while in
+flight.
+"""
+
+import asyncio, heapq, itertools
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from pumpfun_sniper import clock
+from pumpfun_sniper.config import settings
+from pumpfun_sniper.db import log
+from pumpfun_sniper.debug import dbg
+
+
+@dataclass
+class Job:
+    key: str
+    payload: Any
+    submitted: float = field(default_factory=clock.monotonic)
+    due: float = 0.0
+    steps: int = 0
+    waited: float = 0.0  # total seconds spent due but not yet running
+    state: dict = field(default_factory=dict)
+
+
+# A step runs one unit of work and returns the delay until the next step,
+# or None once the job is finished.
+Step = Callable[[Job], Awaitable[float | None]]
+
+
+class Evaluator:
+    def __init__(self, step: Step, workers: int | None = None):
+        self._step = step
+        self._workers = workers or settings.EVAL_WORKERS
+        self._heap: list[tuple[float, int, Job]] = []
+        self._seq = itertools.count()
+        self._ready: asyncio.Queue[Job] = asyncio.Queue()
+        self._jobs: dict[str, Job] = {}
+        self._running = 0
+        self._wake = asyncio.Event()
+
+    # ─── scheduling ────────────────────────────────────────────────────
+    def submit(self, key: str, payload: Any, delay: float = 0.0) -> bool:
+        """Schedule a new job; returns False if `key` is already in flight."""
+        if key in self._jobs:
+            return False
+        job = Job(key, payload)
+        self._jobs[key] = job
+        self._schedule(job, delay)
+        dbg(f"EVAL submit {key} in {delay:.1f}s")
+        return True
+
+    def _schedule(self, job: Job, delay: float) -> None:
+        job.due = clock.monotonic() + max(delay, 0.0)
+        heapq.heappush(self._heap, (job.due, next(self._seq), job))
+        self._wake.set()
+
+    async def _timer(self) -> None:
+        while True:
+            now = clock.monotonic()
+            while self._heap and self._heap[0][0] <= now:
+                _, _, job = heapq.heappop(self._heap)
+                self._ready.put_nowait(job)
+            self._wake.clear()
+            timeout = self._heap[0][0] - now if self._heap else None
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run_job(self, job: Job) -> None:
+        job.waited += clock.monotonic() - job.due
+        job.steps += 1
+        self._running += 1
+        try:
+            delay = await self._step(job)
+        except Exception as e:
+            # drop the job; the periodic NEW sweep resubmits it unless it
+            # left NEW (a buy of unknown outcome stays BUYING)
+            await log("ERROR", f"evaluation of {job.key[:8]}… failed: {e}")
+            delay = None
+        finally:
+            self._running -= 1
+        if delay is None:
+            self._jobs.pop(job.key, None)
+        else:
+            self._schedule(job, delay)
+
+    async def _worker(self) -> None:
+        while True:
+            await self._run_job(await self._ready.get())
+
+    # ─── discrete‑event driving (replays) ──────────────────────────────
+    def next_due(self) -> float | None:
+        return self._heap[0][0] if self._heap else None
+
+    async def run_due(self) -> int:
+        """Run every job due at `clock.monotonic()` inline, in deadline
+        order, without the timer / worker tasks; returns jobs stepped."""
+        n = 0
+        while self._heap and self._heap[0][0] <= clock.monotonic():
+            _, _, job = heapq.heappop(self._heap)
+            await self._run_job(job)
+            n += 1
+        return n
+
+    async def run(self) -> None:
+        tasks = [asyncio.create_task(self._timer())]
+        tasks += [asyncio.create_task(self._worker()) for _ in range(self._workers)]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for t in tasks:
+                t.cancel()
+
+    # ─── introspection ─────────────────────────────────────────────────
+    def stats(self) -> dict:
+        """Queue depth and wait-time summary for the dashboard / debugging."""
+        waits = [j.waited for j in self._jobs.values()]
+        return {
+            "in_flight": len(self._jobs),
+            "scheduled": len(self._heap),
+            "ready": self._ready.qsize(),
+            "running": self._running,
+            "workers": self._workers,
+            "wait_avg": sum(waits) / len(waits) if waits else 0.0,
+            "wait_max": max(waits, default=0.0),
+        }
+
+    def waits(self) -> dict[str, dict]:
+        """Per-candidate age, accumulated queue wait and step count."""
+        now = clock.monotonic()
+        return {
+            k: {"age": now - j.submitted, "waited": j.waited, "steps": j.steps}
+            for k, j in self._jobs.items()
+        }
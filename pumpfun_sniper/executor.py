@@ -1,64 +1,181 @@
 """
 Monitors open positions: updates trailing stops, triggers TP/SL, monitors
 bonding‑curve %, and writes PnL to closed_positions.
+
+Positions live in the in‑memory `positions.book` (new ones arrive as
+`position` bus messages, see `adopt`); each tick prices every held mint,
+trails all stops and finds all exits in one vectorised pass and never
+reads `open_positions` (stop moves are written behind by the book).
+Between ticks, streamed trades (`pricefeed`) trail stops and trigger exits
+as they arrive; Birdeye is only polled for mints without a live stream
+price.
 """
 
-import asyncio, math, datetime as dt
+import asyncio, math, time
+from collections import deque
+
+from sqlalchemy import delete, select
+
+from pumpfun_sniper import clock, metrics, positions
+from pumpfun_sniper.analytics import analytics
+from pumpfun_sniper.bus import bus
 from pumpfun_sniper.config import settings
 from pumpfun_sniper.db import session_ctx, OpenPos, ClosedPos, log
+from pumpfun_sniper.debug import dbg
 from pumpfun_sniper.birdeye import get_prices
-from pumpfun_sniper.bonding import bonding_pct
+from pumpfun_sniper.bonding import bonding_pcts, curves
 from pumpfun_sniper.jupiter import sell
+from pumpfun_sniper.positions import Position, book
+from pumpfun_sniper.pricefeed import prices
+
+# (duration ms, open positions) of the most recent ticks
+_ticks: deque[tuple[float, int]] = deque(maxlen=200)
+_exit_tasks: set[asyncio.Task] = set()  # per‑trade exits still running
 
 
-async def _close(p: OpenPos, exit_price: float):
+async def _close(p: Position, exit_price: float):
     pnl = (exit_price - p.avg_price) * p.qty
+    row = ClosedPos(
+        mint=p.mint,
+        qty=p.qty,
+        entry_price=p.avg_price,
+        exit_price=exit_price,
+        pnl=pnl,
+        opened_at=p.opened_at,
+        closed_at=clock.utcnow(),
+    )
     async with session_ctx() as s:
-        closed = ClosedPos(
-            mint=p.mint,
-            qty=p.qty,
-            entry_price=p.avg_price,
-            exit_price=exit_price,
-            pnl=pnl,
-            opened_at=p.opened_at,
-            closed_at=dt.datetime.utcnow(),
-        )
-        await s.delete(p)
-        s.add(closed)
+        await s.execute(delete(OpenPos).where(OpenPos.mint == p.mint))
+        s.add(row)
         await s.commit()
+    analytics.record(row.id, pnl, row.opened_at, row.closed_at)
+    book.remove(p.mint)
+    curves.unwatch(p.mint)
+    prices.untrack(p.mint)
+    metrics.mark(p.mint, "closed")
     await log("INFO", f"CLOSED {p.mint[:6]}… PnL={pnl:.4f} SOL")
 
 
+async def _exit(mint: str, curr: float) -> None:
+    """Sell and close `mint`; raises on failure, leaving it in the book."""
+    p = book.get(mint)
+    if p is None:
+        return
+    book.set_exiting(mint, True)
+    metrics.mark(mint, "exit_trigger")
+    try:
+        urgency = "exit" if curr <= p.stop_price else "entry"  # stop‑loss bids up
+        with metrics.trade(mint, "exit"):
+            await sell(mint, math.floor(p.qty), urgency, p.wallet)
+        await _close(p, curr)
+    finally:
+        book.set_exiting(mint, False)  # no‑op once closed
+
+
+async def _try_exit(mint: str, curr: float) -> None:
+    """`_exit` that logs a failure instead of raising: the position stays
+    open and the next tick (or streamed trade) tries again."""
+    try:
+        await _exit(mint, curr)
+    except Exception as e:
+        await log("ERROR", f"exit {mint[:6]}… failed, retrying: {e!r}")
+
+
+def on_price(mint: str, price: float) -> None:
+    """Streamed trade for a held mint: trail the stop and exit immediately
+    on stop / take‑profit instead of waiting for the next tick."""
+    if book.on_price(mint, price, settings.TRAIL_STOP_PCT):
+        book.set_exiting(mint, True)
+        task = asyncio.get_running_loop().create_task(_try_exit(mint, price))
+        _exit_tasks.add(task)
+        task.add_done_callback(_exit_tasks.discard)
+
+
+def adopt(p: Position) -> None:
+    """A position opened by the evaluator: hold it and stream its price
+    before the first monitor tick."""
+    if p.mint not in book:
+        book.add(p)
+    prices.track(p.mint)
+
+
+def subscribe():
+    """Receive new positions from the bus; returns the unsubscribe function."""
+    return bus.subscribe("position", adopt, positions.load)
+
+
+async def reconcile() -> int:
+    """Adopt open positions whose `position` message never arrived (ipc is
+    at‑most‑once); returns how many were missing from the book."""
+    async with session_ctx() as s:
+        mints = set(await s.scalars(select(OpenPos.mint)))
+    n = 0
+    for mint in mints.difference(book.mints):
+        p = await positions.load(mint)  # None if it closed meanwhile
+        if p is not None and p.mint not in book:
+            await log("WARN", f"adopting {mint[:6]}… missed on the bus")
+            adopt(p)
+            n += 1
+    return n
+
+
+async def drain() -> None:
+    """Wait for per‑trade exits triggered so far to finish."""
+    while _exit_tasks:
+        await asyncio.gather(*_exit_tasks, return_exceptions=True)
+
+
+async def tick() -> int:
+    """Run one monitor pass; returns the number of open positions."""
+    mints = book.live()
+    if not mints:
+        return len(book)
+
+    curr_prices = {m: px for m in mints if (px := prices.price(m)) is not None}
+    missing = [m for m in mints if m not in curr_prices]
+    if missing:  # stream stalled or no trade seen yet
+        curr_prices.update(await get_prices(missing))
+    try:
+        pcts = await bonding_pcts(mints)
+    except Exception as e:
+        dbg(f"MONITOR bonding refresh failed: {e}")
+        pcts = {}
+
+    book.set_prices(curr_prices)
+    exits = dict(book.evaluate(settings.TRAIL_STOP_PCT))
+    for m, pct in pcts.items():
+        if pct >= settings.BONDING_EXIT_THRESHOLD and m in curr_prices:
+            exits.setdefault(m, curr_prices[m])
+    for m, curr in exits.items():
+        if m in book and not book.exiting[book.slot[m]]:
+            await _try_exit(m, curr)
+    return len(book)
+
+
+def tick_stats() -> dict:
+    """Duration summary of recent monitor ticks."""
+    if not _ticks:
+        return {}
+    ms = [t[0] for t in _ticks]
+    return {
+        "ticks": len(ms),
+        "last_ms": ms[-1],
+        "avg_ms": sum(ms) / len(ms),
+        "max_ms": max(ms),
+        "positions": _ticks[-1][1],
+    }
+
+
 async def monitor_loop():
+    for m in book.mints:
+        prices.track(m)
+    prices.listen(on_price)
     while True:
-        async with session_ctx() as s:
-            positions = (await s.scalars(OpenPos.__table__.select())).all()
-        if not positions:
-            await asyncio.sleep(3)
-            continue
-
-        prices = await get_prices([p.mint for p in positions])
-        for p in positions:
-            curr = prices.get(p.mint)
-            if not curr:
-                continue
-
-            # update trailing stop
-            new_stop = max(p.stop_price, curr * (1 - settings.TRAIL_STOP_PCT / 100))
-            async with session_ctx() as s:
-                pos = await s.get(OpenPos, p.mint)
-                pos.stop_price = new_stop
-                pos.unrealized_pnl = (curr - pos.avg_price) * pos.qty
-                pos.updated_at = dt.datetime.utcnow()
-                await s.commit()
-
-            # exit conditions
-            if curr <= new_stop or curr >= p.take_profit:
-                await sell(p.mint, math.floor(p.qty))
-                await _close(p, curr)
-                continue
-            pct = await bonding_pct(p.mint)
-            if pct and pct >= settings.BONDING_EXIT_THRESHOLD:
-                await sell(p.mint, math.floor(p.qty))
-                await _close(p, curr)
+        t0 = time.perf_counter()
+        n = await tick()
+        if n:
+            ms = (time.perf_counter() - t0) * 1000
+            _ticks.append((ms, n))
+            metrics.observe("monitor_tick_seconds", ms / 1000)
+            dbg(f"MONITOR tick {n} positions in {ms:.1f} ms")
         await asyncio.sleep(3)
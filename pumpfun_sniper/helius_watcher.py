@@ -1,22 +1,27 @@
 """
-Listens to Pump.fun program logs via Helius Geyser WebSocket and inserts new
-token mints as *candidates* in the database. Duplicate names and blocked
-creators are filtered server‑side.
+Listens to Pump.fun program logs via Helius Geyser WebSocket(s) and inserts new
+token mints as *candidates* in the database, then publishes them on the
+`bus` for immediate evaluation. Duplicate names and blocked creators are
+filtered against the in‑memory `seen_index` (against the DB while it warms
+up at start‑up).
 """
 
-import asyncio, base64, json, re, datetime as dt, websockets
+import asyncio
 
+from pumpfun_sniper.bus import bus
 from pumpfun_sniper.config import settings
 from pumpfun_sniper.db import session_ctx, SeenName, BlockedCreator, Candidate, log
+from pumpfun_sniper import clock, debug, metrics
 from pumpfun_sniper.debug import dbg
+from pumpfun_sniper.decoder import is_create, parse, find_create
+from pumpfun_sniper.discovery import Discovery
+from pumpfun_sniper.seen_index import index
+from pumpfun_sniper.pricefeed import prices
+from pumpfun_sniper.recorder import recorder
 
 # Program ID to watch for mint events
 PUMP_FUN_PROGRAM = settings.PUMP_FUN_PROGRAM
 
-# Regex helpers for metadata parsing ------------------------------------------
-NAME_RE = re.compile(rb"name\x04(.+?)\x00")
-SYMB_RE = re.compile(rb"symbol\x06(.+?)\x00")
-
 
 async def name_seen(name: str) -> bool:
     async with session_ctx() as s:
@@ -28,57 +33,85 @@ async def creator_blocked(creator: str) -> bool:
         return await s.get(BlockedCreator, creator) is not None
 
 
-async def helius_loop() -> None:
-    sub = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "logsSubscribe",
-        "params": [
-            {"mentions": [PUMP_FUN_PROGRAM]},
-            {"commitment": "processed"},
-        ],
-    }
+async def handle_frame(raw: str | bytes) -> None:
+    """Process one websocket frame: feed trades to the price engine and
+    insert new mints as candidates."""
+    if debug.enabled():
+        dbg(f"HELIUS recv {raw}")
+    if recorder.active:
+        recorder.frame(raw)
+    prices.touch()
+    metrics.inc("frames_total")
+    create = is_create(raw)
+    if not create and not prices.tracking:
+        return  # trade frame and nothing held: skip JSON parsing entirely
+    value = parse(raw)
+    if value is None:
+        return
+    logs = value["logs"]
+    prices.on_logs(logs)
+    if not create:
+        return
+    recv = clock.monotonic()
     try:
-        dbg(f"HELIUS connect {settings.HELIUS_WSS}")
-        async with websockets.connect(settings.HELIUS_WSS, ping_interval=20) as ws:
-            await ws.send(json.dumps(sub))
-            dbg(f"HELIUS send {sub}")
-            async for raw in ws:
-                dbg(f"HELIUS recv {raw}")
-                data = json.loads(raw)
-                if "params" not in data:
-                    continue
-                logs = data["params"]["result"]["value"]["logs"]
-                # Expect a base64 metadata line → decode
-                try:
-                    b64 = next(l.split(" ")[-1] for l in logs if "base64" in l)
-                    meta = base64.b64decode(b64)
-                    name = NAME_RE.search(meta).group(1).decode(errors="ignore")
-                    sym = SYMB_RE.search(meta).group(1).decode(errors="ignore")
-                    mint = data["params"]["result"]["value"]["logPubkey"]
-                    creator = data["params"]["result"]["value"]["accounts"][0]
-                except Exception as e:
-                    await log("WARN", f"metadata parse failed: {e}")
-                    continue
+        ev = find_create(logs)
+    except Exception as e:
+        await log("WARN", f"metadata parse failed: {e}")
+        return
+    if ev is None:
+        return
+    name, sym, mint, creator = ev.name, ev.symbol, ev.mint, ev.creator
 
-                if await name_seen(name) or await creator_blocked(creator):
-                    continue
+    if index.loaded:
+        drop = index.check(name, creator)
+        if drop is None:  # Bloom hit, confirm against the DB
+            drop = await name_seen(name)
+    else:  # index still warming up at start-up
+        drop = await creator_blocked(creator) or await name_seen(name)
+    if drop:
+        return
 
-                async with session_ctx() as s:
-                    s.add(
-                        Candidate(
-                            mint=mint,
-                            name=name,
-                            symbol=sym,
-                            creator=creator,
-                            created_at=dt.datetime.utcnow(),
-                            status="NEW",
-                        )
-                    )
-                    s.add(SeenName(name=name))
-                    await s.commit()
-                await log("INFO", f"NEW candidate {name} ({sym}) {mint[:8]}…")
-    except Exception as e:
-        if isinstance(e, asyncio.CancelledError):
-            raise
-        await log("ERROR", f"helius watcher failed: {e}")
+    metrics.seen(mint, recv)
+    with metrics.timer("candidate_insert", mint):
+        async with session_ctx() as s:
+            cand = Candidate(
+                mint=mint,
+                name=name[:128],
+                symbol=sym[:16],
+                creator=creator,
+                created_at=clock.utcnow(),
+                status="NEW",
+            )
+            s.add(cand)
+            s.add(SeenName(name=name[:128]))
+            await bus.journal(s, "candidate", mint)
+            await s.commit()
+    metrics.inc("candidates_total")
+    index.add_name(name[:128])
+    bus.publish("candidate", cand, key=mint)
+    await log("INFO", f"NEW candidate {name} ({sym}) {mint[:8]}…")
+
+
+async def handle_trades(raw: str | bytes) -> None:
+    """`handle_frame` for an executor running without the watcher role:
+    only feeds trades of held mints to the price engine."""
+    prices.touch()
+    if not prices.tracking or is_create(raw):
+        return
+    value = parse(raw)
+    if value is not None:
+        prices.on_logs(value["logs"])
+
+
+async def helius_loop(supervisor: Discovery | None = None) -> None:
+    """Run hedged discovery (see `discovery.Discovery`) into `handle_frame`
+    while the seen‑name index warms up."""
+    supervisor = supervisor or Discovery()
+    supervisor.attach(handle_frame)
+    run = asyncio.create_task(supervisor.run())
+    try:
+        if not index.loaded:
+            await index.load()
+        await run
+    finally:
+        run.cancel()
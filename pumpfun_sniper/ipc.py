@@ -0,0 +1,66 @@
+"""
+Local pub/sub over a Unix socket for role‑split runs (see `launcher`).
+
+The supervisor runs one `Broker`; every role process connects a `bus` to
+it (`BUS_BACKEND=ipc`). Messages are JSON lines `{"t": topic, "o": origin,
+"k": key}` carrying only a key: receivers load the row from the DB, which
+stays the source of truth. The broker forwards each line to every other
+connection and keeps no state, so a restarted role simply reconnects.
+"""
+
+import asyncio, json, os
+
+from pumpfun_sniper.debug import dbg
+
+
+def encode(topic: str, origin: str, key: str) -> bytes:
+    return json.dumps({"t": topic, "o": origin, "k": key}).encode() + b"\n"
+
+
+def decode(line: bytes) -> tuple[str, str, str] | None:
+    try:
+        msg = json.loads(line)
+        return msg["t"], msg["o"], msg["k"]
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+class Broker:
+    def __init__(self, path: str):
+        self.path = path
+        self._clients: set[asyncio.StreamWriter] = set()
+        self._server: asyncio.AbstractServer | None = None
+        self.forwarded = 0
+
+    async def start(self) -> None:
+        if os.path.exists(self.path):
+            os.unlink(self.path)  # stale socket from a crashed supervisor
+        self._server = await asyncio.start_unix_server(self._serve, path=self.path)
+        dbg(f"IPC broker listening on {self.path}")
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._clients.add(writer)
+        try:
+            while line := await reader.readline():
+                for other in list(self._clients):
+                    if other is not writer and not other.is_closing():
+                        other.write(line)
+                        self.forwarded += 1
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+
+    @property
+    def clients(self) -> int:
+        return len(self._clients)
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for w in list(self._clients):
+            w.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
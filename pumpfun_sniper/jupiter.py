@@ -1,102 +1,145 @@
 """
-Buy / sell helpers via Jupiter quote + swap endpoints with an optional Jito tip.
+Buy / sell helpers via Jupiter quote + swap endpoints with a Jito tip sized
+by `netstats` for the swap's urgency. Each swap signs with a wallet leased
+from `wallets.pool`.
 """
 
-import asyncio, base64, httpx, json
-from tenacity import retry, stop_after_attempt, wait_exponential
+import asyncio, base64
+import httpx
+from tenacity import retry, retry_if_exception_type, stop_after_attempt
+from tenacity import wait_exponential
 
-from solana.rpc.async_api import AsyncClient
-from solders.keypair import Keypair
-from solders.transaction import Transaction
-from solana.rpc.types import TxOpts
+from solders.transaction import VersionedTransaction
 
+from pumpfun_sniper import clients, metrics
+from pumpfun_sniper.broadcast import RESENDABLE, broadcaster
 from pumpfun_sniper.config import settings
 from pumpfun_sniper.db import log
 from pumpfun_sniper.debug import dbg
+from pumpfun_sniper.netstats import netstats
+from pumpfun_sniper.recorder import recorder
+from pumpfun_sniper.wallets import Wallet, pool
 
 _SOL = "So11111111111111111111111111111111111111112"
-_keypair: Keypair | None = None
-
-
-def kp() -> Keypair:
-    global _keypair
-    if _keypair is None:
-        with open(settings.KEYPAIR_PATH, "r") as fh:
-            _keypair = Keypair.from_json(json.load(fh))
-    return _keypair
 
 
 async def _quote(inp: str, out: str, amount: int) -> dict:
-    async with httpx.AsyncClient(timeout=10) as cli:
-        params = {
-            "inputMint": inp,
-            "outputMint": out,
-            "amount": amount,
-            "slippageBps": settings.SLIPPAGE_BPS,
-        }
-        dbg(f"JUPITER QUOTE {settings.JUPITER_QUOTE} {params}")
-        r = await cli.get(settings.JUPITER_QUOTE, params=params)
+    params = {
+        "inputMint": inp,
+        "outputMint": out,
+        "amount": amount,
+        "slippageBps": settings.SLIPPAGE_BPS,
+    }
+    dbg(f"JUPITER QUOTE {settings.JUPITER_QUOTE} {params}")
+    with metrics.timer("quote"):
+        r = await clients.get(settings.JUPITER_QUOTE, params=params)
         dbg(f"JUPITER QUOTE RESPONSE {r.status_code} {r.text[:200]}")
         r.raise_for_status()
-        return r.json()["data"][0]
-
-
-async def _swap_tx(route: dict) -> bytes:
-    async with httpx.AsyncClient(timeout=10) as cli:
-        payload = {
-            "quoteResponse": route,
-            "userPublicKey": str(kp().pubkey()),
-            "wrapAndUnwrapSol": True,
-            "priorityFeeLamports": {"jitoTipLamports": settings.JITO_TIP_LAMPORTS},
-        }
-        dbg(f"JUPITER SWAP {settings.JUPITER_SWAP} {payload}")
-        r = await cli.post(settings.JUPITER_SWAP, json=payload)
+        route = r.json()["data"][0]
+    if recorder.active:
+        recorder.record(
+            "quote", {"in": inp, "out": out, "amount": amount, "route": route}
+        )
+    return route
+
+
+async def _swap_tx(
+    route: dict, urgency: str = "entry", wallet: Wallet | None = None
+) -> tuple[bytes, int | None]:
+    """Unsigned swap transaction for `wallet` plus its lastValidBlockHeight."""
+    payload = {
+        "quoteResponse": route,
+        "userPublicKey": (wallet or pool.primary).pubkey,
+        "wrapAndUnwrapSol": True,
+        "priorityFeeLamports": {"jitoTipLamports": netstats.tip(urgency)},
+    }
+    dbg(f"JUPITER SWAP {settings.JUPITER_SWAP} {payload}")
+    with metrics.timer("swap_build"):
+        r = await clients.post(settings.JUPITER_SWAP, json=payload)
         dbg(f"JUPITER SWAP RESPONSE {r.status_code} {r.text[:200]}")
         r.raise_for_status()
-        return base64.b64decode(r.json()["swapTransaction"])
+        body = r.json()
+    return base64.b64decode(body["swapTransaction"]), body.get("lastValidBlockHeight")
+
+
+def _payer(raw: bytes) -> str:
+    return str(VersionedTransaction.from_bytes(raw).message.account_keys[0])
+
+
+async def _send(
+    raw: bytes,
+    last_valid_block_height: int | None = None,
+    wallet: Wallet | None = None,
+) -> str:
+    """Sign and fan the transaction out until it confirms (see `broadcast`)."""
+    tx = VersionedTransaction.from_bytes(raw)
+    signed = VersionedTransaction(tx.message, [(wallet or pool.primary).keypair])
+    sig = str(signed.signatures[0])
+    dbg(f"RPC broadcast {sig}")
+    return await broadcaster.submit(bytes(signed), sig, last_valid_block_height)
 
 
 @retry(
+    # only when no earlier attempt can still land: a failed build, or a
+    # send that provably did not swap (see `broadcast.RESENDABLE`)
+    retry=retry_if_exception_type((httpx.HTTPError, *RESENDABLE)),
     stop=stop_after_attempt(settings.MAX_RETRIES),
     wait=wait_exponential(multiplier=settings.BACKOFF_SEC),
+    reraise=True,
 )
-async def _send(raw: bytes) -> str:
-    tx = Transaction.from_bytes(raw)
-    tx.sign(kp())
-    async with AsyncClient(settings.RPC_HTTP) as rpc:
-        dbg(f"RPC send_transaction to {settings.RPC_HTTP}")
-        sig = (
-            await rpc.send_transaction(
-                tx,
-                kp(),
-                opts=TxOpts(skip_preflight=True, max_retries=settings.MAX_RETRIES),
-            )
-        ).value
-        dbg(f"RPC transaction signature {sig}")
-        await rpc.confirm_transaction(sig, commitment="confirmed")
-        return sig
+async def _swap_and_send(
+    route: dict, urgency: str = "entry", wallet: Wallet | None = None
+) -> str:
+    # a retry needs a fresh swap transaction: the old blockhash may be expired
+    raw, last_valid = await _swap_tx(route, urgency, wallet)
+    return await _send(raw, last_valid, wallet)
 
 
 # Public helpers --------------------------------------------------------------
-async def buy(sol_amount: float, mint: str) -> tuple[float, str]:
+async def buy(
+    sol_amount: float,
+    mint: str,
+    route: dict | None = None,
+    tx: tuple[bytes, int | None] | None = None,
+    wallet: Wallet | None = None,
+) -> tuple[float, str]:
+    """Buy `mint` with `wallet` (default: `pool.pick`); a prefetched `route` /
+    built `tx` (see `quotecache`) skips the quote / swap round trips."""
     lamports = int(sol_amount * 1e9)
-    route = await _quote(_SOL, mint, lamports)
+    if route is None:
+        route = await _quote(_SOL, mint, lamports)
     price = lamports / float(route["outAmount"])
     if settings.SIMULATION:
         await log("INFO", f"SIM BUY {mint[:6]}… {sol_amount} SOL")
         return price, "SIMULATED"
-    raw = await _swap_tx(route)
-    sig = await _send(raw)
+    wallet = wallet or pool.pick(mint, sol_amount)
+    if tx is not None and _payer(tx[0]) != wallet.pubkey:
+        tx = None  # prebuilt for another wallet
+    sig = None
+    async with pool.lease(wallet):
+        if tx is not None:
+            try:
+                sig = await _send(*tx, wallet)
+            except RESENDABLE as e:  # anything else may still land
+                dbg(f"prebuilt swap for {mint} did not land, rebuilding: {e}")
+        if sig is None:
+            sig = await _swap_and_send(route, "entry", wallet)
+    pool.adjust(wallet, -sol_amount)
     await log("INFO", f"BUY {mint[:6]}… {sol_amount} SOL sig={sig}")
     return price, sig
 
 
-async def sell(mint: str, qty: int) -> str:
+async def sell(
+    mint: str, qty: int, urgency: str = "entry", wallet: str | None = None
+) -> str:
+    """Sell `qty` of `mint` from the wallet that bought it."""
     route = await _quote(mint, _SOL, qty)
     if settings.SIMULATION:
         await log("INFO", f"SIM SELL {mint[:6]}… qty={qty}")
         return "SIMULATED"
-    raw = await _swap_tx(route)
-    sig = await _send(raw)
+    w = pool.get(wallet)
+    async with pool.lease(w):
+        sig = await _swap_and_send(route, urgency, w)
+    pool.adjust(w, int(route["outAmount"]) / 1e9)
     await log("INFO", f"SELL {mint[:6]}… qty={qty} sig={sig}")
     return sig
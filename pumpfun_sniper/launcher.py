@@ -0,0 +1,181 @@
+"""
+Runs the bot's roles in one process (the default, same as `main`) or split
+across processes under a supervisor, so a busy watcher, evaluator and
+executor each get their own core and GIL.
+
+    python -m pumpfun_sniper.launcher                    # all roles, one process
+    python -m pumpfun_sniper.launcher --split            # one process per role
+    python -m pumpfun_sniper.launcher --roles watcher+evaluator,executor,dashboard
+
+Comma‑separated groups run as separate processes, `+` keeps roles together.
+The supervisor hosts the `ipc` broker, starts each group with
+`BUS_BACKEND=ipc` (unless Postgres LISTEN/NOTIFY is configured), restarts a
+crashed group with exponential backoff and forwards SIGINT / SIGTERM. The
+DB stays the source of truth: roles only exchange keys and every role
+reloads its state from the DB when it (re)starts. Use Postgres for split
+runs; SQLite serialises writers across processes.
+"""
+
+import argparse, asyncio, os, signal, sys, time
+from collections import Counter
+from typing import Callable
+
+from pumpfun_sniper.config import settings
+from pumpfun_sniper.debug import dbg
+
+ROLES = ("watcher", "evaluator", "executor", "dashboard")
+
+
+def parse_groups(spec: str = "", split: bool = False) -> list[tuple[str, ...]]:
+    """`"watcher+evaluator,executor"` → [("watcher", "evaluator"), ("executor",)]."""
+    if split:
+        return [(r,) for r in ROLES]
+    if not spec.strip():
+        return [ROLES]
+    groups = [
+        tuple(r.strip() for r in g.split("+") if r.strip())
+        for g in spec.split(",")
+        if g.strip()
+    ]
+    roles = [r for g in groups for r in g]
+    if unknown := set(roles) - set(ROLES):
+        raise ValueError(f"unknown roles: {', '.join(sorted(unknown))}")
+    if len(roles) != len(set(roles)):
+        raise ValueError(f"a role is listed twice in {spec!r}")
+    return groups
+
+
+def _child_command(group: tuple[str, ...]) -> list[str]:
+    return [sys.executable, "-m", "pumpfun_sniper.launcher", "--child", "+".join(group)]
+
+
+class Supervisor:
+    def __init__(
+        self,
+        groups: list[tuple[str, ...]],
+        command: Callable[[tuple[str, ...]], list[str]] = _child_command,
+    ):
+        from pumpfun_sniper.ipc import Broker
+
+        self.groups = groups
+        self.command = command
+        self.broker = Broker(settings.IPC_SOCKET)
+        self.procs: dict[str, asyncio.subprocess.Process] = {}
+        self.restarts: Counter[str] = Counter()
+        self._keepers: list[asyncio.Task] = []
+
+    def _env(self) -> dict:
+        env = dict(os.environ, IPC_SOCKET=settings.IPC_SOCKET)
+        if settings.BUS_BACKEND != "postgres":
+            env["BUS_BACKEND"] = "ipc"
+        return env
+
+    async def _keep(self, group: tuple[str, ...]) -> None:
+        """Run one group, restarting it whenever it exits."""
+        name = "+".join(group)
+        backoff = min(1.0, settings.SUPERVISOR_BACKOFF_MAX_SEC)
+        while True:
+            started = time.monotonic()
+            proc = await asyncio.create_subprocess_exec(
+                *self.command(group),
+                env=self._env(),
+                start_new_session=True,  # Ctrl‑C reaches the supervisor only
+            )
+            self.procs[name] = proc
+            dbg(f"SUPERVISOR started {name} pid={proc.pid}")
+            code = await proc.wait()
+            self.restarts[name] += 1
+            if time.monotonic() - started > 60:  # ran fine for a while
+                backoff = min(1.0, settings.SUPERVISOR_BACKOFF_MAX_SEC)
+            print(
+                f"[supervisor] {name} exited ({code}), restarting in {backoff:.1f}s",
+                flush=True,
+            )
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, settings.SUPERVISOR_BACKOFF_MAX_SEC)
+
+    async def start(self) -> None:
+        await self.broker.start()
+        self._keepers = [asyncio.create_task(self._keep(g)) for g in self.groups]
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Stop restarting, SIGTERM every child and kill stragglers."""
+        for k in self._keepers:
+            k.cancel()
+        await asyncio.gather(*self._keepers, return_exceptions=True)
+        live = [p for p in self.procs.values() if p.returncode is None]
+        for p in live:
+            p.send_signal(signal.SIGTERM)
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(p.wait() for p in live)), timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            for p in live:
+                if p.returncode is None:
+                    p.kill()
+        await self.broker.close()
+
+    def stats(self) -> dict:
+        return {
+            "roles": {
+                name: {
+                    "pid": p.pid,
+                    "running": p.returncode is None,
+                    "restarts": self.restarts[name],
+                }
+                for name, p in self.procs.items()
+            },
+            "ipc_clients": self.broker.clients,
+            "ipc_forwarded": self.broker.forwarded,
+        }
+
+
+async def supervise(groups: list[tuple[str, ...]]) -> None:
+    from pumpfun_sniper import db
+
+    await db.init()  # once, so roles starting together do not race on DDL
+    await db.engine.dispose()
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    sup = Supervisor(groups)
+    await sup.start()
+    print(f"[supervisor] running {', '.join('+'.join(g) for g in groups)}", flush=True)
+    await stop.wait()
+    print("[supervisor] stopping roles...", flush=True)
+    await sup.stop()
+
+
+def cli(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(
+        prog="python -m pumpfun_sniper.launcher",
+        description="Run the sniper's roles in one process or supervised processes.",
+    )
+    ap.add_argument(
+        "--roles",
+        default=settings.ROLES,
+        help=f"process groups, e.g. watcher+evaluator,executor (roles: {', '.join(ROLES)})",
+    )
+    ap.add_argument("--split", action="store_true", help="one process per role")
+    ap.add_argument("--child", help=argparse.SUPPRESS)  # set by the supervisor
+    args = ap.parse_args(argv)
+
+    if args.child:
+        groups = [tuple(args.child.split("+"))]
+    else:
+        try:
+            groups = parse_groups(args.roles, args.split)
+        except ValueError as e:
+            ap.error(str(e))
+    if len(groups) == 1:
+        from pumpfun_sniper.main import main
+
+        asyncio.run(main(groups[0]))
+    else:
+        asyncio.run(supervise(groups))
+
+
+if __name__ == "__main__":
+    cli()
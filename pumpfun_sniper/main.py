@@ -1,67 +1,219 @@
 """App entry-point. Spins up DB, Helius watcher, candidate evaluator,
-position monitor and the FastAPI dashboard."""
+position monitor and the FastAPI dashboard, or any subset of those roles.
 
-import os
-import sys
+Start-up is ordered for time to first event: the discovery subscription goes
+live first and buffers frames, the heavy modules (SQLAlchemy, FastAPI,
+solders, …) are imported in worker threads meanwhile, and DB, RPC and HTTP
+connections are warmed concurrently before the frames are handed over."""
+
+import asyncio
+import importlib
 import signal
 import threading
-import asyncio
-import uvicorn
+from typing import TYPE_CHECKING, Iterable
 
-from pumpfun_sniper.db import init, async_session, Candidate
-from pumpfun_sniper.helius_watcher import helius_loop
-from pumpfun_sniper.strategy import process_candidate
-from pumpfun_sniper.executor import monitor_loop
-from pumpfun_sniper.dashboard import app
 from pumpfun_sniper.config import settings
+from pumpfun_sniper.debug import dbg
+from pumpfun_sniper.launcher import ROLES
+
+if TYPE_CHECKING:
+    from pumpfun_sniper.evaluator import Evaluator
+
+# ─── lazy imports ───────────────────────────────────────────────────────
+_HOT = ["pumpfun_sniper.db", "pumpfun_sniper.clients"]  # needed by every role
+_WATCH = ["pumpfun_sniper.seen_index", "pumpfun_sniper.helius_watcher"]
+_MODULES = {
+    "watcher": ["pumpfun_sniper.retention"],
+    "evaluator": ["pumpfun_sniper.strategy", "pumpfun_sniper.evaluator"],
+    "executor": [
+        "pumpfun_sniper.executor",
+        "pumpfun_sniper.analytics",
+        "pumpfun_sniper.helius_watcher",  # trade stream without a watcher
+    ],
+    "dashboard": ["uvicorn", "pumpfun_sniper.dashboard"],
+}
+_COMMON = [
+    "pumpfun_sniper.birdeye",
+    "pumpfun_sniper.rugcheck",
+    "pumpfun_sniper.bus",
+    "pumpfun_sniper.netstats",
+    "pumpfun_sniper.wallets",
+    "pumpfun_sniper.broadcast",
+    "pumpfun_sniper.recorder",
+]
+
+
+def _import(names: Iterable[str]) -> None:
+    for name in names:
+        importlib.import_module(name)
+
 
+async def _eval_loop(engine: "Evaluator"):
+    """Replay NEW candidates from the DB at start-up, then sweep for any the
+    bus missed (in-flight ones are skipped)."""
+    from pumpfun_sniper.strategy import submit_new
 
-async def _eval_loop():
     while True:
-        async with async_session() as s:
-            cands = (
-                await s.scalars(
-                    Candidate.__table__.select().where(Candidate.status == "NEW")
-                )
-            ).all()
-            for c in cands:
-                await process_candidate(c)
-        await asyncio.sleep(5)
-
-
-async def main() -> None:
+        await submit_new(engine)
+        await asyncio.sleep(settings.EVAL_SWEEP_SEC)
+
+
+async def _book_loop():
+    """Adopt open positions the bus missed, like `_eval_loop` for NEW rows."""
+    from pumpfun_sniper.executor import reconcile
+
+    while True:
+        await asyncio.sleep(settings.POSITIONS_SWEEP_SEC)
+        try:
+            await reconcile()
+        except Exception as e:
+            dbg(f"POSITIONS sweep failed: {e}")
+
+
+async def main(roles: Iterable[str] = ROLES) -> None:
+    """Run `roles` in this process (all of them by default; see `launcher`
+    for running them as separate, supervised processes)."""
+    roles = set(roles)
+    if unknown := roles - set(ROLES):
+        raise ValueError(f"unknown roles: {', '.join(sorted(unknown))}")
     loop = asyncio.get_running_loop()
     stop = asyncio.Event()
 
     def _exit_handler() -> None:
-        """Exit cleanly on Ctrl-C."""
+        """Exit cleanly on Ctrl-C (or SIGTERM from the supervisor)."""
         print("Received SIGINT, exiting...", flush=True)
         stop.set()
 
     loop.add_signal_handler(signal.SIGINT, _exit_handler)
+    loop.add_signal_handler(signal.SIGTERM, _exit_handler)
+
+    print(f"[DEBUG] DEBUG={settings.DEBUG} roles={','.join(sorted(roles))}")
+
+    tasks = []
+    if "watcher" in roles:
+        from pumpfun_sniper.discovery import Discovery
+
+        discovery = Discovery()  # frames wait for the DB, see go_live
+        tasks.append(asyncio.create_task(discovery.run()))
+
+    # import off the event loop so the subscription keeps being serviced
+    await asyncio.to_thread(_import, _HOT + (_WATCH if "watcher" in roles else []))
+    later = _COMMON + [m for r in ROLES if r in roles for m in _MODULES[r]]
+    rest = asyncio.create_task(asyncio.to_thread(_import, later))
+
+    from pumpfun_sniper import clients, db
+
+    await db.init()
+
+    async def go_live() -> None:
+        from pumpfun_sniper.helius_watcher import handle_frame
+        from pumpfun_sniper.seen_index import index
+
+        index.subscribe()  # creators blocked by a remote evaluator
+        discovery.attach(handle_frame)  # checks the DB until the index is warm
+        await index.load()
+
+    async def warm_http() -> None:
+        from pumpfun_sniper import birdeye, rugcheck
+
+        # TCP+TLS (and HTTP/2) connections to every upstream
+        await clients.prewarm(
+            [
+                settings.RPC_HTTP,
+                birdeye.ENDPOINT,
+                rugcheck.ENDPOINT,
+                settings.JUPITER_QUOTE,
+                settings.JUPITER_SWAP,
+                settings.JITO_TIP_FLOOR_URL,
+            ]
+        )
+
+    async def load_book() -> None:
+        from pumpfun_sniper.positions import book
+
+        await book.load()
+
+    warm = [asyncio.create_task(db.prewarm())]
+    if "watcher" in roles:
+        warm.append(asyncio.create_task(go_live()))
+    await rest
+    prewarm = asyncio.create_task(warm_http())
+    if "executor" in roles:
+        warm.append(asyncio.create_task(load_book()))
+    await asyncio.gather(*warm)
+
+    from pumpfun_sniper.analytics import analytics
+    from pumpfun_sniper.bus import bus
+    from pumpfun_sniper.broadcast import broadcaster
+    from pumpfun_sniper.netstats import netstats
+    from pumpfun_sniper.recorder import recorder
+    from pumpfun_sniper.wallets import pool
+
+    jobs = [bus.listen()]
+    if "dashboard" in roles:
+        import uvicorn
+        from pumpfun_sniper.dashboard import app
+
+        app.state.roles = roles
+        # Run FastAPI dashboard in a daemon thread so process can exit immediately
+        thread = threading.Thread(
+            target=uvicorn.run,
+            kwargs={
+                "app": app,
+                "host": "0.0.0.0",
+                "port": 8000,
+                "log_level": "warning",
+            },
+            daemon=True,
+        )
+        thread.start()
+    if "watcher" in roles:
+        from pumpfun_sniper.retention import retention
 
-    print(f"[DEBUG] DEBUG={settings.DEBUG}")
+        if "dashboard" in roles:
+            app.state.discovery = discovery
+        jobs.append(retention.run())
+    if "evaluator" in roles:
+        from pumpfun_sniper.evaluator import Evaluator
+        from pumpfun_sniper.strategy import step_candidate, subscribe
 
-    await init()
+        engine = Evaluator(step_candidate)
+        if "dashboard" in roles:
+            app.state.evaluator = engine
+        subscribe(engine)
+        jobs += [engine.run(), _eval_loop(engine)]
+    if "executor" in roles:
+        from pumpfun_sniper import executor
+        from pumpfun_sniper.positions import book
 
-    # Run FastAPI dashboard in a daemon thread so process can exit immediately
-    thread = threading.Thread(
-        target=uvicorn.run,
-        kwargs={"app": app, "host": "0.0.0.0", "port": 8000, "log_level": "warning"},
-        daemon=True,
-    )
-    thread.start()
+        executor.subscribe()
+        jobs += [executor.monitor_loop(), book.run(), _book_loop()]
+        if "watcher" not in roles:  # own trade stream for held mints
+            from pumpfun_sniper.discovery import Discovery
+            from pumpfun_sniper.helius_watcher import handle_trades
 
-    tasks = [
-        asyncio.create_task(helius_loop()),
-        asyncio.create_task(_eval_loop()),
-        asyncio.create_task(monitor_loop()),
-    ]
+            jobs.append(Discovery(handle_trades).run())
+    if "executor" in roles:
+        jobs.append(analytics.run())  # closes trades, so it checkpoints
+    elif "dashboard" in roles:
+        jobs.append(analytics.run(checkpoint=False))
+    if roles & {"evaluator", "executor"}:
+        jobs.append(netstats.run())  # tips for swaps
+        if not settings.SIMULATION:
+            jobs.append(pool.run())  # wallet balances
+    tasks += [asyncio.create_task(j) for j in jobs]
 
     await stop.wait()
-    for t in tasks:
+    for t in tasks + [prewarm]:
         t.cancel()
-    await asyncio.gather(*tasks, return_exceptions=True)
+    await asyncio.gather(*tasks, prewarm, return_exceptions=True)
+    if "executor" in roles:
+        await book.flush()
+        await analytics.checkpoint()
+    await broadcaster.close()
+    await clients.aclose_all()
+    await db.log_sink.close()
+    recorder.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,275 @@
+"""
+In‑process latency spans, histograms and counters, rendered in the
+Prometheus text format at `/metrics`.
+
+Operations on the buy / exit path are timed with `timer(stage)` into
+`sniper_stage_seconds{stage,side}`; the mint and side come from the
+surrounding `trade(mint, side)` context (a ContextVar, so tasks spawned
+inside inherit it). `mark(mint, event)` stamps lifecycle events (websocket
+receipt, grace expiry, bought, exit, closed) on a per‑mint timeline and
+observes the time since the mint was first seen. Everything is plain
+dict / list arithmetic on the event loop; nothing blocks or allocates per
+sample beyond a label tuple.
+"""
+
+import bisect, contextvars, math, time
+from collections import OrderedDict
+
+from pumpfun_sniper import clock
+from pumpfun_sniper.config import settings
+
+PREFIX = "sniper_"
+BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0,
+)  # fmt: skip
+HELP = {
+    "frames_total": "Websocket frames received",
+    "candidates_total": "Candidates inserted",
+    "stage_seconds": "Duration of a pipeline stage",
+    "stage_errors_total": "Pipeline stages that raised",
+    "since_seen_seconds": "Time from websocket receipt of a mint to a lifecycle event",
+    "events_total": "Mint lifecycle events",
+    "http_request_seconds": "Upstream HTTP latency",
+    "http_requests_total": "Upstream HTTP responses by status code",
+    "http_errors_total": "Upstream HTTP transport errors and 5xx responses",
+    "http_throttled_total": "Upstream HTTP 429 responses",
+    "monitor_tick_seconds": "Position monitor tick duration",
+    "open_positions": "Positions held by the monitor",
+    "evaluator_in_flight": "Candidates being evaluated",
+    "evaluator_ready": "Evaluation steps due and waiting for a worker",
+    "rugcheck_queued": "RugCheck requests waiting in the scheduler",
+    "rugcheck_in_flight": "RugCheck requests in flight",
+    "http_in_flight": "Upstream HTTP requests in flight",
+}
+
+_side: contextvars.ContextVar[tuple[str, str] | None] = contextvars.ContextVar(
+    "metrics_trade", default=None
+)
+
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: tuple[float, ...] = BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last bucket is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, v: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, v)] += 1
+        self.sum += v
+        self.count += 1
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the q‑th observation; None when
+        empty or past the last finite bucket."""
+        rank, seen = q * self.count, 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= rank:
+                return self.bounds[i] if i < len(self.bounds) else None
+        return None
+
+
+class Registry:
+    def __init__(self):
+        self.counters: dict[str, dict[tuple, float]] = {}
+        self.gauges: dict[str, dict[tuple, float]] = {}
+        self.histograms: dict[str, dict[tuple, Histogram]] = {}
+
+    def inc(self, name: str, labels: tuple = (), n: float = 1.0) -> None:
+        series = self.counters.setdefault(name, {})
+        series[labels] = series.get(labels, 0.0) + n
+
+    def set(self, name: str, value: float, labels: tuple = ()) -> None:
+        self.gauges.setdefault(name, {})[labels] = value
+
+    def observe(self, name: str, value: float, labels: tuple = ()) -> None:
+        series = self.histograms.setdefault(name, {})
+        h = series.get(labels)
+        if h is None:
+            h = series[labels] = Histogram()
+        h.observe(value)
+
+    def clear(self) -> None:
+        self.counters.clear()
+        self.gauges.clear()
+        self.histograms.clear()
+
+    def render(self) -> str:
+        out: list[str] = []
+
+        def head(name: str, kind: str) -> str:
+            full = PREFIX + name
+            if name in HELP:
+                out.append(f"# HELP {full} {HELP[name]}")
+            out.append(f"# TYPE {full} {kind}")
+            return full
+
+        for kind, store in (("counter", self.counters), ("gauge", self.gauges)):
+            for name, series in sorted(store.items()):
+                full = head(name, kind)
+                for labels, v in list(series.items()):
+                    out.append(f"{full}{_labels(labels)} {_num(v)}")
+        for name, series in sorted(self.histograms.items()):
+            full = head(name, "histogram")
+            for labels, h in list(series.items()):
+                cum = 0
+                for bound, n in zip(h.bounds + (math.inf,), list(h.counts)):
+                    cum += n
+                    le = labels + (("le", _num(bound)),)
+                    out.append(f"{full}_bucket{_labels(le)} {cum}")
+                out.append(f"{full}_sum{_labels(labels)} {_num(h.sum)}")
+                out.append(f"{full}_count{_labels(labels)} {h.count}")
+        return "\n".join(out) + "\n"
+
+
+def _num(v: float) -> str:
+    if v == math.inf:
+        return "+Inf"
+    return repr(float(v)) if not float(v).is_integer() else str(int(v))
+
+
+def _esc(v) -> str:
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_esc(v)}"' for k, v in labels) + "}"
+
+
+# ─── per‑mint timelines ─────────────────────────────────────────────────
+class Span:
+    __slots__ = ("t0", "events")
+
+    def __init__(self, t0: float):
+        self.t0 = t0
+        self.events: list[tuple[str, float, float | None]] = []  # stage, at, dur
+
+    def as_dict(self) -> dict:
+        return {
+            "events": [
+                {"stage": s, "at_sec": round(at, 6), "dur_sec": d}
+                for s, at, d in self.events
+            ]
+        }
+
+
+registry = Registry()
+_spans: OrderedDict[str, Span] = OrderedDict()
+
+
+def _span(mint: str, t0: float | None = None) -> Span:
+    sp = _spans.get(mint)
+    if sp is None:
+        sp = _spans[mint] = Span(clock.monotonic() if t0 is None else t0)
+        while len(_spans) > settings.METRICS_SPAN_MINTS:
+            _spans.popitem(last=False)
+    return sp
+
+
+def spans(mint: str) -> dict | None:
+    sp = _spans.get(mint)
+    return sp.as_dict() if sp is not None else None
+
+
+# ─── instrumentation API ────────────────────────────────────────────────
+def inc(name: str, n: float = 1.0, **labels) -> None:
+    if settings.METRICS_ENABLED:
+        registry.inc(name, tuple(labels.items()), n)
+
+
+def gauge(name: str, value: float, **labels) -> None:
+    registry.set(name, value, tuple(labels.items()))
+
+
+def observe(name: str, value: float, **labels) -> None:
+    if settings.METRICS_ENABLED:
+        registry.observe(name, value, tuple(labels.items()))
+
+
+def seen(mint: str, at: float | None = None) -> None:
+    """Start `mint`'s timeline at websocket receipt (`clock.monotonic()`)."""
+    if settings.METRICS_ENABLED:
+        sp = _span(mint, at)
+        sp.events.append(("ws_recv", 0.0, None))
+
+
+def mark(mint: str, event: str) -> None:
+    """Stamp a lifecycle event and observe the time since the mint was seen."""
+    if not settings.METRICS_ENABLED:
+        return
+    sp = _span(mint)
+    at = clock.monotonic() - sp.t0
+    sp.events.append((event, at, None))
+    registry.inc("events_total", (("event", event),))
+    registry.observe("since_seen_seconds", at, (("event", event),))
+
+
+class trade:
+    """`with trade(mint, side):` attributes timers inside to that mint / side."""
+
+    __slots__ = ("value", "_token")
+
+    def __init__(self, mint: str, side: str):
+        self.value = (mint, side)
+
+    def __enter__(self):
+        self._token = _side.set(self.value)
+        return self
+
+    def __exit__(self, *exc):
+        _side.reset(self._token)
+
+
+class timer:
+    """`with timer(stage):` observes the block's wall time; a raising block
+    counts as a stage error instead."""
+
+    __slots__ = ("stage", "mint", "t0")
+
+    def __init__(self, stage: str, mint: str | None = None):
+        self.stage = stage
+        self.mint = mint
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not settings.METRICS_ENABLED:
+            return
+        dur = time.perf_counter() - self.t0
+        bound = _side.get()
+        side = bound[1] if bound else ""
+        labels = (("stage", self.stage), ("side", side))
+        if exc_type is not None:
+            registry.inc("stage_errors_total", labels)
+            return
+        registry.observe("stage_seconds", dur, labels)
+        mint = self.mint or (bound[0] if bound else None)
+        if mint is not None:
+            sp = _span(mint)
+            sp.events.append((self.stage, clock.monotonic() - sp.t0, round(dur, 6)))
+
+
+def summary() -> dict:
+    """p50 / p95 / count per stage and lifecycle event, for debugging."""
+    out = {}
+    for name in ("stage_seconds", "since_seen_seconds"):
+        for labels, h in registry.histograms.get(name, {}).items():
+            key = "/".join(str(v) for _k, v in labels if v)
+            out[f"{name}:{key}"] = {
+                "count": h.count,
+                "p50": h.quantile(0.5),
+                "p95": h.quantile(0.95),
+            }
+    return out
+
+
+def render() -> str:
+    return registry.render()
@@ -0,0 +1,155 @@
+"""
+Background network‑condition sampler: Jito tips, priority fees, blockhash.
+
+`netstats.run()` samples the Jito tip floor, `getRecentPrioritizationFees`
+for the pump.fun program and the latest blockhash every `NET_SAMPLE_SEC`
+into rolling windows. `tip(urgency)` is a plain lookup against those
+windows, so swaps never wait on a network call: entries bid the
+`TIP_ENTRY_PCTL` landed tip, stop‑loss exits `TIP_EXIT_PCTL`.
+"""
+
+import asyncio, bisect, time
+from collections import deque
+
+from pumpfun_sniper import clients
+from pumpfun_sniper.broadcast import broadcaster
+from pumpfun_sniper.config import settings
+from pumpfun_sniper.debug import dbg
+
+URGENCIES = ("entry", "exit")
+_TIP_PCTLS = (25, 50, 75, 95, 99)  # percentiles reported by the tip floor API
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Linear‑interpolated percentile of an unsorted sample."""
+    xs = sorted(values)
+    k = (len(xs) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(xs) - 1)
+    return xs[lo] + (xs[hi] - xs[lo]) * (k - lo)
+
+
+def _interp(points: dict[int, float], pct: float) -> float:
+    """Value at `pct` from a {percentile: value} curve."""
+    keys = sorted(points)
+    i = bisect.bisect_left(keys, pct)
+    if i == 0:
+        return points[keys[0]]
+    if i == len(keys):
+        return points[keys[-1]]
+    lo, hi = keys[i - 1], keys[i]
+    return points[lo] + (points[hi] - points[lo]) * (pct - lo) / (hi - lo)
+
+
+class NetStats:
+    def __init__(self):
+        self._tips: deque[dict[int, float]] = deque(maxlen=settings.NET_WINDOW)
+        self._fees: deque[int] = deque(maxlen=settings.NET_WINDOW * 150)
+        self._fee_slot = -1  # newest slot already in `_fees`
+        self.blockhash: str | None = None
+        self.last_valid_block_height: int | None = None
+        self.sampled_at = 0.0
+        self.errors = 0
+
+    # ─── sampling ──────────────────────────────────────────────────────
+    async def _rpc(self, method: str, params: list):
+        payload = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
+        r = await clients.post(settings.RPC_HTTP, json=payload)
+        r.raise_for_status()
+        return r.json()["result"]
+
+    async def sample_tips(self) -> None:
+        r = await clients.get(settings.JITO_TIP_FLOOR_URL)
+        r.raise_for_status()
+        row = r.json()[0]
+        self._tips.append(
+            {
+                p: row[f"landed_tips_{p}th_percentile"] * 1e9  # SOL → lamports
+                for p in _TIP_PCTLS
+                if f"landed_tips_{p}th_percentile" in row
+            }
+        )
+
+    async def sample_fees(self) -> None:
+        res = await self._rpc(
+            "getRecentPrioritizationFees", [[settings.PUMP_BONDING_PROGRAM]]
+        )
+        # the RPC returns the same ~150 recent slots on every poll: add only
+        # the ones not seen yet, so each slot's fee counts once
+        fresh = sorted(
+            (x for x in res if x["slot"] > self._fee_slot), key=lambda x: x["slot"]
+        )
+        self._fees.extend(x["prioritizationFee"] for x in fresh)
+        if fresh:
+            self._fee_slot = fresh[-1]["slot"]
+
+    async def sample_blockhash(self) -> None:
+        res = await self._rpc("getLatestBlockhash", [{"commitment": "confirmed"}])
+        self.blockhash = res["value"]["blockhash"]
+        self.last_valid_block_height = res["value"]["lastValidBlockHeight"]
+        height = await self._rpc("getBlockHeight", [{"commitment": "confirmed"}])
+        # keeps the broadcaster's expiry checks current between its own polls
+        broadcaster.observe_height(height)
+
+    async def sample(self) -> None:
+        res = await asyncio.gather(
+            self.sample_tips(),
+            self.sample_fees(),
+            self.sample_blockhash(),
+            return_exceptions=True,
+        )
+        for e in res:
+            if isinstance(e, Exception):
+                self.errors += 1
+                dbg(f"NETSTATS sample failed: {e}")
+        self.sampled_at = time.monotonic()
+
+    async def run(self) -> None:
+        while True:
+            await self.sample()
+            await asyncio.sleep(settings.NET_SAMPLE_SEC)
+
+    # ─── recommendations ───────────────────────────────────────────────
+    def _pctl(self, urgency: str) -> float:
+        if urgency not in URGENCIES:
+            raise ValueError(f"unknown urgency {urgency!r}")
+        return settings.TIP_EXIT_PCTL if urgency == "exit" else settings.TIP_ENTRY_PCTL
+
+    def priority_fee(self, urgency: str = "entry") -> int | None:
+        """Recent prioritization fee (micro‑lamports / CU) at the urgency's
+        percentile, or None before the first sample."""
+        if not self._fees:
+            return None
+        return int(percentile(list(self._fees), self._pctl(urgency)))
+
+    def tip(self, urgency: str = "entry") -> int:
+        """Jito tip in lamports for a swap of the given urgency."""
+        pct = self._pctl(urgency)
+        if self._tips:
+            vals = [_interp(t, pct) for t in self._tips if t]
+            lamports = sum(vals) / len(vals) if vals else settings.JITO_TIP_LAMPORTS
+        elif self._fees:  # tip floor unreachable: price the CU budget instead
+            lamports = self.priority_fee(urgency) * settings.NET_CU_ESTIMATE / 1e6
+        else:
+            lamports = settings.JITO_TIP_LAMPORTS
+        return int(
+            min(max(lamports, settings.TIP_MIN_LAMPORTS), settings.TIP_MAX_LAMPORTS)
+        )
+
+    def stats(self) -> dict:
+        return {
+            "tip_entry": self.tip("entry"),
+            "tip_exit": self.tip("exit"),
+            "priority_fee_entry": self.priority_fee("entry"),
+            "priority_fee_exit": self.priority_fee("exit"),
+            "tip_samples": len(self._tips),
+            "fee_samples": len(self._fees),
+            "blockhash": self.blockhash,
+            "age_sec": (
+                time.monotonic() - self.sampled_at if self.sampled_at else None
+            ),
+            "errors": self.errors,
+        }
+
+
+netstats = NetStats()
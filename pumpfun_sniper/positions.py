@@ -0,0 +1,292 @@
+"""
+Authoritative in‑memory book of open positions.
+
+Positions live in parallel NumPy columns (qty, avg price, cost, stop,
+take‑profit, last price, unrealized PnL) indexed by a mint → slot map, so a
+monitor tick trails every stop and finds every exit in one vectorised pass
+instead of reloading `open_positions`. The book is loaded from the DB at
+start‑up; opens (`insert`) and closes are written through (they follow a
+real trade) and a new position reaches the executor's book as a `position`
+bus message, so the two may run in different processes. Stop / PnL moves
+are marked dirty and written behind in one bulk UPDATE every
+`POSITIONS_FLUSH_SEC`.
+"""
+
+import asyncio, datetime as dt
+from dataclasses import dataclass
+
+import numpy as np
+
+from pumpfun_sniper import clock
+from pumpfun_sniper.config import settings
+from pumpfun_sniper.debug import dbg
+
+_FLOATS = ("qty", "avg_price", "cost", "stop", "tp", "last", "upnl")
+
+
+@dataclass(slots=True)
+class Position:
+    """Snapshot of one book row, handed to exits and closes."""
+
+    mint: str
+    qty: float
+    avg_price: float
+    cost: float
+    stop_price: float
+    take_profit: float
+    opened_at: dt.datetime
+    unrealized_pnl: float = 0.0
+    wallet: str | None = None  # pubkey that bought it (None: primary wallet)
+
+    @classmethod
+    def from_row(cls, r) -> "Position":
+        """From an `OpenPos` row."""
+        return cls(
+            r.mint,
+            r.qty,
+            r.avg_price,
+            r.cost,
+            r.stop_price,
+            r.take_profit,
+            r.opened_at,
+            r.unrealized_pnl or 0.0,
+            r.wallet,
+        )
+
+
+class PositionBook:
+    def __init__(self, capacity: int = 64):
+        self.n = 0
+        self.slot: dict[str, int] = {}
+        self.mints: list[str] = []
+        self.opened_at: list[dt.datetime] = []
+        self.wallets: list[str | None] = []
+        for name in _FLOATS:
+            setattr(self, name, np.empty(capacity))
+        self.dirty = np.zeros(capacity, dtype=bool)
+        self.exiting = np.zeros(capacity, dtype=bool)
+        self.flushes = 0
+        self.flushed_rows = 0
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __contains__(self, mint: str) -> bool:
+        return mint in self.slot
+
+    # ─── rows ──────────────────────────────────────────────────────────
+    def _grow(self) -> None:
+        cap = max(len(self.qty) * 2, 64)
+        for name in _FLOATS + ("dirty", "exiting"):
+            old = getattr(self, name)
+            new = np.zeros(cap, dtype=old.dtype)
+            new[: self.n] = old[: self.n]
+            setattr(self, name, new)
+
+    def add(self, p: Position) -> None:
+        if p.mint in self.slot:
+            raise KeyError(f"{p.mint} already in the book")
+        if self.n == len(self.qty):
+            self._grow()
+        i = self.n
+        self.qty[i], self.avg_price[i], self.cost[i] = p.qty, p.avg_price, p.cost
+        self.stop[i], self.tp[i] = p.stop_price, p.take_profit
+        self.last[i], self.upnl[i] = np.nan, p.unrealized_pnl
+        self.dirty[i] = self.exiting[i] = False
+        self.mints.append(p.mint)
+        self.opened_at.append(p.opened_at)
+        self.wallets.append(p.wallet)
+        self.slot[p.mint] = i
+        self.n += 1
+
+    def get(self, mint: str) -> Position | None:
+        i = self.slot.get(mint)
+        if i is None:
+            return None
+        return Position(
+            mint,
+            float(self.qty[i]),
+            float(self.avg_price[i]),
+            float(self.cost[i]),
+            float(self.stop[i]),
+            float(self.tp[i]),
+            self.opened_at[i],
+            float(self.upnl[i]),
+            self.wallets[i],
+        )
+
+    def remove(self, mint: str) -> Position | None:
+        """Drop a row; the last row moves into its slot."""
+        p = self.get(mint)
+        if p is None:
+            return None
+        i, last = self.slot.pop(mint), self.n - 1
+        if i != last:
+            for name in _FLOATS + ("dirty", "exiting"):
+                col = getattr(self, name)
+                col[i] = col[last]
+            self.mints[i] = self.mints[last]
+            self.opened_at[i] = self.opened_at[last]
+            self.wallets[i] = self.wallets[last]
+            self.slot[self.mints[i]] = i
+        self.mints.pop()
+        self.opened_at.pop()
+        self.wallets.pop()
+        self.n -= 1
+        return p
+
+    def clear(self) -> None:
+        for mint in list(self.slot):
+            self.remove(mint)
+
+    def set_exiting(self, mint: str, flag: bool) -> None:
+        i = self.slot.get(mint)
+        if i is not None:
+            self.exiting[i] = flag
+
+    def live(self) -> list[str]:
+        """Mints not currently being exited."""
+        return [m for m, x in zip(self.mints, self.exiting[: self.n]) if not x]
+
+    # ─── evaluation ────────────────────────────────────────────────────
+    def set_prices(self, px: dict[str, float]) -> None:
+        slots = [(self.slot[m], v) for m, v in px.items() if m in self.slot and v]
+        if slots:
+            idx, vals = zip(*slots)
+            self.last[list(idx)] = vals
+
+    def evaluate(self, trail_pct: float) -> list[tuple[str, float]]:
+        """Trail every stop to the last price and return the (mint, price) of
+        positions at their stop or take‑profit, in one pass."""
+        n = self.n
+        last, stop = self.last[:n], self.stop[:n]
+        ok = (last > 0) & ~self.exiting[:n]  # NaN compares False
+        new_stop = np.where(ok, np.maximum(stop, last * (1 - trail_pct / 100)), stop)
+        moved = new_stop != stop
+        if moved.any():
+            stop[moved] = new_stop[moved]
+            self.upnl[:n][moved] = (last[moved] - self.avg_price[:n][moved]) * (
+                self.qty[:n][moved]
+            )
+            self.dirty[:n] |= moved
+        hit = ok & ((last <= stop) | (last >= self.tp[:n]))
+        return [(self.mints[i], float(last[i])) for i in np.flatnonzero(hit)]
+
+    def on_price(self, mint: str, price: float, trail_pct: float) -> bool:
+        """Scalar version of `evaluate` for one streamed trade; True when the
+        position should exit."""
+        i = self.slot.get(mint)
+        if i is None or self.exiting[i] or not price > 0:
+            return False
+        self.last[i] = price
+        new_stop = max(self.stop[i], price * (1 - trail_pct / 100))
+        if new_stop != self.stop[i]:
+            self.stop[i] = new_stop
+            self.upnl[i] = (price - self.avg_price[i]) * self.qty[i]
+            self.dirty[i] = True
+        return price <= self.stop[i] or price >= self.tp[i]
+
+    # ─── persistence ───────────────────────────────────────────────────
+    async def load(self) -> int:
+        """Replace the book with `open_positions`."""
+        from sqlalchemy import select
+        from pumpfun_sniper.db import session_ctx, OpenPos
+
+        async with session_ctx() as s:
+            rows = (await s.scalars(select(OpenPos))).all()
+        self.clear()
+        for r in rows:
+            self.add(Position.from_row(r))
+        dbg(f"POSITIONS loaded {self.n}")
+        return self.n
+
+    def take_dirty(self) -> list[dict]:
+        n = self.n
+        idx = np.flatnonzero(self.dirty[:n])
+        self.dirty[:n] = False
+        now = clock.utcnow()
+        return [
+            {
+                "mint": self.mints[i],
+                "stop_price": float(self.stop[i]),
+                "unrealized_pnl": float(self.upnl[i]),
+                "updated_at": now,
+            }
+            for i in idx
+        ]
+
+    async def flush(self) -> int:
+        """Write dirty stop / PnL moves in one bulk UPDATE."""
+        rows = self.take_dirty()
+        if not rows:
+            return 0
+        from sqlalchemy import update
+        from pumpfun_sniper.db import session_ctx, OpenPos
+
+        try:
+            async with session_ctx() as s:
+                await s.execute(update(OpenPos), rows)
+                await s.commit()
+        except Exception:
+            for r in rows:  # retry with the next flush
+                i = self.slot.get(r["mint"])
+                if i is not None:
+                    self.dirty[i] = True
+            raise
+        self.flushes += 1
+        self.flushed_rows += len(rows)
+        return len(rows)
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.POSITIONS_FLUSH_SEC)
+            try:
+                await self.flush()
+            except Exception as e:
+                dbg(f"POSITIONS flush failed: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "positions": self.n,
+            "exiting": int(self.exiting[: self.n].sum()),
+            "dirty": int(self.dirty[: self.n].sum()),
+            "capacity": len(self.qty),
+            "flushes": self.flushes,
+            "flushed_rows": self.flushed_rows,
+        }
+
+
+async def insert(p: Position) -> None:
+    """Persist a new position. The executor adds it to its book when the
+    `position` bus message arrives (in this process or another role's), or
+    at its next `executor.reconcile` if the message was lost."""
+    from pumpfun_sniper.bus import bus
+    from pumpfun_sniper.db import session_ctx, OpenPos
+
+    async with session_ctx() as s:
+        s.add(
+            OpenPos(
+                mint=p.mint,
+                qty=p.qty,
+                avg_price=p.avg_price,
+                cost=p.cost,
+                stop_price=p.stop_price,
+                take_profit=p.take_profit,
+                opened_at=p.opened_at,
+                wallet=p.wallet,
+            )
+        )
+        await bus.journal(s, "position", p.mint)
+        await s.commit()
+
+
+async def load(mint: str) -> Position | None:
+    """Open position for a remote `position` message, if still open."""
+    from pumpfun_sniper.db import session_ctx, OpenPos
+
+    async with session_ctx() as s:
+        r = await s.get(OpenPos, mint)
+    return None if r is None else Position.from_row(r)
+
+
+book = PositionBook()
@@ -0,0 +1,135 @@
+"""
+Streaming prices from pump.fun trade events.
+
+The Helius watcher hands every program‑log frame to `prices.on_logs`; trade
+events of held mints are decoded into a last price (from the post‑trade
+virtual reserves, in lamports per token base unit like `jupiter.buy`'s entry
+price) and a running VWAP. Listeners are called on every update so exits can
+react per trade instead of per monitor tick. Candidates whose quote is being
+prefetched are `watch`ed: their price is kept (for the quote drift guard)
+but listeners are not called. When no frame has arrived for
+`PRICE_STALE_SEC` the stream counts as stalled and callers fall back to
+Birdeye.
+"""
+
+import base64, struct
+from typing import Callable
+
+from solders.pubkey import Pubkey
+
+from pumpfun_sniper import clock
+from pumpfun_sniper.config import settings
+from pumpfun_sniper.debug import dbg
+
+TRADE_DISCRIMINATOR = bytes([189, 219, 127, 211, 78, 230, 97, 238])  # event:TradeEvent
+# discriminator, mint, sol_amount, token_amount, is_buy, user, timestamp,
+# virtual_sol_reserves, virtual_token_reserves (newer versions append more)
+_TRADE = struct.Struct("<8s32sQQ?32sqQQ")
+_PREFIX = "Program data: "
+
+Listener = Callable[[str, float], None]
+
+
+class PriceEngine:
+    def __init__(self):
+        self._held: dict[bytes, str] = {}  # raw mint -> base58 mint
+        self._watched: dict[bytes, str] = {}  # candidates, price only
+        self._last: dict[str, tuple[float, float]] = {}  # mint -> (price, ts)
+        self._vwap: dict[str, list[int]] = {}  # mint -> [lamports, tokens]
+        self._listeners: list[Listener] = []
+        self.last_frame = 0.0
+        self.trades = 0
+
+    # ─── subscriptions ─────────────────────────────────────────────────
+    def track(self, mint: str) -> None:
+        self._held.setdefault(bytes(Pubkey.from_string(mint)), mint)
+
+    def untrack(self, mint: str) -> None:
+        raw = bytes(Pubkey.from_string(mint))
+        self._held.pop(raw, None)
+        if raw not in self._watched:
+            self._forget(mint)
+
+    def watch(self, mint: str) -> None:
+        self._watched.setdefault(bytes(Pubkey.from_string(mint)), mint)
+
+    def unwatch(self, mint: str) -> None:
+        raw = bytes(Pubkey.from_string(mint))
+        self._watched.pop(raw, None)
+        if raw not in self._held:
+            self._forget(mint)
+
+    def _forget(self, mint: str) -> None:
+        self._last.pop(mint, None)
+        self._vwap.pop(mint, None)
+
+    def listen(self, fn: Listener) -> None:
+        self._listeners.append(fn)
+
+    def unlisten(self, fn: Listener) -> None:
+        if fn in self._listeners:
+            self._listeners.remove(fn)
+
+    # ─── feed ──────────────────────────────────────────────────────────
+    @property
+    def tracking(self) -> bool:
+        return bool(self._held or self._watched)
+
+    def touch(self) -> None:
+        """Record stream liveness for frames that are not decoded."""
+        self.last_frame = clock.monotonic()
+
+    def on_logs(self, logs: list[str]) -> None:
+        """Consume one program‑log frame."""
+        self.last_frame = clock.monotonic()
+        if not self.tracking:
+            return
+        for line in logs:
+            if not line.startswith(_PREFIX):
+                continue
+            try:
+                data = base64.b64decode(line[len(_PREFIX) :])
+            except ValueError:
+                continue
+            if data[:8] == TRADE_DISCRIMINATOR and len(data) >= _TRADE.size:
+                self._on_trade(data)
+
+    def _on_trade(self, data: bytes) -> None:
+        _, raw_mint, sol, tokens, _buy, _user, _ts, v_sol, v_tok = _TRADE.unpack_from(
+            data
+        )
+        held = self._held.get(raw_mint)
+        mint = held or self._watched.get(raw_mint)
+        if mint is None or not v_tok:
+            return
+        price = v_sol / v_tok
+        self._last[mint] = (price, clock.monotonic())
+        acc = self._vwap.setdefault(mint, [0, 0])
+        acc[0] += sol
+        acc[1] += tokens
+        self.trades += 1
+        if held is None:
+            return
+        for fn in self._listeners:
+            try:
+                fn(mint, price)
+            except Exception as e:
+                dbg(f"PRICE listener failed for {mint}: {e}")
+
+    # ─── queries ───────────────────────────────────────────────────────
+    def stalled(self) -> bool:
+        return clock.monotonic() - self.last_frame > settings.PRICE_STALE_SEC
+
+    def price(self, mint: str) -> float | None:
+        """Last streamed price, or None when missing or the stream stalled."""
+        hit = self._last.get(mint)
+        if hit is None or self.stalled():
+            return None
+        return hit[0]
+
+    def vwap(self, mint: str) -> float | None:
+        acc = self._vwap.get(mint)
+        return acc[0] / acc[1] if acc and acc[1] else None
+
+
+prices = PriceEngine()
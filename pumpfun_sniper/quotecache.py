@@ -0,0 +1,143 @@
+"""
+Speculative Jupiter quote prefetch for candidates that are close to passing.
+
+While a candidate is still being vetted, `quotes.warm(mint)` keeps a
+SOL → mint quote for `BUY_SIZE_SOL` (and optionally the built swap
+transaction) refreshed in the background, so `jupiter.buy` can skip both
+round trips once RugCheck approves. The transaction is built for a wallet
+picked once per entry and handed out with it, so the buy signs with the
+wallet the prebuilt transaction pays from.
+
+A cached route is only handed out while it is younger than `QUOTE_TTL_SEC`
+and the price has not drifted more than `QUOTE_MAX_DRIFT_BPS`, between
+refreshes or against the trade stream (the mint is `prices.watch`ed while
+warm; a process without the watcher role has no stream and checks refresh
+drift only).
+"""
+
+import asyncio, time
+from dataclasses import dataclass
+
+from pumpfun_sniper import jupiter
+from pumpfun_sniper.broadcast import broadcaster
+from pumpfun_sniper.config import settings
+from pumpfun_sniper.debug import dbg
+from pumpfun_sniper.pricefeed import prices
+from pumpfun_sniper.wallets import Wallet, pool
+
+
+@dataclass(slots=True)
+class Prefetch:
+    lamports: int
+    started: float
+    route: dict | None = None
+    tx: tuple[bytes, int | None] | None = None  # (unsigned tx, lastValidBlockHeight)
+    wallet: Wallet | None = None  # payer of `tx`, picked on the first build
+    fetched: float = 0.0
+    drift_bps: float = 0.0  # price move between the last two refreshes
+    spot: float | None = None  # stream price when `route` was fetched
+    task: asyncio.Task | None = None
+
+
+def _bps(a: float, b: float) -> float:
+    return abs(a / b - 1) * 10_000 if b else float("inf")
+
+
+def route_price(route: dict, lamports: int) -> float:
+    """Lamports per token base unit, like `jupiter.buy`'s entry price."""
+    return lamports / float(route["outAmount"])
+
+
+class QuoteCache:
+    def __init__(self):
+        self._entries: dict[str, Prefetch] = {}
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.drifted = 0
+
+    # ─── lifecycle ─────────────────────────────────────────────────────
+    def warm(self, mint: str, sol_amount: float | None = None) -> None:
+        """Start refreshing quotes for `mint` unless already running."""
+        lamports = int((sol_amount or settings.BUY_SIZE_SOL) * 1e9)
+        entry = self._entries.get(mint)
+        if entry is not None and entry.lamports == lamports:
+            return
+        self.drop(mint)
+        entry = self._entries[mint] = Prefetch(lamports, time.monotonic())
+        prices.watch(mint)
+        entry.task = asyncio.get_running_loop().create_task(self._refresh(mint, entry))
+
+    def drop(self, mint: str) -> None:
+        entry = self._entries.pop(mint, None)
+        if entry is not None:
+            prices.unwatch(mint)
+            if entry.task is not None:
+                entry.task.cancel()
+
+    async def _refresh(self, mint: str, entry: Prefetch) -> None:
+        try:
+            while time.monotonic() - entry.started < settings.QUOTE_PREFETCH_MAX_SEC:
+                try:
+                    route = await jupiter._quote(jupiter._SOL, mint, entry.lamports)
+                    tx = None
+                    if settings.QUOTE_PREBUILD_TX and not settings.SIMULATION:
+                        if entry.wallet is None:
+                            entry.wallet = pool.pick(mint, entry.lamports / 1e9)
+                        tx = await jupiter._swap_tx(route, wallet=entry.wallet)
+                    if entry.route is not None:
+                        entry.drift_bps = _bps(
+                            route_price(route, entry.lamports),
+                            route_price(entry.route, entry.lamports),
+                        )
+                    entry.route, entry.tx, entry.fetched = route, tx, time.monotonic()
+                    entry.spot = prices.price(mint)
+                except Exception as e:
+                    dbg(f"QUOTE prefetch failed for {mint}: {e}")
+                await asyncio.sleep(settings.QUOTE_REFRESH_SEC)
+        finally:
+            if self._entries.get(mint) is entry:
+                del self._entries[mint]
+                prices.unwatch(mint)
+
+    # ─── lookups ───────────────────────────────────────────────────────
+    def take(
+        self, mint: str, sol_amount: float | None = None
+    ) -> tuple[dict, tuple[bytes, int | None] | None, Wallet | None] | None:
+        """Fresh `(route, prebuilt tx, its wallet)` for a buy (the last two
+        None when nothing was built), or None on a miss."""
+        lamports = int((sol_amount or settings.BUY_SIZE_SOL) * 1e9)
+        entry = self._entries.get(mint)
+        if entry is None or entry.route is None or entry.lamports != lamports:
+            self.misses += 1
+            return None
+        if time.monotonic() - entry.fetched > settings.QUOTE_TTL_SEC:
+            self.stale += 1
+            return None
+        # the route's price includes fees and impact: compare spot with spot
+        live = prices.price(mint)
+        drift = entry.drift_bps
+        if live is not None and entry.spot is not None:
+            drift = max(drift, _bps(live, entry.spot))
+        if drift > settings.QUOTE_MAX_DRIFT_BPS:
+            dbg(f"QUOTE drift {drift:.0f}bps for {mint}, requoting")
+            self.drifted += 1
+            return None
+        tx = entry.tx
+        height = broadcaster.block_height
+        if tx is not None and tx[1] is not None and height is not None:
+            tx = tx if height < tx[1] else None  # blockhash already expired
+        self.hits += 1
+        return entry.route, tx, entry.wallet
+
+    def stats(self) -> dict:
+        return {
+            "warming": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "drifted": self.drifted,
+        }
+
+
+quotes = QuoteCache()
@@ -0,0 +1,73 @@
+"""
+Append‑only market‑data recorder for replays (see `replay`).
+
+With `RECORD_PATH` set, Helius frames, RugCheck reports, Jupiter quotes and
+Birdeye price ticks are appended as `[epoch, kind, payload]` JSON lines to a
+gzip file. Each process run appends a new gzip member, so a recording grows
+across restarts and survives a crash up to the last flushed line.
+"""
+
+import gzip, json, time, zlib
+from typing import Any, Iterator
+
+from pumpfun_sniper.config import settings
+
+try:  # optional, see decoder
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj) + b"\n"
+
+except ImportError:
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode() + b"\n"
+
+
+KINDS = ("frame", "rug", "quote", "price")
+
+
+class Recorder:
+    def __init__(self, path: str | None = None):
+        self.path = path if path is not None else settings.RECORD_PATH
+        self._fh = None
+        self.events = 0
+
+    @property
+    def active(self) -> bool:
+        return bool(self.path)
+
+    def record(self, kind: str, payload: Any, ts: float | None = None) -> None:
+        if not self.path:
+            return
+        if self._fh is None:
+            self._fh = gzip.open(self.path, "ab", compresslevel=6)
+        self._fh.write(_dumps([time.time() if ts is None else ts, kind, payload]))
+        self.events += 1
+        if self.events % settings.RECORD_FLUSH_EVERY == 0:
+            self._fh.flush()
+
+    def frame(self, raw: str | bytes) -> None:
+        self.record("frame", raw.decode() if isinstance(raw, bytes) else raw)
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+def read(path: str) -> Iterator[tuple[float, str, Any]]:
+    """Recorded events in file order; a truncated tail (crash) is skipped."""
+    with gzip.open(path, "rb") as fh:
+        try:
+            for line in fh:
+                try:
+                    ts, kind, payload = json.loads(line)
+                except ValueError:
+                    return  # partial last line
+                yield ts, kind, payload
+        except (EOFError, gzip.BadGzipFile, zlib.error):
+            return
+
+
+recorder = Recorder()
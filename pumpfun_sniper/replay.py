@@ -0,0 +1,262 @@
+"""
+Accelerated, deterministic replay of a `recorder` file through the real
+watcher → strategy → executor pipeline.
+
+Frames are fed to `helius_watcher.handle_frame` in recorded order on a
+`clock.VirtualClock`. New candidates reach the evaluator over the `bus` as
+in production. Between frames the driver jumps straight to the next due
+event: an evaluator job (`Evaluator.run_due`), the `EVAL_SWEEP_SEC`
+NEW‑candidate sweep or the 3 s monitor tick. RugCheck, Jupiter quotes and
+Birdeye prices are answered from the recording as of the virtual time
+(never ahead of it); bonding progress is not recorded, so bonding exits do
+not fire. Trading runs with `SIMULATION` forced on against a scratch
+database.
+
+    python -m pumpfun_sniper.replay recording.jsonl.gz [--db DSN]
+"""
+
+import argparse, asyncio, bisect, hashlib, json, math, os, sys, tempfile, time
+from collections import Counter, defaultdict
+
+from pumpfun_sniper import clock
+from pumpfun_sniper.config import settings
+from pumpfun_sniper.positions import book
+from pumpfun_sniper.pricefeed import prices
+from pumpfun_sniper.recorder import read
+
+TICK_SEC = 3.0  # executor.monitor_loop interval
+_SOL = "So11111111111111111111111111111111111111112"
+
+
+class _Series:
+    """Time‑ordered values with as‑of lookup."""
+
+    def __init__(self):
+        self.ts: list[float] = []
+        self.values: list = []
+
+    def add(self, ts: float, value) -> None:
+        self.ts.append(ts)
+        self.values.append(value)
+
+    def asof(self, now: float):
+        i = bisect.bisect_right(self.ts, now) - 1
+        return self.values[i] if i >= 0 else None
+
+
+class Market:
+    """Recorded RugCheck reports, quotes and price ticks standing in for the
+    live clients during a replay. Price ticks are `birdeye.get_prices`
+    output, in lamports per token base unit like the trade stream, so
+    either can price a quote."""
+
+    def __init__(self):
+        self.reports: dict[str, _Series] = defaultdict(_Series)
+        self.quotes: dict[tuple[str, str], _Series] = defaultdict(_Series)
+        self.prices: dict[str, _Series] = defaultdict(_Series)
+
+    def add(self, ts: float, kind: str, payload) -> None:
+        if kind == "rug":
+            self.reports[payload["mint"]].add(ts, payload["report"])
+        elif kind == "quote":
+            self.quotes[(payload["in"], payload["out"])].add(ts, payload)
+        elif kind == "price":
+            for mint, px in payload.items():
+                self.prices[mint].add(ts, px)
+
+    # rugcheck.Scheduler interface
+    async def report(self, mint: str, priority: float = 0.0, max_age=None) -> dict:
+        # stream the candidate's trades from now on: quotes that were never
+        # recorded (the live bot did not buy) are priced off the curve
+        prices.track(mint)
+        return self.reports[mint].asof(clock.monotonic()) or {}
+
+    # jupiter._quote
+    async def quote(self, inp: str, out: str, amount: int) -> dict:
+        hit = self.quotes[(inp, out)].asof(clock.monotonic())
+        if hit is not None:
+            scaled = int(hit["route"]["outAmount"]) * amount / hit["amount"]
+            return {**hit["route"], "outAmount": max(int(scaled), 1)}
+        mint = out if inp == _SOL else inp
+        px = prices.price(mint) or self.prices[mint].asof(clock.monotonic())
+        if not px:
+            raise LookupError(f"no quote or price recorded for {mint}")
+        return {"outAmount": max(int(amount / px if inp == _SOL else amount * px), 1)}
+
+    # birdeye.get_prices
+    async def get_prices(self, mints: list[str]) -> dict[str, float]:
+        now = clock.monotonic()
+        out = {m: self.prices[m].asof(now) for m in mints}
+        return {m: px for m, px in out.items() if px is not None}
+
+    # bonding.bonding_pcts: curve state is not recorded
+    async def bonding_pcts(self, mints: list[str]) -> dict[str, float]:
+        return {}
+
+
+class _NoPrefetch:
+    """quotecache stand‑in: replays quote on demand, no background tasks."""
+
+    def warm(self, mint: str, sol_amount: float | None = None) -> None:
+        pass
+
+    def drop(self, mint: str) -> None:
+        pass
+
+    def take(self, mint: str, sol_amount: float | None = None):
+        return None
+
+
+async def _summary() -> dict:
+    from sqlalchemy import select
+    from pumpfun_sniper.db import session_ctx, Candidate, OpenPos, ClosedPos
+
+    async with session_ctx() as s:
+        cands = (await s.scalars(select(Candidate))).all()
+        opens = (await s.scalars(select(OpenPos))).all()
+        closed = (await s.scalars(select(ClosedPos))).all()
+    statuses = dict(sorted(Counter(c.status for c in cands).items()))
+    trades = sorted(
+        (c.mint, round(c.entry_price, 15), round(c.exit_price, 15), round(c.pnl, 12))
+        for c in closed
+    )
+    held = sorted((p.mint, round(p.stop_price, 15)) for p in opens)
+    blob = json.dumps([statuses, trades, held]).encode()
+    return {
+        "candidates": len(cands),
+        "statuses": statuses,
+        "open": len(opens),
+        "closed": len(closed),
+        "wins": sum(t[3] > 0 for t in trades),
+        "pnl": round(sum(t[3] for t in trades), 9),
+        "digest": hashlib.sha256(blob).hexdigest()[:16],
+    }
+
+
+async def _run(frames: list) -> tuple[dict, Counter, float]:
+    """Drive the pipeline through `frames` on a virtual clock."""
+    from pumpfun_sniper import db, executor, strategy
+    from pumpfun_sniper.evaluator import Evaluator
+    from pumpfun_sniper.helius_watcher import handle_frame
+
+    vc = clock.VirtualClock(frames[0][0])
+    clock.use(vc)
+    await db.init()
+    await book.load()
+    engine = Evaluator(strategy.step_candidate)
+    unsubscribe = strategy.subscribe(engine)
+    unadopt = executor.subscribe()
+    prices.listen(executor.on_price)
+    next_sweep = next_tick = vc.now
+    counts = Counter()
+
+    async def advance(to: float) -> None:
+        nonlocal next_sweep, next_tick
+        while True:
+            due = engine.next_due()
+            t = min(next_sweep, next_tick, math.inf if due is None else due)
+            if t > to:
+                break
+            vc.advance(t)
+            if t == next_sweep:
+                await strategy.submit_new(engine)
+                next_sweep += settings.EVAL_SWEEP_SEC
+            elif t == next_tick:
+                await executor.tick()
+                await executor.drain()
+                next_tick += TICK_SEC
+                counts["ticks"] += 1
+            else:
+                counts["steps"] += await engine.run_due()
+        vc.advance(to)
+
+    t0 = time.perf_counter()
+    try:
+        for ts, raw in frames:
+            await advance(ts)
+            await handle_frame(raw)
+            await executor.drain()
+        await advance(frames[-1][0])
+        wall = time.perf_counter() - t0
+        await book.flush()  # stop moves are written behind
+        summary = await _summary()
+    finally:
+        unsubscribe()
+        unadopt()
+        prices.unlisten(executor.on_price)
+        clock.use(clock.SystemClock())
+        await db.log_sink.close()
+    return summary, counts, wall
+
+
+async def replay(path: str) -> dict:
+    """Replay `path` against the configured (scratch) database; returns the
+    outcome summary and a throughput report."""
+    from pumpfun_sniper import executor, jupiter, strategy
+
+    market, frames = Market(), []
+    for ts, kind, payload in read(path):
+        if kind == "frame":
+            frames.append((ts, payload))
+        else:
+            market.add(ts, kind, payload)
+    if not frames:
+        raise ValueError(f"{path}: no frames recorded")
+
+    saved = (
+        settings.SIMULATION,
+        strategy.scheduler,
+        strategy.quotes,
+        jupiter._quote,
+        executor.get_prices,
+        executor.bonding_pcts,
+    )
+    settings.SIMULATION = True
+    strategy.scheduler = market
+    strategy.quotes = _NoPrefetch()
+    jupiter._quote = market.quote
+    executor.get_prices = market.get_prices
+    executor.bonding_pcts = market.bonding_pcts
+    try:
+        summary, counts, wall = await _run(frames)
+    finally:
+        (
+            settings.SIMULATION,
+            strategy.scheduler,
+            strategy.quotes,
+            jupiter._quote,
+            executor.get_prices,
+            executor.bonding_pcts,
+        ) = saved
+
+    span = frames[-1][0] - frames[0][0]
+    return {
+        **summary,
+        "throughput": {
+            "frames": len(frames),
+            "evaluator_steps": counts["steps"],
+            "monitor_ticks": counts["ticks"],
+            "virtual_sec": round(span, 3),
+            "wall_sec": round(wall, 3),
+            "frames_per_sec": round(len(frames) / wall, 1) if wall else None,
+            "speedup": round(span / wall, 1) if wall else None,
+        },
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("recording")
+    ap.add_argument("--db", help="scratch database DSN (default: temporary SQLite)")
+    args = ap.parse_args(argv)
+    if "pumpfun_sniper.db" in sys.modules:
+        raise RuntimeError("replay must configure the database before db is imported")
+    # never replay into the live database
+    settings.DB_DSN = args.db or "sqlite+aiosqlite:///" + os.path.join(
+        tempfile.mkdtemp(prefix="replay-"), "replay.db"
+    )
+    print(json.dumps(asyncio.run(replay(args.recording)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
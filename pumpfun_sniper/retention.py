@@ -0,0 +1,248 @@
+"""
+Background retention for the append‑only tables.
+
+Every `RETENTION_INTERVAL_SEC`, rows older than their policy's cutoff (old
+`logs`, `REJECTED` candidates and, optionally, `seen_names`) are copied to
+gzip JSONL files under `RETENTION_ARCHIVE_DIR` (one file per table and
+day, appended across runs) and deleted, `RETENTION_BATCH` rows per
+transaction so the live pipeline never waits on a long lock.
+
+With `DB_PARTITION_LOGS` on Postgres, daily `logs` partitions are created
+`PARTITION_DAYS_AHEAD` in advance; partitions entirely past the cutoff are
+archived and dropped whole instead of deleted row by row.
+
+    python -m pumpfun_sniper.retention   # one pass, prints the counts
+"""
+
+import asyncio, datetime as dt, gzip, json, os, time
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import delete, inspect, select, text
+
+from pumpfun_sniper import clock
+from pumpfun_sniper.config import settings
+from pumpfun_sniper.db import (
+    Candidate,
+    LogEntry,
+    SeenName,
+    create_log_partitions,
+    engine,
+    log,
+    partitioned,
+    session_ctx,
+)
+from pumpfun_sniper.debug import dbg
+
+
+@dataclass
+class Policy:
+    model: Any
+    ts_col: Any
+    days: float  # 0 keeps rows forever
+    where: Any = None
+
+
+def policies() -> list[Policy]:
+    return [
+        Policy(LogEntry, LogEntry.ts, settings.RETENTION_LOGS_DAYS),
+        Policy(
+            Candidate,
+            Candidate.created_at,
+            settings.RETENTION_REJECTED_DAYS,
+            Candidate.status == "REJECTED",
+        ),
+        Policy(SeenName, SeenName.first_seen, settings.RETENTION_SEEN_NAMES_DAYS),
+    ]
+
+
+def _jsonable(v):
+    return v.isoformat() if isinstance(v, dt.datetime) else v
+
+
+class Archive:
+    """Appends rows to `<dir>/<table>-<YYYYMMDD>.jsonl.gz` by row date.
+    Blocking: `Retention` calls `write` in a worker thread."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def write(self, table: str, ts_key: str, rows: list[dict]) -> None:
+        if not self.directory or not rows:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        by_day: dict[str, list[bytes]] = {}
+        for r in rows:
+            day = r[ts_key].strftime("%Y%m%d") if r[ts_key] else "undated"
+            line = json.dumps({k: _jsonable(v) for k, v in r.items()})
+            by_day.setdefault(day, []).append(line.encode() + b"\n")
+        for day, lines in by_day.items():
+            path = os.path.join(self.directory, f"{table}-{day}.jsonl.gz")
+            with gzip.open(path, "ab", compresslevel=6) as fh:
+                fh.writelines(lines)
+
+
+class Retention:
+    def __init__(self, archive_dir: str | None = None):
+        directory = (
+            settings.RETENTION_ARCHIVE_DIR if archive_dir is None else archive_dir
+        )
+        self.archive = Archive(directory)
+        self.archived: dict[str, int] = {}
+        self.deleted: dict[str, int] = {}
+        self.dropped_partitions = 0
+        self.last_run: dt.datetime | None = None
+        self.last_ms = 0.0
+
+    # ─── row‑by‑row pruning ────────────────────────────────────────────
+    async def prune(self, policy: Policy, now: dt.datetime) -> int:
+        """Archive and delete rows past the policy's cutoff in batches."""
+        if policy.days <= 0:
+            return 0
+        model = policy.model
+        table = model.__tablename__
+        (pk,) = inspect(model).primary_key
+        cols = [c.key for c in inspect(model).columns]
+        cutoff = now - dt.timedelta(days=policy.days)
+        cond = policy.ts_col < cutoff
+        if policy.where is not None:
+            cond = cond & policy.where
+        total = 0
+        while True:
+            async with session_ctx() as s:
+                rows = (
+                    await s.execute(
+                        select(*(getattr(model, c) for c in cols))
+                        .where(cond)
+                        .order_by(policy.ts_col)
+                        .limit(settings.RETENTION_BATCH)
+                    )
+                ).all()
+                if not rows:
+                    break
+                dicts = [dict(zip(cols, r)) for r in rows]
+                await asyncio.to_thread(
+                    self.archive.write, table, policy.ts_col.key, dicts
+                )
+                keys = [d[pk.key] for d in dicts]
+                await s.execute(delete(model).where(pk.in_(keys)))
+                await s.commit()
+            total += len(rows)
+            if self.archive.directory:
+                self.archived[table] = self.archived.get(table, 0) + len(rows)
+            self.deleted[table] = self.deleted.get(table, 0) + len(rows)
+            if len(rows) < settings.RETENTION_BATCH:
+                break
+            await asyncio.sleep(0)  # let the pipeline in between batches
+        return total
+
+    # ─── Postgres partitions ───────────────────────────────────────────
+    async def ensure_partitions(self, today: dt.date) -> None:
+        async with engine.begin() as conn:
+            await create_log_partitions(conn, today)
+
+    async def _partitions(self) -> list[tuple[str, dt.date]]:
+        async with engine.connect() as conn:
+            names = (
+                await conn.execute(
+                    text(
+                        "SELECT c.relname FROM pg_inherits i "
+                        "JOIN pg_class c ON c.oid = i.inhrelid "
+                        "JOIN pg_class p ON p.oid = i.inhparent "
+                        "WHERE p.relname = 'logs'"
+                    )
+                )
+            ).scalars()
+            out = []
+            for name in names:
+                try:
+                    out.append((name, dt.datetime.strptime(name[6:], "%Y%m%d").date()))
+                except ValueError:
+                    continue  # logs_default
+            return sorted(out, key=lambda t: t[1])
+
+    async def drop_partitions(self, now: dt.datetime) -> int:
+        """Archive and drop daily partitions that end before the cutoff."""
+        if settings.RETENTION_LOGS_DAYS <= 0:
+            return 0
+        cutoff = now - dt.timedelta(days=settings.RETENTION_LOGS_DAYS)
+        dropped = 0
+        for name, day in await self._partitions():
+            if dt.datetime.combine(day + dt.timedelta(days=1), dt.time()) > cutoff:
+                break
+            last_id, n = -1, 0
+            while self.archive.directory:
+                async with engine.connect() as conn:
+                    rows = (
+                        await conn.execute(
+                            text(
+                                f"SELECT id, ts, level, msg FROM {name} "
+                                "WHERE id > :last ORDER BY id LIMIT :n"
+                            ),
+                            {"last": last_id, "n": settings.RETENTION_BATCH},
+                        )
+                    ).all()
+                if not rows:
+                    break
+                dicts = [dict(r._mapping) for r in rows]
+                await asyncio.to_thread(self.archive.write, "logs", "ts", dicts)
+                last_id, n = rows[-1].id, n + len(rows)
+                await asyncio.sleep(0)
+            async with engine.begin() as conn:
+                await conn.execute(text(f"DROP TABLE {name}"))
+            self.archived["logs"] = self.archived.get("logs", 0) + n
+            self.dropped_partitions += 1
+            dropped += 1
+            dbg(f"RETENTION dropped partition {name} ({n} rows archived)")
+        return dropped
+
+    # ─── loop ──────────────────────────────────────────────────────────
+    async def run_once(self) -> dict[str, int]:
+        t0 = time.perf_counter()
+        now = clock.utcnow()
+        counts: dict[str, int] = {}
+        if partitioned():
+            await self.ensure_partitions(now.date())
+            counts["logs_partitions"] = await self.drop_partitions(now)
+        for policy in policies():
+            n = await self.prune(policy, now)
+            if n:
+                counts[policy.model.__tablename__] = n
+        self.last_run = now
+        self.last_ms = (time.perf_counter() - t0) * 1000
+        if counts:
+            await log("INFO", f"RETENTION pruned {counts}")
+        return counts
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:  # retry next interval
+                dbg(f"RETENTION pass failed: {e}")
+            await asyncio.sleep(settings.RETENTION_INTERVAL_SEC)
+
+    def stats(self) -> dict:
+        return {
+            "archived": self.archived,
+            "deleted": self.deleted,
+            "dropped_partitions": self.dropped_partitions,
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+            "last_ms": self.last_ms,
+            "archive_dir": self.archive.directory or None,
+        }
+
+
+retention = Retention()
+
+
+if __name__ == "__main__":
+
+    async def _once() -> None:
+        from pumpfun_sniper.db import init, log_sink
+
+        await init()
+        print(json.dumps(await retention.run_once()))
+        await log_sink.close()
+
+    asyncio.run(_once())
@@ -1,66 +1,215 @@
 """
 Thin async wrapper around RugCheck.xyz public API plus threshold comparison.
+
+All traffic goes through one `Scheduler`: requests wait in a priority queue
+(young, nearly passing candidates first), drain through a token bucket,
+share a single in‑flight request per mint and are answered from a short
+TTL report cache when possible.
 """
 
-import asyncio
+import asyncio, heapq, itertools, time
 import httpx
+
+from pumpfun_sniper import clients
 from pumpfun_sniper.config import settings
 from pumpfun_sniper.db import log
 from pumpfun_sniper.debug import dbg
+from pumpfun_sniper.recorder import recorder
+from pumpfun_sniper.rules import book
 
-THRESHOLDS = {
-    "holders": 50,
-    "lp_locked_pct": 70,
-    "creator_balance_pct": 10,
-    "market_cap_usd": 2000,
-}
+ENDPOINT = "https://api.rugcheck.xyz/v1/tokens/{mint}/report"
 
 
 async def fetch(mint: str) -> dict:
     """Fetch full token report from RugCheck."""
-    url = f"https://api.rugcheck.xyz/v1/tokens/{mint}/report"
-    async with httpx.AsyncClient(timeout=10) as cli:
-        dbg(f"RUGCHECK GET {url}")
-        r = await cli.get(url)
-        dbg(f"RUGCHECK RESPONSE {r.status_code} {r.text[:200]}")
-        r.raise_for_status()
-        return r.json()
+    url = ENDPOINT.format(mint=mint)
+    dbg(f"RUGCHECK GET {url}")
+    headers = {"X-API-KEY": settings.RUGCHECK_KEY} if settings.RUGCHECK_KEY else None
+    r = await clients.get(url, headers=headers)
+    dbg(f"RUGCHECK RESPONSE {r.status_code} {r.text[:200]}")
+    r.raise_for_status()
+    tok = r.json()
+    if recorder.active:
+        recorder.record("rug", {"mint": mint, "report": tok})
+    return tok
+
+
+def failures(tok: dict) -> list[str]:
+    """Names of the filter rules (see `rules`) a token report does not meet."""
+    return book.current().failures(tok)
 
 
 def is_good(tok: dict) -> bool:
     """Return True if token report meets quality thresholds."""
-    try:
-        holders = tok.get("totalHolders", 0)
-        lp_locked = tok.get("lpLockedPct") or 0
+    return not failures(tok)
+
+
+def fatal(tok: dict) -> str | None:
+    """Condition no amount of waiting will fix, or None."""
+    if tok.get("rugged"):
+        return "rugged"
+    if tok.get("freezeAuthority"):
+        return "freeze authority enabled"
+    if tok.get("mintAuthority"):
+        return "mint authority enabled"
+    return None
+
+
+def priority(age_sec: float, failing: int | None = None) -> float:
+    """Queue priority (lower runs first) from candidate age and how close its
+    last report was to passing; unknown reports rank mid‑way."""
+    n = len(book.current().rules)
+    failing = n / 2 if failing is None else failing
+    return age_sec / max(settings.RUG_TIMEOUT_SEC, 1) + failing / n
+
 
-        token_info = tok.get("token") or {}
-        decimals = token_info.get("decimals", 0) if isinstance(token_info, dict) else 0
+# ─── scheduler ──────────────────────────────────────────────────────────
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.stamp = time.monotonic()
+        self.paused_until = 0.0
 
-        markets = tok.get("markets") or []
-        supply = 0
-        if markets and isinstance(markets[0], dict):
-            supply = markets[0].get("lp", {}).get("tokenSupply", 0)
+    async def acquire(self) -> None:
+        while True:
+            now = time.monotonic()
+            if now < self.paused_until:
+                await asyncio.sleep(self.paused_until - now)
+                continue
+            self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+            self.stamp = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
 
-        creator_balance = tok.get("creatorBalance", 0)
-        creator_pct = creator_balance / supply * 100 if supply else 0
+    def pause(self, sec: float) -> None:
+        """Back off after a 429: no tokens until `sec` has passed."""
+        self.paused_until = max(self.paused_until, time.monotonic() + sec)
+        self.tokens = 0.0
 
-        price = tok.get("price", 0)
-        market_cap = price * (supply / (10**decimals)) if supply else 0
 
-        return (
-            holders >= THRESHOLDS["holders"]
-            and lp_locked >= THRESHOLDS["lp_locked_pct"]
-            and creator_pct <= THRESHOLDS["creator_balance_pct"]
-            and market_cap >= THRESHOLDS["market_cap_usd"]
+class Scheduler:
+    def __init__(self, rate=None, burst=None, workers=None):
+        self.bucket = TokenBucket(
+            rate or settings.RUGCHECK_RATE_PER_SEC, burst or settings.RUGCHECK_BURST
         )
-    except (KeyError, TypeError, ZeroDivisionError):
-        return False
+        self.workers = workers or settings.RUGCHECK_WORKERS
+        self._heap: list[tuple[float, int, str]] = []  # (priority, seq, mint)
+        self._seq = itertools.count()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._cache: dict[str, tuple[float, dict]] = {}  # mint -> (ts, report)
+        self._loop = None
+        self._wake: asyncio.Event | None = None
+        self._tasks: list[asyncio.Task] = []
+        self.requests = self.hits = self.deduped = self.fetched = self.throttled = 0
+
+    def _start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop, self._wake = loop, asyncio.Event()
+        self._heap.clear()
+        self._inflight.clear()
+        self._tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+
+    def cached(self, mint: str, max_age: float | None = None) -> dict | None:
+        hit = self._cache.get(mint)
+        ttl = settings.RUGCHECK_CACHE_SEC if max_age is None else max_age
+        if hit is None or time.monotonic() - hit[0] > ttl:
+            return None
+        return hit[1]
+
+    async def report(
+        self, mint: str, priority: float = 0.0, max_age: float | None = None
+    ) -> dict:
+        """RugCheck report for `mint`, no older than `max_age` seconds
+        (default `RUGCHECK_CACHE_SEC`)."""
+        self._start()
+        self.requests += 1
+        hit = self.cached(mint, max_age)
+        if hit is not None:
+            self.hits += 1
+            return hit
+        fut = self._inflight.get(mint)
+        if fut is None:
+            fut = self._inflight[mint] = self._loop.create_future()
+            heapq.heappush(self._heap, (priority, next(self._seq), mint))
+            self._wake.set()
+        else:
+            self.deduped += 1
+        return await asyncio.shield(fut)
+
+    async def _worker(self) -> None:
+        while True:
+            while not self._heap:
+                self._wake.clear()
+                await self._wake.wait()
+            prio, _, mint = heapq.heappop(self._heap)
+            await self.bucket.acquire()
+            try:
+                tok = await fetch(mint)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 429:
+                    self.throttled += 1
+                    try:
+                        wait = float(e.response.headers.get("Retry-After", 1))
+                    except ValueError:
+                        wait = 1.0
+                    dbg(f"RUGCHECK 429, pausing {wait}s")
+                    self.bucket.pause(wait)
+                    heapq.heappush(self._heap, (prio, next(self._seq), mint))
+                    continue
+                self._settle(mint, exc=e)
+                continue
+            except Exception as e:
+                self._settle(mint, exc=e)
+                continue
+            self.fetched += 1
+            now = time.monotonic()
+            self._cache[mint] = (now, tok)
+            if len(self._cache) > 10_000:  # drop expired reports
+                ttl = settings.RUGCHECK_CACHE_SEC
+                self._cache = {
+                    m: v for m, v in self._cache.items() if now - v[0] <= ttl
+                }
+            self._settle(mint, tok)
+
+    def _settle(self, mint: str, tok: dict | None = None, exc=None) -> None:
+        fut = self._inflight.pop(mint, None)
+        if fut is None or fut.done():
+            return
+        if exc is not None:
+            fut.set_exception(exc)
+        else:
+            fut.set_result(tok)
+
+    def stats(self) -> dict:
+        return {
+            "queued": len(self._heap),
+            "in_flight": len(self._inflight),
+            "requests": self.requests,
+            "cache_hits": self.hits,
+            "deduped": self.deduped,
+            "fetched": self.fetched,
+            "throttled": self.throttled,
+            "tokens": round(self.bucket.tokens, 2),
+        }
+
+
+scheduler = Scheduler()
 
 
 async def wait_until_good(mint: str, timeout_sec: int) -> bool:
     """Poll RugCheck until thresholds met or timeout."""
     for _ in range(timeout_sec // settings.RUG_RECHECK_SEC):
-        tok = await fetch(mint)
+        tok = await scheduler.report(mint, max_age=settings.RUG_RECHECK_SEC / 2)
+        reason = fatal(tok)
+        if reason:
+            await log("INFO", f"RugCheck rejected {mint[:8]}…: {reason}")
+            return False
         if is_good(tok):
             return True
         await asyncio.sleep(settings.RUG_RECHECK_SEC)
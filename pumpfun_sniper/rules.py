@@ -0,0 +1,197 @@
+"""
+Declarative token filter rules, compiled once and evaluated per report or in
+batches.
+
+A rule is `[name:] feature op number`, e.g. `holders >= 50`; rules are
+separated by `;` or newlines and `#` starts a comment. They come from the
+`FILTER_RULES_PATH` file (reloaded when its mtime changes) or the
+`FILTER_RULES` setting. Each report is flattened once into a feature row
+(`extract`); single reports are checked with compiled closures, batches as
+NumPy column comparisons over the stacked rows.
+"""
+
+import math, operator, os, re, time
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+from pumpfun_sniper.config import settings
+from pumpfun_sniper.debug import dbg
+
+FEATURES = (
+    "holders",
+    "lp_locked_pct",
+    "creator_balance_pct",
+    "market_cap_usd",
+    "price",
+    "supply",
+    "score",
+    "risk_count",
+)
+_COL = {name: i for i, name in enumerate(FEATURES)}
+
+
+def _ne(a, b):
+    """`!=` that is False for NaN, like every other comparison (scalars and
+    arrays)."""
+    return (a != b) & (a == a)
+
+
+_OPS: dict[str, Callable] = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    ">": operator.gt,
+    "<": operator.lt,
+    "==": operator.eq,
+    "!=": _ne,
+}
+_RULE_RE = re.compile(
+    r"^(?:(?P<name>[\w.-]+)\s*:\s*)?(?P<feat>\w+)\s*(?P<op>>=|<=|==|!=|>|<)\s*"
+    r"(?P<val>[-+]?(?:\d[\d_]*\.?\d*(?:[eE][-+]?\d+)?|\.\d+))$"
+)
+_NAN = math.nan
+
+
+def extract(tok: dict) -> tuple[float, ...]:
+    """Flatten a RugCheck report into a `FEATURES` row; unreadable values are
+    NaN, which fails every comparison."""
+    try:
+        token_info = tok.get("token") or {}
+        decimals = token_info.get("decimals", 0) if isinstance(token_info, dict) else 0
+        markets = tok.get("markets") or []
+        supply = 0
+        if markets and isinstance(markets[0], dict):
+            supply = markets[0].get("lp", {}).get("tokenSupply", 0)
+        price = tok.get("price", 0)
+        creator_pct = tok.get("creatorBalance", 0) / supply * 100 if supply else 0
+        return (
+            float(tok.get("totalHolders", 0)),
+            float(tok.get("lpLockedPct") or 0),
+            float(creator_pct),
+            float(price * (supply / (10**decimals)) if supply else 0),
+            float(price),
+            float(supply),
+            float(tok.get("score") or 0),
+            float(len(tok.get("risks") or ())),
+        )
+    except (AttributeError, KeyError, TypeError, ValueError, ZeroDivisionError):
+        return (_NAN,) * len(FEATURES)
+
+
+@dataclass(frozen=True, slots=True)
+class Rule:
+    name: str
+    feature: str
+    op: str
+    value: float
+    test: Callable[[tuple[float, ...]], bool]
+
+    def __str__(self) -> str:
+        return f"{self.feature} {self.op} {self.value:g}"
+
+
+def _compile(name: str, feature: str, op: str, value: float) -> Rule:
+    i, fn = _COL[feature], _OPS[op]
+    return Rule(name, feature, op, value, lambda row: fn(row[i], value))
+
+
+def parse(text: str) -> list[Rule]:
+    """Compile rule source; raises ValueError naming the offending line."""
+    rules = []
+    for lineno, chunk in enumerate(re.split(r"[;\n]", text), 1):
+        src = chunk.split("#", 1)[0].strip()
+        if not src:
+            continue
+        m = _RULE_RE.match(src)
+        if m is None:
+            raise ValueError(f"rule {lineno}: cannot parse {src!r}")
+        feat = m["feat"]
+        if feat not in _COL:
+            raise ValueError(f"rule {lineno}: unknown feature {feat!r}")
+        rules.append(_compile(m["name"] or feat, feat, m["op"], float(m["val"])))
+    if not rules:
+        raise ValueError("no rules defined")
+    return rules
+
+
+class RuleSet:
+    def __init__(self, rules: list[Rule]):
+        self.rules = rules
+        self.names = [r.name for r in rules]
+
+    def failures(self, tok: dict) -> list[str]:
+        """Names of the rules a single report fails."""
+        row = extract(tok)
+        return [r.name for r in self.rules if not r.test(row)]
+
+    def matrix(self, reports: list[dict]) -> np.ndarray:
+        return np.array([extract(t) for t in reports], dtype=np.float64).reshape(
+            len(reports), len(FEATURES)
+        )
+
+    def passes(self, features: np.ndarray) -> np.ndarray:
+        """(reports × rules) boolean pass matrix for a feature matrix."""
+        out = np.empty((features.shape[0], len(self.rules)), dtype=bool)
+        for j, r in enumerate(self.rules):
+            out[:, j] = _OPS[r.op](features[:, _COL[r.feature]], r.value)
+        return out
+
+    def first_failure(self, features: np.ndarray) -> np.ndarray:
+        """Index of the first failed rule per report, -1 where all pass."""
+        ok = self.passes(features)
+        return np.where(ok.all(axis=1), -1, np.argmin(ok, axis=1))
+
+    def evaluate(self, reports: dict[str, dict]) -> dict[str, str | None]:
+        """mint → name of the first failed rule (None when it passes)."""
+        mints = list(reports)
+        idx = self.first_failure(self.matrix([reports[m] for m in mints]))
+        return {m: (self.names[i] if i >= 0 else None) for m, i in zip(mints, idx)}
+
+
+class RuleBook:
+    """Current `RuleSet`, recompiled when the rules file changes."""
+
+    def __init__(self, path: str | None = None, text: str | None = None):
+        self.path = path if path is not None else settings.FILTER_RULES_PATH
+        self.text = text if text is not None else settings.FILTER_RULES
+        self._set: RuleSet | None = None
+        self._mtime: float | None = None
+        self._checked = 0.0
+        self.loads = 0
+        self.current()  # bad startup rules raise here
+
+    def _file_mtime(self) -> float | None:
+        try:
+            return os.path.getmtime(self.path) if self.path else None
+        except OSError:
+            return None
+
+    def current(self) -> RuleSet:
+        now = time.monotonic()
+        if (
+            self._set is not None
+            and now - self._checked < settings.FILTER_RULES_RELOAD_SEC
+        ):
+            return self._set
+        self._checked = now
+        mtime = self._file_mtime()
+        if self._set is not None and mtime == self._mtime:
+            return self._set
+        text = self.text
+        if mtime is not None:
+            with open(self.path) as fh:
+                text = fh.read()
+        try:
+            self._set = RuleSet(parse(text))
+            self.loads += 1
+            dbg(f"RULES loaded {len(self._set.rules)} rules")
+        except ValueError as e:
+            if self._set is None:
+                raise
+            dbg(f"RULES reload failed, keeping previous rules: {e}")
+        self._mtime = mtime
+        return self._set
+
+
+book = RuleBook()
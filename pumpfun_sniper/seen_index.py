@@ -0,0 +1,111 @@
+"""
+In‑memory index of seen token names and blocked creators.
+
+Replaces the two per‑event DB lookups on the Helius hot path with hash‑set
+membership tests. The index is warmed from `seen_names` / `blocked_creators`
+at start‑up and updated write‑through. For very large name histories an
+optional Bloom filter replaces the name set: a miss is definitive, a hit is
+confirmed against the DB.
+"""
+
+import hashlib, math
+
+from sqlalchemy import select
+
+from pumpfun_sniper.bus import bus
+from pumpfun_sniper.config import settings
+from pumpfun_sniper.db import session_ctx, SeenName, BlockedCreator
+from pumpfun_sniper.debug import dbg
+
+
+class BloomFilter:
+    """Fixed‑size Bloom filter using double hashing over one blake2b digest."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.m = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.k = max(1, round(self.m / capacity * math.log(2)))
+        self._bits = bytearray((self.m + 7) // 8)
+
+    def _positions(self, key: str):
+        d = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1, h2 = int.from_bytes(d[:8], "little"), int.from_bytes(d[8:], "little")
+        return ((h1 + i * h2) % self.m for i in range(self.k))
+
+    def add(self, key: str) -> None:
+        for p in self._positions(key):
+            self._bits[p >> 3] |= 1 << (p & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+
+class SeenIndex:
+    def __init__(self, bloom: bool | None = None, capacity: int | None = None):
+        use_bloom = settings.SEEN_INDEX_BLOOM if bloom is None else bloom
+        capacity = capacity or settings.SEEN_INDEX_CAPACITY
+        self.names: set[str] = set()
+        self.creators: set[str] = set()
+        self.bloom = BloomFilter(capacity) if use_bloom else None
+        self.loaded = False
+
+    async def load(self, batch: int = 10_000) -> None:
+        """Warm the index from the DB, in short keyset‑paged reads so
+        start‑up writes are not held behind one long transaction."""
+        async with session_ctx() as s:
+            self.creators.update(await s.scalars(select(BlockedCreator.creator)))
+        last = None
+        while True:
+            q = select(SeenName.name).order_by(SeenName.name).limit(batch)
+            if last is not None:
+                q = q.where(SeenName.name > last)
+            async with session_ctx() as s:
+                names = (await s.scalars(q)).all()
+            if self.bloom is None:
+                self.names.update(names)
+            else:
+                for name in names:
+                    self.bloom.add(name)
+            if len(names) < batch:
+                break
+            last = names[-1]
+        self.loaded = True
+        dbg(
+            f"SEEN INDEX loaded creators={len(self.creators)} bloom={self.bloom is not None}"
+        )
+
+    def check(self, name: str, creator: str) -> bool | None:
+        """True → drop the event, False → accept it, None → Bloom hit that
+        must be confirmed against the DB."""
+        if creator in self.creators:
+            return True
+        if self.bloom is None:
+            return name in self.names
+        return None if name in self.bloom else False
+
+    def add_name(self, name: str) -> None:
+        if self.bloom is None:
+            self.names.add(name)
+        else:
+            self.bloom.add(name)
+
+    async def block_creator(self, creator: str) -> None:
+        """Block a creator in memory and in `blocked_creators`."""
+        if creator in self.creators:
+            return
+        self.creators.add(creator)
+        async with session_ctx() as s:
+            await s.merge(BlockedCreator(creator=creator))
+            await bus.journal(s, "creator_blocked", creator)
+            await s.commit()
+        bus.publish("creator_blocked", creator, key=creator)
+
+    def subscribe(self):
+        """Pick up creators blocked by an evaluator in another process."""
+
+        async def same(creator: str) -> str:
+            return creator
+
+        return bus.subscribe("creator_blocked", self.creators.add, same)
+
+
+index = SeenIndex()  # shared by the watcher and whoever blocks creators
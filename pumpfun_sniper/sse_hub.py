@@ -0,0 +1,197 @@
+"""
+Broadcast hub for the dashboard's Server‑Sent Event streams.
+
+One poller per stream (started with the first subscriber, stopped with the
+last) reads only what changed and fans a single serialised payload out to
+every connected browser. Events:
+
+* `snapshot` – bounded list of the most recent rows, sent on connect;
+* `upsert`   – new or changed rows;
+* `delete`   – keys of rows that left the live window.
+
+Append‑only tables (`logs`, `closed_positions`) advance an id cursor;
+mutable ones (`candidates`, `open_positions`) diff a bounded window of the
+newest rows against the previous poll.
+"""
+
+import asyncio, json, datetime as dt
+from collections import OrderedDict
+
+from sqlalchemy import and_, or_, select
+
+from pumpfun_sniper.config import settings
+from pumpfun_sniper.db import async_session
+from pumpfun_sniper.debug import dbg
+
+
+def _row(obj, cols):  # serialize SQLAlchemy row
+    d = {}
+    for c in cols:
+        v = getattr(obj, c)
+        if isinstance(v, dt.datetime):
+            v = v.isoformat(sep=" ", timespec="seconds")
+        d[c] = v
+    return d
+
+
+class StreamHub:
+    def __init__(
+        self, model, cols: list[str], order_col, key: str, append: bool = False
+    ):
+        self.model = model
+        self.cols = cols if key in cols else [key] + cols
+        self.order_col = order_col
+        self.key = key
+        self.append = append
+        self._rows: OrderedDict = OrderedDict()  # key -> serialised row dict
+        self._cursor = None  # last seen id (append streams)
+        self._subs: set[asyncio.Queue] = set()
+        self._ready = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._snapshot: str | None = None
+
+    # ─── subscribers ───────────────────────────────────────────────────
+    async def subscribe(self):
+        """Async generator of SSE events for one client."""
+        q: asyncio.Queue = asyncio.Queue(settings.SSE_QUEUE_SIZE)
+        self._subs.add(q)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._poll())
+        try:
+            await self._ready.wait()
+            yield {"event": "snapshot", "data": self._snapshot_payload()}
+            while True:
+                msg = await q.get()
+                if msg is None:  # fell too far behind; client reconnects
+                    return
+                yield msg
+        finally:
+            self._subs.discard(q)
+            if not self._subs and self._task is not None:
+                self._task.cancel()
+                self._task = None
+                self._reset()
+
+    def _reset(self) -> None:
+        self._rows.clear()
+        self._cursor = None
+        self._snapshot = None
+        self._ready.clear()
+
+    def _snapshot_payload(self) -> str:
+        if self._snapshot is None:
+            self._snapshot = json.dumps(list(reversed(self._rows.values())))
+        return self._snapshot
+
+    def _publish(self, event: str, payload) -> None:
+        self._snapshot = None
+        msg = {"event": event, "data": json.dumps(payload)}  # serialised once
+        for q in list(self._subs):
+            try:
+                q.put_nowait(msg)
+            except asyncio.QueueFull:
+                self._subs.discard(q)
+                q.get_nowait()
+                q.put_nowait(None)
+
+    # ─── polling ───────────────────────────────────────────────────────
+    def _select(self):
+        return select(*(getattr(self.model, c) for c in self.cols))
+
+    async def _poll(self) -> None:
+        while True:
+            try:
+                async with async_session() as s:
+                    if self.append:
+                        await self._poll_append(s)
+                    else:
+                        await self._poll_window(s)
+            except Exception as e:
+                dbg(f"SSE poll {self.model.__tablename__} failed: {e}")
+            self._ready.set()
+            await asyncio.sleep(settings.SSE_POLL_SEC)
+
+    async def _poll_append(self, s) -> None:
+        key = getattr(self.model, self.key)
+        if self._cursor is None:
+            stmt = self._select().order_by(key.desc()).limit(settings.SSE_SNAPSHOT_ROWS)
+            rows = list(reversed((await s.execute(stmt)).all()))
+        else:
+            stmt = (
+                self._select()
+                .where(key > self._cursor)
+                .order_by(key)
+                .limit(settings.SSE_PAGE_ROWS)
+            )
+            rows = (await s.execute(stmt)).all()
+        if not rows:
+            return
+        new = [_row(r, self.cols) for r in rows]
+        for d in new:
+            self._rows[d[self.key]] = d
+        while len(self._rows) > settings.SSE_SNAPSHOT_ROWS:
+            self._rows.popitem(last=False)
+        first = self._cursor is None
+        self._cursor = new[-1][self.key]
+        if not first:
+            self._publish("upsert", new)
+
+    async def _poll_window(self, s) -> None:
+        stmt = (
+            self._select()
+            .order_by(self.order_col.desc())
+            .limit(settings.SSE_SNAPSHOT_ROWS)
+        )
+        current = OrderedDict()
+        for r in reversed((await s.execute(stmt)).all()):
+            d = _row(r, self.cols)
+            current[d[self.key]] = d
+        first = not self._ready.is_set()
+        changed = [d for k, d in current.items() if self._rows.get(k) != d]
+        removed = [k for k in self._rows if k not in current]
+        self._rows = current
+        if first:
+            return
+        if changed:
+            self._publish("upsert", changed)
+        if removed:
+            self._publish("delete", removed)
+
+    async def history(self, before=None, limit: int | None = None) -> dict:
+        """One page of rows older than `before`, newest first. The cursor is
+        the id for append streams; otherwise `"<timestamp>|<key>"` with the
+        full‑precision ordering timestamp, the key breaking ties so rows
+        sharing a timestamp are neither skipped nor repeated. Raises
+        ValueError for a malformed cursor."""
+        limit = min(limit or settings.SSE_PAGE_ROWS, settings.SSE_PAGE_ROWS)
+        key = getattr(self.model, self.key)
+        try:
+            if self.append and before is not None:
+                before = int(before)
+            elif before is not None:
+                ts, _, k = str(before).partition("|")
+                ts = dt.datetime.fromisoformat(ts)
+        except ValueError:
+            raise ValueError(f"bad history cursor {before!r}") from None
+        if self.append:
+            stmt = self._select().order_by(key.desc())
+            if before is not None:
+                stmt = stmt.where(key < before)
+        else:
+            col = self.order_col
+            stmt = self._select().order_by(col.desc(), key.desc())
+            if before is not None:
+                stmt = stmt.where(
+                    or_(col < ts, and_(col == ts, key < k)) if k else col < ts
+                )
+        async with async_session() as s:
+            raw = (await s.execute(stmt.limit(limit))).all()
+        nxt = None
+        if len(raw) == limit:
+            last = raw[-1]
+            if self.append:
+                nxt = getattr(last, self.key)
+            else:
+                ts = getattr(last, self.order_col.key)
+                nxt = f"{ts.isoformat()}|{getattr(last, self.key)}"
+        return {"rows": [_row(r, self.cols) for r in raw], "next": nxt}
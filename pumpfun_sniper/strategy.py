@@ -1,12 +1,31 @@
 """
 Examines NEW candidates, waits RugCheck + grace periods, then executes BUYs.
+
+Evaluation is split into steps driven by `evaluator.Evaluator`: the grace
+period is the job's initial delay and every RugCheck recheck is a
+rescheduled step, so nothing sleeps per candidate. New candidates arrive on
+the `bus`; `submit_new` replays NEW rows from the DB on start‑up and as a
+slow safety sweep. A candidate is marked BUYING before its buy is sent, so
+neither the sweep nor a second process can buy it again; it only returns
+to NEW if the swap provably never landed.
 """
 
-import asyncio, math, datetime as dt
+import httpx
+from sqlalchemy import select, update
+
+from pumpfun_sniper import clock, metrics
+from pumpfun_sniper.broadcast import RESENDABLE
+from pumpfun_sniper.bus import bus
 from pumpfun_sniper.config import settings
-from pumpfun_sniper.db import session_ctx, Candidate, OpenPos, log
-from pumpfun_sniper.rugcheck import wait_until_good
+from pumpfun_sniper.debug import dbg
+from pumpfun_sniper.db import session_ctx, Candidate, log
+from pumpfun_sniper.evaluator import Evaluator, Job
+from pumpfun_sniper.rugcheck import failures, fatal, priority, scheduler
 from pumpfun_sniper.jupiter import buy
+from pumpfun_sniper.positions import Position, insert
+from pumpfun_sniper.quotecache import quotes
+from pumpfun_sniper.seen_index import index
+from pumpfun_sniper.wallets import pool
 
 
 async def _update_status(mint: str, status: str):
@@ -16,30 +35,136 @@ async def _update_status(mint: str, status: str):
         await s.commit()
 
 
-async def process_candidate(row: Candidate) -> None:
-    await asyncio.sleep(settings.CREATION_GRACE_SEC)
-    ok = await wait_until_good(row.mint, timeout_sec=180)
-    if not ok:
-        await _update_status(row.mint, "REJECTED")
-        return
+def grace_delay(row: Candidate) -> float:
+    """Seconds left until the candidate's creation grace period expires."""
+    age = (clock.utcnow() - row.created_at).total_seconds()
+    return settings.CREATION_GRACE_SEC - age
+
+
+def enqueue(engine: Evaluator, row: Candidate) -> bool:
+    """Submit one candidate; False if it is already in flight."""
+    if not engine.submit(row.mint, row, delay=grace_delay(row)):
+        return False
+    metrics.mark(row.mint, "queued")
+    return True
 
-    price_per_token, _sig = await buy(settings.BUY_SIZE_SOL, row.mint)
-    qty = settings.BUY_SIZE_SOL / price_per_token
-    stop = price_per_token * (1 - settings.TRAIL_STOP_PCT / 100)
-    tp = price_per_token * (1 + settings.TAKE_PROFIT_PCT / 100)
 
+async def load_new(mint: str) -> Candidate | None:
+    """Candidate row for a bus notification, if it still awaits evaluation."""
     async with session_ctx() as s:
-        s.add(
-            OpenPos(
-                mint=row.mint,
-                qty=qty,
-                avg_price=price_per_token,
-                cost=settings.BUY_SIZE_SOL,
-                stop_price=stop,
-                take_profit=tp,
-                opened_at=dt.datetime.utcnow(),
-            )
+        row = await s.get(Candidate, mint)
+    return row if row is not None and row.status == "NEW" else None
+
+
+def subscribe(engine: Evaluator):
+    """Feed candidates published on the bus into `engine`."""
+    return bus.subscribe("candidate", lambda row: enqueue(engine, row), load_new)
+
+
+async def submit_new(engine: Evaluator) -> int:
+    """Submit every NEW candidate to the engine (in‑flight ones are skipped)."""
+    async with session_ctx() as s:
+        cands = (
+            await s.scalars(select(Candidate).where(Candidate.status == "NEW"))
+        ).all()
+    return sum(enqueue(engine, c) for c in cands)
+
+
+async def _claim(mint: str) -> bool:
+    """NEW → BUYING; False if the candidate already left NEW (another
+    process or a stale job got there first)."""
+    async with session_ctx() as s:
+        res = await s.execute(
+            update(Candidate)
+            .where(Candidate.mint == mint, Candidate.status == "NEW")
+            .values(status="BUYING")
         )
         await s.commit()
+    return res.rowcount == 1
+
+
+async def _open(row: Candidate) -> None:
+    route, tx, wallet = quotes.take(row.mint) or (None, None, None)
+    quotes.drop(row.mint)
+    if not await _claim(row.mint):
+        dbg(f"BUY {row.mint[:8]}… skipped, no longer NEW")
+        return
+    if wallet is None and not settings.SIMULATION:  # paper trades need no keypairs
+        wallet = pool.pick(row.mint, settings.BUY_SIZE_SOL)
+    try:
+        with metrics.trade(row.mint, "entry"):
+            price_per_token, _sig = await buy(
+                settings.BUY_SIZE_SOL, row.mint, route, tx, wallet=wallet
+            )
+    except (httpx.HTTPError, *RESENDABLE):
+        await _update_status(row.mint, "NEW")  # never landed: evaluate again
+        raise  # anything else may have bought: the row stays BUYING
+    qty = settings.BUY_SIZE_SOL / price_per_token
+    stop = price_per_token * (1 - settings.TRAIL_STOP_PCT / 100)
+    tp = price_per_token * (1 + settings.TAKE_PROFIT_PCT / 100)
 
+    pos = Position(
+        mint=row.mint,
+        qty=qty,
+        avg_price=price_per_token,
+        cost=settings.BUY_SIZE_SOL,
+        stop_price=stop,
+        take_profit=tp,
+        opened_at=clock.utcnow(),
+        wallet=wallet and wallet.pubkey,
+    )
+    await insert(pos)
+    bus.publish("position", pos, key=row.mint)  # → executor.adopt
     await _update_status(row.mint, "BOUGHT")
+    metrics.mark(row.mint, "bought")
+
+
+async def step_candidate(job: Job) -> float | None:
+    """One RugCheck poll for a candidate whose grace period has expired.
+
+    Returns the delay until the next recheck, or None once the candidate has
+    been bought or rejected.
+    """
+    row: Candidate = job.payload
+    age = (clock.utcnow() - row.created_at).total_seconds()
+    if "polls" not in job.state:
+        metrics.mark(row.mint, "grace_expired")
+    failed = reason = None
+    try:
+        with metrics.timer("rugcheck_poll", row.mint):
+            tok = await scheduler.report(
+                row.mint,
+                priority(age, job.state.get("failing")),
+                max_age=settings.RUG_RECHECK_SEC / 2,
+            )
+        failed, reason = failures(tok), fatal(tok)
+    except Exception as e:
+        await log("WARN", f"RugCheck fetch failed for {row.mint[:8]}…: {e}")
+    if reason:  # unrecoverable: no point polling until the timeout
+        await log("INFO", f"RugCheck rejected {row.mint[:8]}…: {reason}")
+        quotes.drop(row.mint)
+        if reason == "rugged":
+            await index.block_creator(row.creator)
+        await _update_status(row.mint, "REJECTED")
+        metrics.mark(row.mint, "rejected")
+        return None
+    if failed == []:
+        metrics.mark(row.mint, "rugcheck_pass")
+        await _open(row)
+        return None
+    if failed is not None:
+        job.state["failing"] = len(failed)
+        if len(failed) <= 1:
+            quotes.warm(row.mint)  # nearly there: keep a route ready for the buy
+
+    polls = job.state["polls"] = job.state.get("polls", 0) + 1
+    if polls >= max(settings.RUG_TIMEOUT_SEC // settings.RUG_RECHECK_SEC, 1):
+        await log(
+            "INFO",
+            f"RugCheck failed for {row.mint[:8]}… after {settings.RUG_TIMEOUT_SEC}s",
+        )
+        quotes.drop(row.mint)
+        await _update_status(row.mint, "REJECTED")
+        metrics.mark(row.mint, "rejected")
+        return None
+    return settings.RUG_RECHECK_SEC
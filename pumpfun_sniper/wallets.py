@@ -0,0 +1,155 @@
+"""
+Pool of signing wallets so concurrent swaps do not queue behind one
+account's token accounts and balance.
+
+Keypairs come from `KEYPAIR_PATH` (the primary wallet, which also signs for
+positions recorded without a wallet) plus `KEYPAIR_PATHS`. A buy is
+assigned the least‑loaded wallet (fewest swaps in flight, then most SOL;
+ties rotate) or, with `WALLET_ASSIGN=sticky`, a wallet hashed from the mint
+so every process picks the same one. Each wallet runs at most
+`WALLET_MAX_INFLIGHT` swaps at once. Balances are debited / credited as
+swaps land and reconciled from `getMultipleAccounts` every
+`WALLET_BALANCE_SEC`. The position records the wallet that bought it, so
+its exit signs with the same key.
+"""
+
+import asyncio, hashlib, json
+from contextlib import asynccontextmanager
+
+from solders.keypair import Keypair
+
+from pumpfun_sniper import clients
+from pumpfun_sniper.config import settings
+from pumpfun_sniper.debug import dbg
+
+
+def paths() -> list[str]:
+    extra = [p.strip() for p in settings.KEYPAIR_PATHS.split(",") if p.strip()]
+    return list(dict.fromkeys([settings.KEYPAIR_PATH, *extra]))
+
+
+def read_keypair(path: str) -> Keypair:
+    with open(path, "r") as fh:
+        return Keypair.from_json(json.load(fh))
+
+
+class Wallet:
+    def __init__(self, keypair: Keypair):
+        self.keypair = keypair
+        self.pubkey = str(keypair.pubkey())
+        self.sem = asyncio.Semaphore(settings.WALLET_MAX_INFLIGHT)
+        self.inflight = 0  # swaps holding or waiting for the semaphore
+        self.balance: float | None = None  # SOL, None until first refresh
+        self.swaps = 0
+        self.failures = 0
+
+    def stats(self) -> dict:
+        return {
+            "inflight": self.inflight,
+            "balance_sol": self.balance,
+            "swaps": self.swaps,
+            "failures": self.failures,
+        }
+
+
+class WalletPool:
+    def __init__(self, keypairs: list[Keypair] | None = None):
+        self._wallets: list[Wallet] | None = None
+        self._by_key: dict[str, Wallet] = {}
+        self._rr = 0
+        if keypairs is not None:
+            self._set(keypairs)
+
+    def _set(self, keypairs: list[Keypair]) -> None:
+        self._wallets = [Wallet(k) for k in keypairs]
+        self._by_key = {w.pubkey: w for w in self._wallets}
+
+    @property
+    def wallets(self) -> list[Wallet]:
+        if self._wallets is None:  # read on first swap, like the old kp()
+            self._set([read_keypair(p) for p in paths()])
+            dbg(f"WALLETS loaded {len(self._wallets)}")
+        return self._wallets
+
+    def __len__(self) -> int:
+        return len(self.wallets)
+
+    @property
+    def primary(self) -> Wallet:
+        return self.wallets[0]
+
+    def get(self, pubkey: str | None) -> Wallet:
+        """The wallet holding a position (the primary one for older rows)."""
+        primary = self.primary  # loads the pool
+        if not pubkey:
+            return primary
+        try:
+            return self._by_key[pubkey]
+        except KeyError:
+            raise KeyError(f"wallet {pubkey} is not in the pool (KEYPAIR_PATHS)")
+
+    # ─── assignment ────────────────────────────────────────────────────
+    def pick(self, mint: str, sol: float = 0.0) -> Wallet:
+        ws = self.wallets
+        if settings.WALLET_ASSIGN == "sticky":
+            h = int.from_bytes(
+                hashlib.blake2b(mint.encode(), digest_size=4).digest(), "little"
+            )
+            return ws[h % len(ws)]
+        funded = [w for w in ws if w.balance is None or w.balance >= sol] or ws
+        self._rr = (self._rr + 1) % len(ws)
+        rotated = funded[self._rr % len(funded) :] + funded[: self._rr % len(funded)]
+        return min(rotated, key=lambda w: (w.inflight, -(w.balance or 0.0)))
+
+    @asynccontextmanager
+    async def lease(self, wallet: Wallet):
+        """Hold one of the wallet's `WALLET_MAX_INFLIGHT` swap slots."""
+        wallet.inflight += 1
+        try:
+            async with wallet.sem:
+                yield wallet
+                wallet.swaps += 1
+        except Exception:
+            wallet.failures += 1
+            raise
+        finally:
+            wallet.inflight -= 1
+
+    def adjust(self, wallet: Wallet, sol: float) -> None:
+        """Book a landed swap's SOL change until the next refresh."""
+        if wallet.balance is not None:
+            wallet.balance += sol
+
+    # ─── balances ──────────────────────────────────────────────────────
+    async def refresh(self) -> None:
+        ws = self.wallets
+        for i in range(0, len(ws), 100):  # getMultipleAccounts limit
+            batch = ws[i : i + 100]
+            payload = {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "getMultipleAccounts",
+                "params": [[w.pubkey for w in batch], {"encoding": "base64"}],
+            }
+            r = await clients.post(settings.RPC_HTTP, json=payload)
+            r.raise_for_status()
+            for w, acc in zip(batch, r.json()["result"]["value"]):
+                w.balance = (acc or {}).get("lamports", 0) / 1e9
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                dbg(f"WALLETS balance refresh failed: {e}")
+            await asyncio.sleep(settings.WALLET_BALANCE_SEC)
+
+    def stats(self) -> dict:
+        return {
+            "assign": settings.WALLET_ASSIGN,
+            "max_inflight": settings.WALLET_MAX_INFLIGHT,
+            "wallets": {w.pubkey: w.stats() for w in self._wallets or []},
+        }
+
+
+pool = WalletPool()
@@ -0,0 +1,42 @@
+import os
+import sys
+import types
+
+import pytest_asyncio
+
+for var in [
+    "HELIUS_WSS",
+    "RUGCHECK_KEY",
+    "BIRDEYE_KEY",
+    "BASE_WALLET",
+    "KEYPAIR_PATH",
+    "DB_DSN",
+]:
+    os.environ.setdefault(var, "test")
+os.environ.setdefault("ENV_PATH", "/dev/null")
+
+
+@pytest_asyncio.fixture
+async def db(tmp_path, monkeypatch):
+    """A real `pumpfun_sniper.db` on a scratch SQLite file.
+
+    Most test modules replace `pumpfun_sniper.db` (and some third‑party
+    modules) with stubs at import time, so the package is imported afresh
+    for the test: import what it needs inside the test body. The modules
+    seen before are put back afterwards."""
+    monkeypatch.setenv("DB_DSN", f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    saved = dict(sys.modules)
+    for name, mod in saved.items():
+        if name.startswith("pumpfun_sniper") or isinstance(mod, types.SimpleNamespace):
+            del sys.modules[name]
+    try:
+        from pumpfun_sniper import db
+
+        await db.init()
+        yield db
+        await db.log_sink.close()
+        await db.engine.dispose()
+    finally:
+        for name in [n for n in sys.modules if n.startswith("pumpfun_sniper")]:
+            del sys.modules[name]
+        sys.modules.update(saved)
@@ -0,0 +1,139 @@
+import datetime as dt
+import pathlib
+import random
+import sys
+import types
+
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2]))
+
+
+async def _alog(*a, **k):
+    return None
+
+
+sys.modules["pumpfun_sniper.db"] = types.SimpleNamespace(log=_alog)
+from pumpfun_sniper.analytics import HOLD_BUCKETS, Rollup
+
+T0 = dt.datetime(2026, 1, 1)
+
+
+def _trades(n, seed=7):
+    rnd = random.Random(seed)
+    out = []
+    for i in range(1, n + 1):
+        opened = T0 + dt.timedelta(minutes=7 * i)
+        closed = opened + dt.timedelta(seconds=rnd.choice([5, 45, 200, 900, 20000]))
+        out.append((i, rnd.uniform(-0.01, 0.015), opened, closed))
+    return out
+
+
+def test_rollup_matches_full_recompute():
+    trades = _trades(500)
+    r = Rollup()
+    for t in reversed(trades[250:]):  # out of order across commits is fine
+        assert r.add(*t)
+    for t in trades[:250]:
+        r.add(*t)
+    assert not r.add(*trades[10])  # seen again via sync
+
+    s = r.summary()
+    pnls = [t[1] for t in trades]
+    assert s["trades"] == 500 and s["wins"] == sum(p > 0 for p in pnls)
+    assert abs(s["pnl"] - sum(pnls)) < 1e-9
+    assert s["best"] == max(pnls) and s["worst"] == min(pnls)
+    holds = [(c - o).total_seconds() for _, _, o, c in trades]
+    assert [h["count"] for h in s["hold_hist"]] == [
+        sum(lo < h <= hi for h in holds)
+        for lo, hi in zip((-1,) + HOLD_BUCKETS, HOLD_BUCKETS)
+    ]
+    hours = {c.strftime("%Y-%m-%dT%H:00") for *_, c in trades}
+    assert len(s["by_hour"]) == min(len(hours), 168)
+    assert abs(s["by_hour"][-1]["cum_pnl"] - sum(pnls)) < 1e-9
+
+    # drawdown in id (close) order
+    eq = peak = dd = 0.0
+    for p in pnls:
+        eq += p
+        peak = max(peak, eq)
+        dd = max(dd, peak - eq)
+    r2 = Rollup()
+    for t in trades:
+        r2.add(*t)
+    assert abs(r2.summary()["max_drawdown"] - dd) < 1e-9
+
+    restored = Rollup.from_state(r2.state())
+    assert restored.summary() == r2.summary()
+    assert not restored.add(*trades[-1])  # covered by the checkpoint
+
+
+async def _close(db, ids, pnl=lambda i: 1.0):
+    """Write a 30 s closed trade, one minute apart, for every id."""
+    async with db.session_ctx() as s:
+        for i in ids:
+            t = T0 + dt.timedelta(minutes=i)
+            s.add(
+                db.ClosedPos(
+                    id=i,
+                    mint=f"m{i}",
+                    qty=1,
+                    entry_price=1,
+                    exit_price=1,
+                    pnl=pnl(i),
+                    opened_at=t,
+                    closed_at=t + dt.timedelta(seconds=30),
+                )
+            )
+        await s.commit()
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_and_catch_up(db):
+    from pumpfun_sniper.analytics import Analytics
+
+    def pnl(i):
+        return -0.5 if i % 2 else 1.0
+
+    await _close(db, range(1, 41), pnl)
+    a = Analytics()
+    await a.load()  # no checkpoint yet: replays all 40
+    assert await a.checkpoint()
+    assert a.summary()["trades"] == 40 and a.summary()["pnl"] == 10.0
+
+    await _close(db, range(41, 51), pnl)  # closed while "down"
+    b = Analytics()
+    await b.load()  # checkpoint + 10 newer rows
+    await _close(db, range(51, 53), pnl)  # closed by another process
+    assert await b.sync() == 2
+    summary = b.summary()
+    assert summary["trades"] == 52 and summary["pnl"] == 13.0
+    assert summary["win_rate"] == 0.5 and summary["last_id"] == 52
+    assert await b.checkpoint()
+    assert not await b.checkpoint()  # nothing new to write the second time
+
+
+def test_late_commit_below_the_cursor_is_counted_once():
+    r = Rollup()
+    for i in (1, 2, 4, 5):  # 3 was assigned first but commits last
+        r.add(i, 1.0, T0, T0)
+    restored = Rollup.from_state(r.state())
+    assert restored.add(3, 1.0, T0, T0)
+    assert not restored.add(4, 1.0, T0, T0)  # counted before the checkpoint
+    assert restored.summary()["trades"] == 5 and restored.cursor == 5
+
+
+@pytest.mark.asyncio
+async def test_sync_picks_up_late_commits(db):
+    from pumpfun_sniper.analytics import Analytics
+
+    await _close(db, (1, 2, 4, 5))
+    a = Analytics()
+    await a.load()
+    await a.checkpoint()
+    await _close(db, (3,))  # committed after 4 and 5 were synced
+    assert await a.sync() == 1
+    assert await a.sync() == 0
+    b = Analytics()
+    await b.load()  # from the checkpoint taken before id 3
+    assert a.summary()["trades"] == b.summary()["trades"] == 5
@@ -0,0 +1,101 @@
+import asyncio
+import base64
+import json
+import os
+import pathlib
+import sys
+import pytest
+import websockets
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2]))
+
+for var in [
+    "HELIUS_WSS",
+    "RUGCHECK_KEY",
+    "BIRDEYE_KEY",
+    "BASE_WALLET",
+    "KEYPAIR_PATH",
+    "DB_DSN",
+]:
+    os.environ.setdefault(var, "test")
+os.environ.setdefault("ENV_PATH", "/dev/null")
+
+import pumpfun_sniper.bonding as bonding
+
+# bonding-curve account captured half way up the curve
+BLOB = (
+    "F7f4N2DYrGAAQGNSv8YBAABYR/gNAAAAALzi/ahoAQAArCP8BgAAAACAxqR+jQMAAAAAAAAAAAAA"
+    "AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA"
+)
+MINT = "So11111111111111111111111111111111111111112"
+
+
+def test_decode_recorded_blob():
+    st = bonding.decode(base64.b64decode(BLOB))
+    assert st.real_token_reserves == 396_550_000_000_000
+    assert not st.complete
+    assert st.progress_pct == pytest.approx(50.0)
+    assert st.price == pytest.approx(60_000_000_000 / 500_000_000_000_000)
+
+
+def test_decode_rejects_other_accounts():
+    with pytest.raises(ValueError):
+        bonding.decode(b"\x00" * 64)
+
+
+@pytest.mark.asyncio
+async def test_refresh_batches_rpc(monkeypatch):
+    calls = []
+
+    class Resp:
+        def __init__(self, n):
+            self.n = n
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {"result": {"value": [{"data": [BLOB, "base64"]}] * self.n}}
+
+    async def fake_post(url, json):
+        calls.append(len(json["params"][0]))
+        return Resp(len(json["params"][0]))
+
+    monkeypatch.setattr(bonding.clients, "post", fake_post)
+    cache = bonding.CurveCache(wss_url="ws://127.0.0.1:9", rpc_url="http://rpc")
+    monkeypatch.setattr(cache, "watch", lambda mints: None)
+    mints = [str(bonding.Pubkey.new_unique()) for _ in range(150)]
+    pcts = await cache.pcts(mints)
+    assert calls == [100, 50]
+    assert pcts[mints[0]] == pytest.approx(50.0)
+
+
+@pytest.mark.asyncio
+async def test_account_subscribe_feed():
+    async def handler(ws):
+        req = json.loads(await ws.recv())
+        assert req["method"] == "accountSubscribe"
+        await ws.send(json.dumps({"jsonrpc": "2.0", "id": req["id"], "result": 7}))
+        note = {
+            "jsonrpc": "2.0",
+            "method": "accountNotification",
+            "params": {
+                "subscription": 7,
+                "result": {"value": {"data": [BLOB, "base64"]}},
+            },
+        }
+        await ws.send(json.dumps(note))
+        await asyncio.sleep(1)
+
+    async with websockets.serve(handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        cache = bonding.CurveCache(
+            wss_url=f"ws://127.0.0.1:{port}", rpc_url="http://rpc"
+        )
+        cache.watch([MINT])
+        for _ in range(100):
+            if cache.get(MINT):
+                break
+            await asyncio.sleep(0.01)
+        cache._task.cancel()
+        assert cache.get(MINT).progress_pct == pytest.approx(50.0)
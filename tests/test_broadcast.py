@@ -0,0 +1,144 @@
+import asyncio
+import json
+import os
+import pathlib
+import sys
+import pytest
+import websockets
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2]))
+
+for var in [
+    "HELIUS_WSS",
+    "RUGCHECK_KEY",
+    "BIRDEYE_KEY",
+    "BASE_WALLET",
+    "KEYPAIR_PATH",
+    "DB_DSN",
+]:
+    os.environ.setdefault(var, "test")
+os.environ.setdefault("ENV_PATH", "/dev/null")
+
+import pumpfun_sniper.broadcast as broadcast
+
+
+class StandIn:
+    """Local stand-in for an RPC / block-engine endpoint."""
+
+    def __init__(self, fail=False, confirm_after=None, height=100, climb=0):
+        self.fail = fail  # False, True or "after_first"
+        self.sends = 0
+        self.confirm_after = confirm_after
+        self.height = height
+        self.climb = climb  # blocks per height sample
+
+    async def send(self, wire_b64):
+        self.sends += 1
+        if self.fail is True or (self.fail == "after_first" and self.sends > 1):
+            raise RuntimeError("node down")
+        return "sig"
+
+    async def statuses(self, sigs):
+        ok = self.confirm_after is not None and self.sends >= self.confirm_after
+        return [{"confirmationStatus": "confirmed", "err": None} if ok else None] * len(
+            sigs
+        )
+
+    async def block_height(self):
+        self.height += self.climb
+        return self.height
+
+
+@pytest.fixture(autouse=True)
+def fast_timers(monkeypatch):
+    monkeypatch.setattr(broadcast.settings, "TX_REBROADCAST_SEC", 0.05)
+    monkeypatch.setattr(broadcast.settings, "TX_STATUS_POLL_SEC", 0.02)
+    monkeypatch.setattr(broadcast.settings, "TX_EXPIRY_SEC", 5)
+
+
+@pytest.mark.asyncio
+async def test_fanout_and_websocket_confirmation():
+    async def handler(ws):
+        req = json.loads(await ws.recv())
+        assert req["method"] == "signatureSubscribe"
+        await ws.send(json.dumps({"jsonrpc": "2.0", "id": req["id"], "result": 3}))
+        await asyncio.sleep(0.02)
+        note = {
+            "method": "signatureNotification",
+            "params": {"subscription": 3, "result": {"value": {"err": None}}},
+        }
+        await ws.send(json.dumps(note))
+        await asyncio.sleep(0.5)
+
+    eps = [StandIn(), StandIn(fail=True), StandIn()]
+    async with websockets.serve(handler, "127.0.0.1", 0) as server:
+        url = f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+        b = broadcast.Broadcaster(eps, wss_url=url)
+        await asyncio.sleep(0.1)  # let the shared websocket connect
+        b._start()
+        await asyncio.sleep(0.1)
+        assert await b.submit(b"tx", "SIG1") == "SIG1"
+        await b.close()
+    assert eps[0].sends >= 1 and eps[2].sends >= 1
+    assert b.stats()[1]["failed"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_polling_fallback_rebroadcasts_until_confirmed():
+    ep = StandIn(confirm_after=3)
+    b = broadcast.Broadcaster([ep], wss_url="ws://127.0.0.1:9")
+    assert await b.submit(b"tx", "SIG2") == "SIG2"
+    await b.close()
+    assert ep.sends >= 3
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_blockhash_expiry():
+    ep = StandIn(height=200)
+    b = broadcast.Broadcaster([ep], wss_url="ws://127.0.0.1:9")
+    with pytest.raises(TimeoutError):
+        await b.submit(b"tx", "SIG3", last_valid_block_height=150)
+    await b.close()
+
+
+class Refusing(StandIn):
+    async def send(self, wire_b64):
+        self.sends += 1
+        raise broadcast.RpcError("sendTransaction: invalid transaction")
+
+
+@pytest.mark.asyncio
+async def test_refused_everywhere_is_resendable():
+    b = broadcast.Broadcaster([Refusing(), Refusing()], wss_url="ws://127.0.0.1:9")
+    with pytest.raises(broadcast.TxRejected):
+        await b.submit(b"tx", "SIG4")
+    await b.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_rebroadcasts_keep_waiting_for_the_first_send():
+    # the first send went out; every rebroadcast fails, then it confirms
+    ep = StandIn(fail="after_first", confirm_after=4)
+    b = broadcast.Broadcaster([ep], wss_url="ws://127.0.0.1:9")
+    assert await b.submit(b"tx", "SIG5") == "SIG5"
+    await b.close()
+    assert b.stats()[0]["sent"] == 1 and b.stats()[0]["failed"] >= 3
+
+
+@pytest.mark.asyncio
+async def test_expiry_without_last_valid_height_is_proven_by_block_height():
+    ep = StandIn(fail=True, climb=60)  # transport errors: maybe sent
+    b = broadcast.Broadcaster([ep], wss_url="ws://127.0.0.1:9")
+    with pytest.raises(broadcast.TxExpired):
+        await b.submit(b"tx", "SIG6")
+    await b.close()
+
+
+@pytest.mark.asyncio
+async def test_deadline_without_proof_is_not_resendable(monkeypatch):
+    monkeypatch.setattr(broadcast.settings, "TX_EXPIRY_SEC", 0.2)
+    b = broadcast.Broadcaster([StandIn()], wss_url="ws://127.0.0.1:9")
+    with pytest.raises(broadcast.TxUnconfirmed) as exc:
+        await b.submit(b"tx", "SIG7")
+    await b.close()
+    assert not isinstance(exc.value, broadcast.RESENDABLE)
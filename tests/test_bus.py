@@ -0,0 +1,85 @@
+import os
+import pathlib
+import sys
+import types
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2]))
+
+for var in [
+    "HELIUS_WSS",
+    "RUGCHECK_KEY",
+    "BIRDEYE_KEY",
+    "BASE_WALLET",
+    "KEYPAIR_PATH",
+    "DB_DSN",
+]:
+    os.environ.setdefault(var, "test")
+os.environ.setdefault("ENV_PATH", "/dev/null")
+
+
+async def _alog(*a, **k):
+    return None
+
+
+sys.modules["pumpfun_sniper.db"] = types.SimpleNamespace(log=_alog)
+from pumpfun_sniper.bus import Bus
+from pumpfun_sniper.evaluator import Evaluator
+
+
+def test_publish_delivers_inline_and_isolates_failures():
+    bus, got = Bus("local"), []
+
+    def bad(obj):
+        raise RuntimeError("boom")
+
+    bus.subscribe("candidate", bad)
+    unsubscribe = bus.subscribe("candidate", got.append)
+    assert bus.publish("candidate", "M1") == 1
+    assert got == ["M1"]
+    unsubscribe()
+    bus.publish("candidate", "M2")
+    assert got == ["M1"]
+    assert bus.stats()["errors"] == 2
+
+
+@pytest.mark.asyncio
+async def test_candidate_is_queued_on_publish():
+    async def step(job):
+        return None
+
+    engine = Evaluator(step)
+    bus = Bus("local")
+    bus.subscribe("candidate", lambda mint: engine.submit(mint, mint, delay=15))
+    bus.publish("candidate", "MINT")
+    assert engine.stats()["in_flight"] == 1  # no poll needed
+    bus.publish("candidate", "MINT")  # duplicate handoff is deduplicated
+    assert engine.stats()["in_flight"] == 1
+
+
+@pytest.mark.asyncio
+async def test_remote_notifications_load_and_skip_own():
+    bus, got, loads = Bus("postgres"), [], []
+
+    async def load(key):
+        loads.append(key)
+        return None if key == "GONE" else {"mint": key}
+
+    bus.subscribe("candidate", got.append, load)
+    bus.subscribe("candidate", lambda obj: None)  # local-only subscriber
+    await bus._deliver_remote("candidate", f"{bus.origin}:MINE")
+    await bus._deliver_remote("candidate", "other:M1")
+    await bus._deliver_remote("candidate", "other:GONE")
+    assert loads == ["M1", "GONE"]
+    assert got == [{"mint": "M1"}]
+    assert bus.stats()["remote"] == 2
+
+
+@pytest.mark.asyncio
+async def test_journal_is_noop_without_postgres():
+    class Session:
+        async def execute(self, *a, **k):
+            raise AssertionError("no NOTIFY on the local backend")
+
+    await Bus("local").journal(Session(), "candidate", "M")
+    await Bus("local").listen()  # returns immediately
@@ -0,0 +1,112 @@
+import asyncio
+import os
+import pathlib
+import sys
+
+import httpx
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2]))
+
+for var in [
+    "HELIUS_WSS",
+    "RUGCHECK_KEY",
+    "BIRDEYE_KEY",
+    "BASE_WALLET",
+    "KEYPAIR_PATH",
+    "DB_DSN",
+]:
+    os.environ.setdefault(var, "test")
+os.environ.setdefault("ENV_PATH", "/dev/null")
+
+from pumpfun_sniper import birdeye, clients
+
+_AsyncClient = httpx.AsyncClient
+
+
+@pytest.fixture
+def mock(monkeypatch):
+    """Route every pooled client through one MockTransport handler."""
+    state = {"handler": lambda req: httpx.Response(200), "created": 0}
+
+    async def handle(req):
+        r = state["handler"](req)
+        return await r if asyncio.iscoroutine(r) else r
+
+    def make(**kw):
+        state["created"] += 1
+        return _AsyncClient(transport=httpx.MockTransport(handle))
+
+    monkeypatch.setattr(clients.httpx, "AsyncClient", make)
+    monkeypatch.setattr(clients, "_clients", {})
+    monkeypatch.setattr(clients, "_stats", {})
+    return state
+
+
+@pytest.mark.asyncio
+async def test_one_client_per_origin(mock):
+    a = clients.client("https://api.example.com/v1/quote?x=1")
+    assert clients.client("https://api.example.com/v6/swap") is a
+    b = clients.client("https://api.example.com:8443/v1")
+    c = clients.client("http://api.example.com/v1")
+    assert len({id(a), id(b), id(c)}) == 3 and mock["created"] == 3
+
+    await clients.aclose_all()
+    assert a.is_closed and b.is_closed and not clients._clients
+    fresh = clients.client("https://api.example.com/v1")
+    assert fresh is not a and not fresh.is_closed
+    await clients.aclose_all()
+
+
+@pytest.mark.asyncio
+async def test_stats_count_requests_errors_and_in_flight(mock):
+    gate = asyncio.Event()
+
+    async def slow(req):
+        if req.url.path == "/down":
+            raise httpx.ConnectError("refused", request=req)
+        await gate.wait()
+        return httpx.Response(500 if req.url.path == "/boom" else 200)
+
+    mock["handler"] = slow
+    url = "https://rpc.example.com"
+    calls = [
+        asyncio.create_task(clients.get(f"{url}/ok")),
+        asyncio.create_task(clients.post(f"{url}/ok", json={})),
+        asyncio.create_task(clients.get(f"{url}/boom")),
+    ]
+    await asyncio.sleep(0.01)
+    assert clients.stats()[url]["in_flight"] == 3
+    gate.set()
+    codes = [r.status_code for r in await asyncio.gather(*calls)]
+    with pytest.raises(httpx.ConnectError):
+        await clients.get(f"{url}/down")
+
+    st = clients.stats()[url]
+    assert codes == [200, 200, 500]
+    assert st["requests"] == 4 and st["errors"] == 1  # a 5xx is not an error here
+    assert st["in_flight"] == 0 and st["peak_in_flight"] == 3
+    assert st["max_ms"] >= st["last_ms"] >= 0 and st["avg_ms"] > 0
+    await clients.aclose_all()
+    assert clients.stats()[url]["connections"] == 0  # closed clients drop out
+
+
+@pytest.mark.asyncio
+async def test_birdeye_prices_are_in_lamports_per_base_unit(mock):
+    usd = {birdeye._SOL: 200.0, "M": 0.002}  # "N" has no Birdeye price
+    asked = []
+
+    def handler(req):
+        mints = req.url.params.get_list("address")
+        asked.append(mints)
+        data = [{"address": m, "price_usd": usd[m]} for m in mints if m in usd]
+        return httpx.Response(200, json={"data": data})
+
+    mock["handler"] = handler
+    prices = await birdeye.get_prices(["M", "N"])
+    assert asked == [["M", "N", birdeye._SOL]]  # SOL rides in the same call
+    # 0.002 USD / 200 USD per SOL = 1e-5 SOL per token = 1e4 lamports per 1e6 units
+    assert prices == {"M": pytest.approx(0.01)}
+    usd.pop(birdeye._SOL)
+    assert await birdeye.get_prices(["M"]) == {}  # no SOL price, no conversion
+    await clients.aclose_all()
@@ -0,0 +1,46 @@
+import datetime as dt
+
+import httpx
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_split_dashboard_reads_positions_from_the_db(db):
+    from pumpfun_sniper.dashboard import app
+
+    async with db.session_ctx() as s:
+        for i in range(2):  # opened by an executor in another process
+            s.add(
+                db.OpenPos(
+                    mint=f"m{i}",
+                    qty=1,
+                    avg_price=1,
+                    cost=1,
+                    stop_price=0.8,
+                    take_profit=2,
+                    opened_at=dt.datetime(2026, 1, 1),
+                )
+            )
+        await s.commit()
+    app.state.roles = {"dashboard"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+        metrics = (await c.get("/metrics")).text
+        positions = (await c.get("/api/positions")).json()
+
+    assert "sniper_open_positions 2" in metrics.splitlines()
+    assert "sniper_rugcheck_queued" not in metrics  # evaluator elsewhere
+    assert positions == {"positions": 2}
+
+
+@pytest.mark.asyncio
+async def test_malformed_history_cursor_is_a_bad_request(db):
+    from pumpfun_sniper.dashboard import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+        for stream, before in [("logs", "x"), ("candidates", "yesterday|m1")]:
+            r = await c.get(f"/api/history/{stream}", params={"before": before})
+            assert r.status_code == 400 and "bad history cursor" in r.text
+        ok = await c.get("/api/history/logs", params={"before": "10"})
+        assert ok.status_code == 200 and ok.json() == {"rows": [], "next": None}
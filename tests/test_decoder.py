@@ -0,0 +1,79 @@
+import base64
+import json
+import os
+import pathlib
+import struct
+import sys
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2]))
+
+for var in [
+    "HELIUS_WSS",
+    "RUGCHECK_KEY",
+    "BIRDEYE_KEY",
+    "BASE_WALLET",
+    "KEYPAIR_PATH",
+    "DB_DSN",
+]:
+    os.environ.setdefault(var, "test")
+os.environ.setdefault("ENV_PATH", "/dev/null")
+
+import pumpfun_sniper.decoder as decoder
+from solders.pubkey import Pubkey
+
+MINT, CURVE, USER = (Pubkey.new_unique() for _ in range(3))
+
+
+def _borsh(s: str) -> bytes:
+    b = s.encode()
+    return struct.pack("<I", len(b)) + b
+
+
+def _frame(logs):
+    value = {"signature": "sig1", "err": None, "logs": logs}
+    return json.dumps(
+        {
+            "jsonrpc": "2.0",
+            "method": "logsNotification",
+            "params": {"result": {"value": value}},
+        }
+    )
+
+
+CREATE = (
+    decoder.CREATE_DISCRIMINATOR
+    + _borsh("Doge Moon")
+    + _borsh("DMOON")
+    + _borsh("https://ipfs.io/x")
+    + bytes(MINT)
+    + bytes(CURVE)
+    + bytes(USER)
+)
+
+
+def test_decode_create_event():
+    ev = decoder.decode_create(CREATE)
+    assert (ev.name, ev.symbol, ev.uri) == ("Doge Moon", "DMOON", "https://ipfs.io/x")
+    assert ev.mint == str(MINT) and ev.creator == str(USER)
+    assert ev.bonding_curve == str(CURVE)
+
+
+def test_prefilter_and_find_create():
+    create = _frame(
+        [
+            "Program log: Instruction: Create",
+            "Program data: " + base64.b64encode(CREATE).decode(),
+        ]
+    )
+    trade = _frame(["Program log: Instruction: Buy", "Program data: AAAA"])
+    assert decoder.is_create(create) and decoder.is_create(create.encode())
+    assert not decoder.is_create(trade)
+    ev = decoder.find_create(decoder.parse(create)["logs"])
+    assert ev.mint == str(MINT)
+    assert decoder.find_create(decoder.parse(trade)["logs"]) is None
+
+
+def test_truncated_create_rejected():
+    with pytest.raises(ValueError):
+        decoder.decode_create(CREATE[:-10])
@@ -0,0 +1,94 @@
+import asyncio
+import json
+import types
+import os
+import pathlib
+import sys
+import pytest
+import websockets
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2]))
+
+for var in [
+    "HELIUS_WSS",
+    "RUGCHECK_KEY",
+    "BIRDEYE_KEY",
+    "BASE_WALLET",
+    "KEYPAIR_PATH",
+    "DB_DSN",
+]:
+    os.environ.setdefault(var, "test")
+os.environ.setdefault("ENV_PATH", "/dev/null")
+
+
+async def _alog(*a, **k):
+    return None
+
+
+sys.modules["pumpfun_sniper.db"] = types.SimpleNamespace(log=_alog)
+import pumpfun_sniper.discovery as discovery
+
+
+def _frame(sig):
+    value = {"signature": sig, "logs": []}
+    return json.dumps(
+        {"method": "logsNotification", "params": {"result": {"value": value}}}
+    )
+
+
+def _server(delay, drop_after=None):
+    async def handler(ws):
+        await ws.recv()  # logsSubscribe
+        await ws.send(json.dumps({"jsonrpc": "2.0", "id": 1, "result": 5}))
+        for i in range(3):
+            await asyncio.sleep(delay)
+            await ws.send(_frame(f"sig{i}"))
+            if drop_after is not None and i == drop_after:
+                return  # connection drops; client must reconnect
+        await asyncio.sleep(0.7)
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_first_copy_wins_and_duplicates_are_dropped():
+    got = []
+
+    async def handler(raw):
+        got.append(discovery.signature(raw))
+
+    async with websockets.serve(
+        _server(0.01), "127.0.0.1", 0
+    ) as fast, websockets.serve(_server(0.05, drop_after=0), "127.0.0.1", 0) as slow:
+        urls = [f"ws://127.0.0.1:{s.sockets[0].getsockname()[1]}" for s in (fast, slow)]
+        sup = discovery.Discovery(handler, urls=urls)
+        task = asyncio.create_task(sup.run())
+        await asyncio.sleep(0.6)
+        task.cancel()
+
+    assert got == ["sig0", "sig1", "sig2"]
+    fast_st, slow_st = sup.report()
+    assert fast_st["win_rate"] == 1.0
+    assert slow_st["frames"] >= 1 and slow_st["win_rate"] == 0.0
+    assert slow_st["lag_avg_ms"] > 0
+    assert slow_st["reconnects"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_frames_are_buffered_until_a_handler_is_attached():
+    got = []
+
+    async def handler(raw):
+        got.append(discovery.signature(raw))
+
+    async with websockets.serve(_server(0.01), "127.0.0.1", 0) as srv:
+        url = f"ws://127.0.0.1:{srv.sockets[0].getsockname()[1]}"
+        sup = discovery.Discovery(urls=[url])  # subscribes before start-up ends
+        task = asyncio.create_task(sup.run())
+        await asyncio.sleep(0.2)
+        assert got == [] and sup.report()[0]["frames"] == 3
+        sup.attach(handler)
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+    assert got == ["sig0", "sig1", "sig2"]
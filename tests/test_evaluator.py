@@ -0,0 +1,65 @@
+import asyncio
+import types
+import os
+import pathlib
+import sys
+import time
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2]))
+
+for var in [
+    "HELIUS_WSS",
+    "RUGCHECK_KEY",
+    "BIRDEYE_KEY",
+    "BASE_WALLET",
+    "KEYPAIR_PATH",
+    "DB_DSN",
+]:
+    os.environ.setdefault(var, "test")
+os.environ.setdefault("ENV_PATH", "/dev/null")
+
+
+async def _alog(*a, **k):
+    return None
+
+
+sys.modules["pumpfun_sniper.db"] = types.SimpleNamespace(log=_alog)
+import pumpfun_sniper.evaluator as evaluator
+
+
+@pytest.mark.asyncio
+async def test_steps_run_concurrently():
+    async def step(job):
+        await asyncio.sleep(0.2)
+        return None
+
+    engine = evaluator.Evaluator(step, workers=5)
+    task = asyncio.create_task(engine.run())
+    t0 = time.monotonic()
+    for i in range(5):
+        assert engine.submit(f"mint{i}", None)
+    while engine.stats()["in_flight"]:
+        await asyncio.sleep(0.01)
+    task.cancel()
+    assert time.monotonic() - t0 < 0.5
+
+
+@pytest.mark.asyncio
+async def test_dedupe_and_reschedule_order():
+    order = []
+
+    async def step(job):
+        order.append((job.key, job.steps))
+        return 0.05 if job.steps < 2 else None
+
+    engine = evaluator.Evaluator(step, workers=1)
+    task = asyncio.create_task(engine.run())
+    assert engine.submit("late", None, delay=0.12)
+    assert engine.submit("early", None)
+    assert not engine.submit("early", None)  # already in flight
+    assert engine.stats()["in_flight"] == 2
+    while engine.stats()["in_flight"]:
+        await asyncio.sleep(0.01)
+    task.cancel()
+    assert order == [("early", 1), ("early", 2), ("late", 1), ("late", 2)]
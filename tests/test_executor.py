@@ -0,0 +1,119 @@
+import datetime as dt
+import os
+import pathlib
+import sys
+import types
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2]))
+
+for var in [
+    "HELIUS_WSS",
+    "RUGCHECK_KEY",
+    "BIRDEYE_KEY",
+    "BASE_WALLET",
+    "KEYPAIR_PATH",
+    "DB_DSN",
+]:
+    os.environ.setdefault(var, "test")
+os.environ.setdefault("ENV_PATH", "/dev/null")
+
+logged = []
+
+
+async def _alog(level, msg, *a, **k):
+    logged.append((level, msg))
+
+
+sys.modules["pumpfun_sniper.db"] = types.SimpleNamespace(
+    log=_alog, session_ctx=None, OpenPos=None, ClosedPos=None
+)
+import pumpfun_sniper.executor as executor
+from pumpfun_sniper.positions import Position, PositionBook
+from pumpfun_sniper.pricefeed import PriceEngine
+
+NOW = dt.datetime(2026, 1, 1)
+
+
+@pytest.fixture
+def book(monkeypatch):
+    b = PositionBook()
+    monkeypatch.setattr(executor, "book", b)
+    monkeypatch.setattr(executor, "prices", PriceEngine())  # no stream prices
+    monkeypatch.setattr(executor, "log", _alog)
+    closed = []
+
+    async def close(p, exit_price):
+        closed.append(p.mint)
+        b.remove(p.mint)
+
+    async def no_curve(mints):
+        return {}
+
+    monkeypatch.setattr(executor, "_close", close)
+    monkeypatch.setattr(executor, "bonding_pcts", no_curve)
+    b.closed = closed
+    return b
+
+
+def _failing_sell(calls, failures=1):
+    async def sell(mint, qty, urgency="entry", wallet=None):
+        calls.append(mint)
+        if len(calls) <= failures:
+            raise TimeoutError("rpc timed out")
+        return "sig"
+
+    return sell
+
+
+@pytest.mark.asyncio
+async def test_failed_exit_is_retried_on_the_next_tick(book, monkeypatch):
+    calls = []
+
+    async def birdeye(mints):
+        return {m: 0.5 for m in mints}  # below the 0.65 stop
+
+    monkeypatch.setattr(executor, "get_prices", birdeye)
+    monkeypatch.setattr(executor, "sell", _failing_sell(calls))
+    book.add(Position("M", 10.0, 1.0, 0.01, 0.65, 3.0, NOW))
+
+    assert await executor.tick() == 1  # sell failed: logged, still held
+    assert book.closed == [] and not book.exiting[book.slot["M"]]
+    assert any(level == "ERROR" and "M" in msg for level, msg in logged)
+
+    assert await executor.tick() == 0
+    assert calls == ["M", "M"] and book.closed == ["M"]
+
+
+@pytest.mark.asyncio
+async def test_failed_streamed_exit_does_not_leak_an_exception(book, monkeypatch):
+    calls = []
+    monkeypatch.setattr(executor, "sell", _failing_sell(calls))
+    book.add(Position("M", 10.0, 1.0, 0.01, 0.65, 3.0, NOW))
+
+    executor.on_price("M", 0.5)
+    (task,) = executor._exit_tasks
+    await executor.drain()
+    assert task.exception() is None and calls == ["M"]
+    assert "M" in book and not book.exiting[book.slot["M"]]
+
+
+@pytest.mark.asyncio
+async def test_birdeye_prices_only_mints_without_a_stream_price(book, monkeypatch):
+    asked = []
+
+    async def birdeye(mints):
+        asked.append(sorted(mints))
+        return {m: 1.0 for m in mints}
+
+    streamed = {"A": 1.1}
+    monkeypatch.setattr(executor, "get_prices", birdeye)
+    monkeypatch.setattr(executor.prices, "price", streamed.get)
+    for m in ("A", "B"):
+        book.add(Position(m, 10.0, 1.0, 0.01, 0.65, 3.0, NOW))
+
+    await executor.tick()
+    assert asked == [["B"]]  # A is priced by the trade stream
+    streamed.clear()  # stream stalled: `price` returns None for everything
+    await executor.tick()
+    assert asked == [["B"], ["A", "B"]]
@@ -0,0 +1,107 @@
+import asyncio
+import os
+import pathlib
+import sys
+import tempfile
+import types
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2]))
+
+for var in [
+    "HELIUS_WSS",
+    "RUGCHECK_KEY",
+    "BIRDEYE_KEY",
+    "BASE_WALLET",
+    "KEYPAIR_PATH",
+    "DB_DSN",
+]:
+    os.environ.setdefault(var, "test")
+os.environ.setdefault("ENV_PATH", "/dev/null")
+
+
+async def _alog(*a, **k):
+    return None
+
+
+sys.modules["pumpfun_sniper.db"] = types.SimpleNamespace(log=_alog)
+from pumpfun_sniper.bus import Bus
+from pumpfun_sniper.config import settings
+from pumpfun_sniper.ipc import Broker
+from pumpfun_sniper.launcher import ROLES, Supervisor, parse_groups
+
+
+@pytest.fixture
+def sock(monkeypatch):
+    path = os.path.join(tempfile.mkdtemp(), "ipc.sock")  # short: AF_UNIX limit
+    monkeypatch.setattr(settings, "IPC_SOCKET", path)
+    return path
+
+
+def test_parse_groups():
+    assert parse_groups("") == [ROLES]
+    assert parse_groups(split=True) == [(r,) for r in ROLES]
+    assert parse_groups("watcher+evaluator, executor,dashboard") == [
+        ("watcher", "evaluator"),
+        ("executor",),
+        ("dashboard",),
+    ]
+    with pytest.raises(ValueError):
+        parse_groups("watcher,sniper")
+    with pytest.raises(ValueError):
+        parse_groups("watcher,watcher+executor")
+
+
+async def _until(cond, timeout=2.0):
+    async with asyncio.timeout(timeout):
+        while not cond():
+            await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_ipc_bus_delivers_keys_to_other_processes(sock):
+    broker = Broker(sock)
+    await broker.start()
+    a, b = Bus("ipc"), Bus("ipc")
+    got_a, got_b = [], []
+
+    async def load(key):
+        return None if key == "GONE" else {"mint": key}
+
+    a.subscribe("position", got_a.append, load)
+    b.subscribe("position", got_b.append, load)
+    tasks = [asyncio.create_task(x.listen()) for x in (a, b)]
+    try:
+        await _until(lambda: broker.clients == 2)
+        a.publish("position", {"mint": "M1"}, key="M1")
+        a.publish("position", {"mint": "GONE"}, key="GONE")
+        a.publish("position", {"mint": "LOCAL"})  # no key: local only
+        await _until(lambda: b.stats()["remote"] == 2)
+        assert got_b == [{"mint": "M1"}]
+        assert got_a == [{"mint": "M1"}, {"mint": "GONE"}, {"mint": "LOCAL"}]
+        assert a.stats()["remote"] == 0  # no echo back to the sender
+    finally:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await broker.close()
+    assert not os.path.exists(sock)
+
+
+@pytest.mark.asyncio
+async def test_supervisor_restarts_crashed_role(sock, monkeypatch):
+    monkeypatch.setattr(settings, "SUPERVISOR_BACKOFF_MAX_SEC", 0.05)
+    crash = [sys.executable, "-c", "import sys; sys.exit(3)"]
+    serve = [sys.executable, "-c", "import time; time.sleep(60)"]
+    sup = Supervisor(
+        [("watcher",), ("executor",)],
+        command=lambda g: crash if g == ("watcher",) else serve,
+    )
+    await sup.start()
+    try:
+        await _until(lambda: sup.restarts["watcher"] >= 3, timeout=10)
+        assert sup.restarts["executor"] == 0
+        assert sup.stats()["roles"]["executor"]["running"]
+    finally:
+        await sup.stop(timeout=5)
+    assert all(p.returncode is not None for p in sup.procs.values())
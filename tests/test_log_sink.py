@@ -0,0 +1,78 @@
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import select
+
+
+@pytest.fixture
+def sink(db, monkeypatch):
+    """`make(overflow)` → a `LogSink` with a queue of 10 and a reader of
+    the (level, msg) rows it wrote."""
+    from pumpfun_sniper.config import settings
+
+    monkeypatch.setattr(settings, "LOG_QUEUE_SIZE", 10)
+    monkeypatch.setattr(settings, "LOG_FLUSH_SEC", 0.02)
+    monkeypatch.setattr(settings, "LOG_SAMPLE_EVERY", 3)
+
+    async def stored():
+        async with db.session_ctx() as s:
+            rows = await s.execute(
+                select(db.LogEntry.level, db.LogEntry.msg)
+                .where(db.LogEntry.msg.like("t %"))
+                .order_by(db.LogEntry.id)
+            )
+            return [tuple(r) for r in rows]
+
+    def make(overflow):
+        monkeypatch.setattr(settings, "LOG_OVERFLOW", overflow)
+        return db.LogSink(), stored
+
+    return make
+
+
+async def _put_all(sink, levels):
+    await asyncio.gather(*(sink.put(lvl, f"t {i}") for i, lvl in enumerate(levels)))
+    await sink.close()
+
+
+@pytest.mark.asyncio
+async def test_drop_keeps_the_first_lines_that_fit(sink):
+    s, stored = sink("drop")
+    await _put_all(s, ["INFO"] * 25)
+    assert s.written == 10 and s.dropped == 15
+    assert [m for _, m in await stored()] == [f"t {i}" for i in range(10)]
+
+
+@pytest.mark.asyncio
+async def test_sample_keeps_every_third_line_and_all_errors(sink):
+    s, stored = sink("sample")
+    # half full after 5 rows: then 1 in 3, ERRORs always
+    await _put_all(s, ["INFO"] * 14 + ["ERROR"])
+    rows = await stored()
+    assert [m for _, m in rows] == [f"t {i}" for i in (0, 1, 2, 3, 4, 7, 10, 13, 14)]
+    assert rows[-1][0] == "ERROR"
+    assert s.written == 9 and s.dropped == 6
+
+
+@pytest.mark.asyncio
+async def test_block_makes_callers_wait_for_room(sink):
+    s, stored = sink("block")
+    await _put_all(s, ["INFO"] * 25)
+    assert s.written == 25 and s.dropped == 0
+    assert [m for _, m in await stored()] == [f"t {i}" for i in range(25)]
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_without_waiting_for_the_timer(sink, monkeypatch):
+    from pumpfun_sniper.config import settings
+
+    s, stored = sink("drop")
+    monkeypatch.setattr(settings, "LOG_FLUSH_SEC", 60.0)
+    for i in range(3):
+        await s.put("INFO", f"t {i}")
+    await asyncio.sleep(0.05)  # writer is waiting for the flush timer
+    t0 = time.perf_counter()
+    await s.close()
+    assert time.perf_counter() - t0 < 5
+    assert len(await stored()) == 3 and s._task.done()
@@ -0,0 +1,140 @@
+import asyncio
+import os
+import pathlib
+import sys
+import httpx
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2]))
+
+for var in [
+    "HELIUS_WSS",
+    "RUGCHECK_KEY",
+    "BIRDEYE_KEY",
+    "BASE_WALLET",
+    "KEYPAIR_PATH",
+    "DB_DSN",
+]:
+    os.environ.setdefault(var, "test")
+os.environ.setdefault("ENV_PATH", "/dev/null")
+
+from pumpfun_sniper import clients, clock, metrics
+
+
+@pytest.fixture(autouse=True)
+def fresh():
+    metrics.registry.clear()
+    metrics._spans.clear()
+    yield
+    clock.use(clock.SystemClock())
+
+
+def test_histogram_renders_cumulative_buckets():
+    for v in (0.002, 0.002, 0.3, 1000.0):
+        metrics.observe("stage_seconds", v, stage='q"x', side="entry")
+    text = metrics.render()
+    assert "# TYPE sniper_stage_seconds histogram" in text
+    assert (
+        'sniper_stage_seconds_bucket{stage="q\\"x",side="entry",le="0.0025"} 2' in text
+    )
+    assert 'sniper_stage_seconds_bucket{stage="q\\"x",side="entry",le="0.5"} 3' in text
+    assert 'sniper_stage_seconds_bucket{stage="q\\"x",side="entry",le="+Inf"} 4' in text
+    assert 'sniper_stage_seconds_count{stage="q\\"x",side="entry"} 4' in text
+    h = metrics.registry.histograms["stage_seconds"][
+        (("stage", 'q"x'), ("side", "entry"))
+    ]
+    assert h.quantile(0.5) == 0.0025
+    assert h.quantile(1.0) is None  # beyond the last finite bucket
+
+
+def test_timer_uses_trade_context_and_counts_errors():
+    with metrics.trade("MINT", "exit"):
+        with metrics.timer("quote"):
+            pass
+        with pytest.raises(ValueError):
+            with metrics.timer("swap_build"):
+                raise ValueError("boom")
+    with metrics.timer("quote"):  # outside a trade: no mint, no side
+        pass
+
+    hists = metrics.registry.histograms["stage_seconds"]
+    assert hists[(("stage", "quote"), ("side", "exit"))].count == 1
+    assert hists[(("stage", "quote"), ("side", ""))].count == 1
+    errors = metrics.registry.counters["stage_errors_total"]
+    assert errors[(("stage", "swap_build"), ("side", "exit"))] == 1
+    assert [e["stage"] for e in metrics.spans("MINT")["events"]] == ["quote"]
+
+
+@pytest.mark.asyncio
+async def test_trade_context_reaches_spawned_tasks():
+    async def inner():
+        with metrics.timer("send"):
+            await asyncio.sleep(0)
+
+    with metrics.trade("MINT", "entry"):
+        await asyncio.get_running_loop().create_task(inner())
+    assert metrics.spans("MINT")["events"][0]["stage"] == "send"
+
+
+def test_marks_measure_time_since_seen():
+    vc = clock.VirtualClock(1000.0)
+    clock.use(vc)
+    metrics.seen("MINT")
+    vc.advance(1015.0)
+    metrics.mark("MINT", "grace_expired")
+    vc.advance(1016.5)
+    metrics.mark("MINT", "bought")
+
+    events = metrics.spans("MINT")["events"]
+    assert [(e["stage"], e["at_sec"]) for e in events] == [
+        ("ws_recv", 0.0),
+        ("grace_expired", 15.0),
+        ("bought", 16.5),
+    ]
+    h = metrics.registry.histograms["since_seen_seconds"][(("event", "bought"),)]
+    assert h.sum == 16.5
+    assert metrics.summary()["since_seen_seconds:bought"]["count"] == 1
+
+
+def test_span_store_is_bounded(monkeypatch):
+    monkeypatch.setattr(metrics.settings, "METRICS_SPAN_MINTS", 3)
+    for i in range(5):
+        metrics.seen(f"M{i}")
+    assert metrics.spans("M0") is None
+    assert metrics.spans("M4") is not None
+
+
+def test_disabled_records_nothing(monkeypatch):
+    monkeypatch.setattr(metrics.settings, "METRICS_ENABLED", False)
+    metrics.inc("frames_total")
+    metrics.seen("MINT")
+    metrics.mark("MINT", "bought")
+    with metrics.timer("quote"):
+        pass
+    assert metrics.render() == "\n"
+    assert metrics.spans("MINT") is None
+
+
+@pytest.mark.asyncio
+async def test_http_status_and_throttling_counted():
+    codes = iter([200, 429, 503])
+    origin = "https://api.example.test"
+    clients._clients[origin] = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda req: httpx.Response(next(codes)))
+    )
+    clients._stats.setdefault(origin, clients.HostStats())
+    try:
+        for _ in range(3):
+            await clients.get(origin + "/x")
+    finally:
+        await clients.aclose_all()
+
+    host = "api.example.test"
+    counters = metrics.registry.counters
+    assert counters["http_requests_total"][(("host", host), ("code", "429"))] == 1
+    assert counters["http_throttled_total"][(("host", host),)] == 1
+    assert counters["http_errors_total"][(("host", host),)] == 1
+    assert (
+        metrics.registry.histograms["http_request_seconds"][(("host", host),)].count
+        == 3
+    )
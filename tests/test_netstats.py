@@ -0,0 +1,107 @@
+import os
+import pathlib
+import sys
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2]))
+
+for var in [
+    "HELIUS_WSS",
+    "RUGCHECK_KEY",
+    "BIRDEYE_KEY",
+    "BASE_WALLET",
+    "KEYPAIR_PATH",
+    "DB_DSN",
+]:
+    os.environ.setdefault(var, "test")
+os.environ.setdefault("ENV_PATH", "/dev/null")
+
+import pumpfun_sniper.netstats as netstats
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.body = body
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.body
+
+
+@pytest.fixture
+def net(monkeypatch):
+    async def fake_get(url, **kw):
+        return FakeResponse(
+            [
+                {
+                    "landed_tips_25th_percentile": 0.00001,
+                    "landed_tips_50th_percentile": 0.00002,
+                    "landed_tips_75th_percentile": 0.0001,
+                    "landed_tips_95th_percentile": 0.001,
+                    "landed_tips_99th_percentile": 0.01,
+                }
+            ]
+        )
+
+    async def fake_post(url, json=None, **kw):
+        results = {
+            "getRecentPrioritizationFees": [
+                {"slot": i, "prioritizationFee": i * 1000} for i in range(101)
+            ],
+            "getLatestBlockhash": {
+                "value": {"blockhash": "HASH", "lastValidBlockHeight": 500}
+            },
+            "getBlockHeight": 350,
+        }
+        return FakeResponse({"result": results[json["method"]]})
+
+    monkeypatch.setattr(netstats.clients, "get", fake_get)
+    monkeypatch.setattr(netstats.clients, "post", fake_post)
+    monkeypatch.setattr(netstats.settings, "TIP_MIN_LAMPORTS", 1_000)
+    monkeypatch.setattr(netstats.settings, "TIP_MAX_LAMPORTS", 5_000_000)
+    return netstats.NetStats()
+
+
+def test_falls_back_to_static_tip_before_sampling(net, monkeypatch):
+    monkeypatch.setattr(netstats.settings, "JITO_TIP_LAMPORTS", 123_456)
+    assert net.tip("entry") == net.tip("exit") == 123_456
+
+
+@pytest.mark.asyncio
+async def test_tips_follow_sampled_percentiles(net):
+    await net.sample()
+    assert net.tip("entry") == 100_000  # p75 landed tip
+    assert net.tip("exit") == 1_000_000  # p95 landed tip
+    assert net.priority_fee("entry") == 75_000
+    assert net.blockhash == "HASH"
+    assert netstats.broadcaster.block_height >= 350
+    with pytest.raises(ValueError):
+        net.tip("whenever")
+
+
+@pytest.mark.asyncio
+async def test_priority_fees_price_the_tip_when_tip_floor_is_down(net, monkeypatch):
+    async def down(url, **kw):
+        raise RuntimeError("tip floor unavailable")
+
+    monkeypatch.setattr(netstats.clients, "get", down)
+    await net.sample()
+    assert net.errors == 1
+    # p75 fee 75_000 µlamports/CU × 200k CU = 15_000 lamports
+    assert net.tip("entry") == 15_000
+
+
+@pytest.mark.asyncio
+async def test_overlapping_fee_polls_count_each_slot_once(net, monkeypatch):
+    polls = [range(101), range(50, 151)]  # the second overlaps 50..100
+
+    async def fees(method, params):
+        return [{"slot": i, "prioritizationFee": i * 1000} for i in polls.pop(0)]
+
+    monkeypatch.setattr(net, "_rpc", fees)
+    await net.sample_fees()
+    await net.sample_fees()
+    assert list(net._fees) == [i * 1000 for i in range(151)]
+    assert net.priority_fee("entry") == 112_500  # p75 of slots 0..150
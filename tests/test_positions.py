@@ -0,0 +1,150 @@
+import datetime as dt
+import math
+import pathlib
+import sys
+import types
+
+import pytest
+from sqlalchemy import event, select
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2]))
+
+
+async def _alog(*a, **k):
+    return None
+
+
+sys.modules["pumpfun_sniper.db"] = types.SimpleNamespace(log=_alog)
+from pumpfun_sniper.positions import Position, PositionBook
+
+NOW = dt.datetime(2026, 1, 1)
+
+
+def _pos(mint, stop=0.65, tp=3.0):
+    return Position(mint, 1000.0, 1.0, 0.01, stop, tp, NOW, wallet=f"W{mint}")
+
+
+def _reference(p: Position, curr: float, trail: float):
+    """The scalar per-position logic the vectorised pass replaces."""
+    stop = max(p.stop_price, curr * (1 - trail / 100))
+    return stop, curr <= stop or curr >= p.take_profit
+
+
+def test_evaluate_matches_scalar_rules():
+    book = PositionBook(capacity=2)  # forces growth
+    prices = {"up": 1.5, "flat": 1.0, "down": 0.5, "moon": 3.2, "none": None}
+    for m in prices:
+        book.add(_pos(m))
+    book.set_prices({m: px for m, px in prices.items() if px})
+
+    exits = dict(book.evaluate(35.0))
+    for m, px in prices.items():
+        p = book.get(m)
+        if px is None:
+            assert p.stop_price == 0.65 and m not in exits
+            continue
+        stop, hit = _reference(_pos(m), px, 35.0)
+        assert math.isclose(p.stop_price, stop)
+        assert (m in exits) == hit
+    assert exits == {"down": 0.5, "moon": 3.2}
+    assert book.get("up").unrealized_pnl == 500.0
+    dirty = {r["mint"] for r in book.take_dirty()}
+    assert dirty == {"up", "moon"}  # only rows whose stop moved
+    assert book.take_dirty() == []
+
+
+def test_exiting_rows_are_skipped_and_stream_path_agrees():
+    book = PositionBook()
+    book.add(_pos("a"))
+    book.add(_pos("b"))
+    book.set_exiting("a", True)
+    book.set_prices({"a": 0.1, "b": 0.1})
+    assert book.evaluate(35.0) == [("b", 0.1)]
+    assert not book.on_price("a", 0.1, 35.0)  # already exiting
+    assert book.on_price("b", 0.2, 35.0)
+    assert not book.on_price("missing", 1.0, 35.0)
+
+
+def test_remove_keeps_slots_consistent():
+    book = PositionBook()
+    for m in "abcd":
+        book.add(_pos(m, stop=0.1 * (ord(m) - 96)))
+    book.set_exiting("d", True)
+    removed = book.remove("b")
+    assert removed.mint == "b" and math.isclose(removed.stop_price, 0.2)
+    assert len(book) == 3 and "b" not in book
+    for m in ("a", "c", "d"):
+        assert book.mints[book.slot[m]] == m
+        assert math.isclose(book.get(m).stop_price, 0.1 * (ord(m) - 96))
+        assert book.get(m).wallet == f"W{m}"
+    assert book.live() == ["a", "c"]  # "d" moved into b's slot, still exiting
+    book.clear()
+    assert len(book) == 0 and book.evaluate(35.0) == []
+
+
+@pytest.mark.asyncio
+async def test_missed_positions_are_journaled_and_reconciled(db, monkeypatch):
+    from solders.pubkey import Pubkey
+    from pumpfun_sniper import executor, positions
+    from pumpfun_sniper.bus import bus
+    from pumpfun_sniper.positions import book
+    from pumpfun_sniper.seen_index import index
+
+    journaled = []
+
+    async def journal(s, topic, key):
+        journaled.append(topic)
+
+    monkeypatch.setattr(bus, "journal", journal)
+    mint = str(Pubkey.new_unique())
+    # opened by an evaluator whose `position` message was lost
+    await positions.insert(Position(mint, 10.0, 1.0, 0.01, 0.6, 3.0, NOW))
+    await index.block_creator("C1")
+    assert journaled == ["position", "creator_blocked"]
+
+    assert await executor.reconcile() == 1 and mint in book
+    assert await executor.reconcile() == 0
+
+
+@pytest.mark.asyncio
+async def test_tick_writes_only_moved_stops_in_one_update(db, monkeypatch):
+    from solders.pubkey import Pubkey
+    from pumpfun_sniper import executor, positions
+    from pumpfun_sniper.config import settings
+    from pumpfun_sniper.positions import book
+
+    updates = []
+
+    def seen(conn, cursor, statement, params, context, executemany):
+        if statement.startswith("UPDATE open_positions"):
+            updates.append(len(params) if executemany else 1)
+
+    event.listen(db.engine.sync_engine, "before_cursor_execute", seen)
+    monkeypatch.setattr(settings, "TRAIL_STOP_PCT", 35.0)
+    mints = {name: str(Pubkey.new_unique()) for name in ("up", "flat", "more")}
+    for m in mints.values():
+        await positions.insert(Position(m, 10.0, 1.0, 0.01, 0.65, 3.0, NOW))
+    await book.load()
+    px = {mints["up"]: 1.5, mints["flat"]: 1.0, mints["more"]: 1.2}
+
+    async def get_prices(ms):
+        return {m: px[m] for m in ms}
+
+    async def no_curve(ms):
+        return {}
+
+    monkeypatch.setattr(executor, "get_prices", get_prices)
+    monkeypatch.setattr(executor, "bonding_pcts", no_curve)
+    await executor.tick()
+    assert await book.flush() == 2 and await book.flush() == 0
+    assert updates == [2]  # one executemany for the two moved rows
+
+    async with db.session_ctx() as s:
+        stops = dict(
+            (await s.execute(select(db.OpenPos.mint, db.OpenPos.stop_price))).all()
+        )
+    assert {k: round(stops[m], 6) for k, m in mints.items()} == {
+        "up": 0.975,
+        "flat": 0.65,
+        "more": 0.78,
+    }
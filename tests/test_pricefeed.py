@@ -0,0 +1,82 @@
+import base64
+import os
+import pathlib
+import sys
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2]))
+
+for var in [
+    "HELIUS_WSS",
+    "RUGCHECK_KEY",
+    "BIRDEYE_KEY",
+    "BASE_WALLET",
+    "KEYPAIR_PATH",
+    "DB_DSN",
+]:
+    os.environ.setdefault(var, "test")
+os.environ.setdefault("ENV_PATH", "/dev/null")
+
+import pytest
+from solders.pubkey import Pubkey
+
+import pumpfun_sniper.clock as clock
+from pumpfun_sniper import pricefeed
+
+HELD = str(Pubkey.new_unique())
+OTHER = str(Pubkey.new_unique())
+
+
+def _trade(mint, sol, tokens, v_sol, v_tok):
+    data = pricefeed._TRADE.pack(
+        pricefeed.TRADE_DISCRIMINATOR,
+        bytes(Pubkey.from_string(mint)),
+        sol,
+        tokens,
+        True,
+        bytes(32),
+        0,
+        v_sol,
+        v_tok,
+    )
+    return "Program data: " + base64.b64encode(data).decode()
+
+
+@pytest.fixture
+def vc():
+    vc = clock.VirtualClock(1000.0)
+    clock.use(vc)
+    yield vc
+    clock.use(clock.SystemClock())
+
+
+def test_trades_price_held_mints_and_notify(vc):
+    feed = pricefeed.PriceEngine()
+    heard = []
+    feed.listen(lambda mint, px: heard.append((mint, px)))
+    feed.track(HELD)
+    feed.on_logs(
+        [
+            "Program log: Instruction: Buy",
+            _trade(HELD, 100, 10, 3_000, 1_000),
+            _trade(OTHER, 100, 10, 9_000, 1_000),  # not held: ignored
+            _trade(HELD, 300, 10, 4_000, 1_000),
+        ]
+    )
+    assert feed.price(HELD) == 4.0 and feed.price(OTHER) is None
+    assert feed.vwap(HELD) == 20.0  # 400 lamports over 20 tokens
+    assert heard == [(HELD, 3.0), (HELD, 4.0)] and feed.trades == 2
+    feed.untrack(HELD)
+    assert feed.price(HELD) is None and not feed.tracking
+
+
+def test_stalled_stream_hands_pricing_back_to_birdeye(vc, monkeypatch):
+    monkeypatch.setattr(pricefeed.settings, "PRICE_STALE_SEC", 5.0)
+    feed = pricefeed.PriceEngine()
+    feed.track(HELD)
+    feed.on_logs([_trade(HELD, 1, 1, 2_000, 1_000)])
+    vc.advance(1004.0)
+    assert feed.price(HELD) == 2.0 and not feed.stalled()
+    vc.advance(1006.0)  # no frame for longer than PRICE_STALE_SEC
+    assert feed.stalled() and feed.price(HELD) is None
+    feed.touch()  # any frame (even without trades) revives the stream
+    assert feed.price(HELD) == 2.0
@@ -0,0 +1,145 @@
+import asyncio
+import base64
+import types
+import os
+import pathlib
+import sys
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2]))
+
+for var in [
+    "HELIUS_WSS",
+    "RUGCHECK_KEY",
+    "BIRDEYE_KEY",
+    "BASE_WALLET",
+    "KEYPAIR_PATH",
+    "DB_DSN",
+]:
+    os.environ.setdefault(var, "test")
+os.environ.setdefault("ENV_PATH", "/dev/null")
+
+
+async def _alog(*a, **k):
+    return None
+
+
+sys.modules["pumpfun_sniper.db"] = types.SimpleNamespace(log=_alog)
+import pumpfun_sniper.jupiter as jupiter
+import pumpfun_sniper.quotecache as quotecache
+from pumpfun_sniper import pricefeed
+from solders.pubkey import Pubkey
+
+MINT = "So11111111111111111111111111111111111111112"
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(quotecache.settings, "QUOTE_REFRESH_SEC", 0.01)
+    monkeypatch.setattr(quotecache.settings, "QUOTE_TTL_SEC", 1.0)
+    monkeypatch.setattr(quotecache.settings, "QUOTE_MAX_DRIFT_BPS", 50.0)
+    monkeypatch.setattr(quotecache.settings, "BUY_SIZE_SOL", 1.0)
+
+    async def fake_quote(inp, out, amt):
+        return {"outAmount": 1000}
+
+    monkeypatch.setattr(jupiter, "_quote", fake_quote)
+    return quotecache.QuoteCache()
+
+
+@pytest.mark.asyncio
+async def test_fresh_route_is_served_then_drift_invalidates(cache, monkeypatch):
+    assert cache.take(MINT) is None  # nothing warmed yet
+    monkeypatch.setattr(quotecache.prices, "price", lambda mint: 1e6)
+    cache.warm(MINT)
+    await asyncio.sleep(0.015)
+    route, tx, wallet = cache.take(MINT)
+    assert route["outAmount"] == 1000 and tx is None and wallet is None
+    # the trade stream says the price doubled since the route was quoted
+    monkeypatch.setattr(quotecache.prices, "price", lambda mint: 2e6)
+    assert cache.take(MINT) is None
+    assert cache.stats()["drifted"] >= 1
+    cache.drop(MINT)
+    assert cache.stats()["warming"] == 0
+
+
+def _trade(mint, v_sol, v_tok):
+    data = pricefeed._TRADE.pack(
+        pricefeed.TRADE_DISCRIMINATOR,
+        bytes(Pubkey.from_string(mint)),
+        1,
+        1,
+        True,
+        bytes(32),
+        0,
+        v_sol,
+        v_tok,
+    )
+    return ["Program data: " + base64.b64encode(data).decode()]
+
+
+@pytest.mark.asyncio
+async def test_warm_mint_is_priced_from_the_trade_stream(cache, monkeypatch):
+    feed = pricefeed.PriceEngine()
+    monkeypatch.setattr(quotecache, "prices", feed)
+    heard = []
+    feed.listen(lambda mint, px: heard.append(mint))
+    cache.warm(MINT)
+    # the route pays 1e6 per unit: 2% above spot (the 1% fee plus impact)
+    feed.on_logs(_trade(MINT, 980_000, 1))
+    await asyncio.sleep(0.015)
+    assert cache.take(MINT) is not None  # no stream move since the quote
+    feed.on_logs(_trade(MINT, 982_000, 1))  # ~20 bps move: still served
+    assert cache.take(MINT) is not None
+    feed.on_logs(_trade(MINT, 2_000_000, 1))  # doubled on the stream
+    assert cache.take(MINT) is None and cache.drifted == 1
+    assert heard == []  # exits only listen to held mints
+    cache.drop(MINT)
+    assert feed.price(MINT) is None and not feed.tracking
+
+
+@pytest.mark.asyncio
+async def test_prebuilt_tx_is_handed_out_with_its_wallet(cache, monkeypatch):
+    monkeypatch.setattr(quotecache.settings, "QUOTE_PREBUILD_TX", True)
+    monkeypatch.setattr(quotecache.settings, "SIMULATION", False)
+    picks, payers = [], []
+
+    def pick(mint, sol=0.0):
+        picks.append(mint)
+        return f"wallet-{len(picks)}"  # a rotating pick would differ each call
+
+    async def fake_swap_tx(route, urgency="entry", wallet=None):
+        payers.append(wallet)
+        return b"tx", None
+
+    monkeypatch.setattr(quotecache.pool, "pick", pick)
+    monkeypatch.setattr(jupiter, "_swap_tx", fake_swap_tx)
+    cache.warm(MINT)
+    await asyncio.sleep(0.035)  # several refreshes
+    route, tx, wallet = cache.take(MINT)
+    assert tx == (b"tx", None) and wallet == "wallet-1"
+    assert picks == [MINT] and set(payers) == {"wallet-1"} and len(payers) > 1
+    cache.drop(MINT)
+
+
+@pytest.mark.asyncio
+async def test_stale_route_is_not_served(cache, monkeypatch):
+    cache.warm(MINT)
+    await asyncio.sleep(0.005)
+    cache.drop(MINT)
+    cache._entries[MINT] = entry = quotecache.Prefetch(int(1e9), 0.0)
+    entry.route, entry.fetched = {"outAmount": 1000}, 0.0
+    assert cache.take(MINT) is None
+    assert cache.stale == 1
+
+
+@pytest.mark.asyncio
+async def test_buy_uses_prefetched_route(monkeypatch):
+    monkeypatch.setattr(jupiter.settings, "SIMULATION", True)
+
+    async def no_quote(*a):
+        raise AssertionError("quote should have been prefetched")
+
+    monkeypatch.setattr(jupiter, "_quote", no_quote)
+    price, sig = await jupiter.buy(1.0, "mint", {"outAmount": 500})
+    assert sig == "SIMULATED" and price == 1e9 / 500
@@ -0,0 +1,115 @@
+import gzip
+import json
+import os
+import pathlib
+import subprocess
+import sys
+import types
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2]))
+
+for var in [
+    "HELIUS_WSS",
+    "RUGCHECK_KEY",
+    "BIRDEYE_KEY",
+    "BASE_WALLET",
+    "KEYPAIR_PATH",
+    "DB_DSN",
+]:
+    os.environ.setdefault(var, "test")
+os.environ.setdefault("ENV_PATH", "/dev/null")
+
+
+async def _alog(*a, **k):
+    return None
+
+
+sys.modules["pumpfun_sniper.db"] = types.SimpleNamespace(log=_alog)
+import pumpfun_sniper.clock as clock
+import pumpfun_sniper.evaluator as evaluator
+import pumpfun_sniper.recorder as recorder
+
+
+def test_recording_round_trip_survives_truncated_tail(tmp_path):
+    path = str(tmp_path / "rec.jsonl.gz")
+    rec = recorder.Recorder(path)
+    rec.frame(b'{"x": 1}')
+    rec.record("rug", {"mint": "M", "report": {}}, ts=5.0)
+    rec.close()
+    rec.record("price", {"M": 1.5}, ts=6.0)  # second run appends a new member
+    rec.close()
+    with open(path, "ab") as fh:
+        fh.write(gzip.compress(b'[7.0,"frame","cut')[:-9])  # crash mid-write
+    events = list(recorder.read(path))
+    assert [k for _, k, _ in events] == ["frame", "rug", "price"]
+    assert events[1] == (5.0, "rug", {"mint": "M", "report": {}})
+
+
+@pytest.mark.asyncio
+async def test_run_due_steps_jobs_on_virtual_time():
+    ran = []
+
+    async def step(job):
+        ran.append((job.key, clock.monotonic()))
+        return 10.0 if job.steps < 2 else None
+
+    vc = clock.VirtualClock(1000.0)
+    clock.use(vc)
+    try:
+        engine = evaluator.Evaluator(step)
+        engine.submit("b", None, delay=5)
+        engine.submit("a", None, delay=1)
+        while (due := engine.next_due()) is not None:
+            vc.advance(due)
+            await engine.run_due()
+    finally:
+        clock.use(clock.SystemClock())
+    assert ran == [("a", 1001.0), ("b", 1005.0), ("a", 1011.0), ("b", 1015.0)]
+
+
+def test_replay_is_deterministic():
+    cmd = [sys.executable, str(ROOT / "benchmarks" / "bench_replay.py"), "3"]
+    env = {**os.environ, "ENV_PATH": "/dev/null"}
+    env.pop("DB_DSN", None)
+    runs = [
+        json.loads(subprocess.run(cmd, env=env, capture_output=True, check=True).stdout)
+        for _ in range(2)
+    ]
+    assert runs[0]["digest"] == runs[1]["digest"]
+    assert runs[0]["statuses"] == runs[1]["statuses"]
+    assert runs[0]["candidates"] == 15
+    assert runs[0]["throughput"]["speedup"] > 10
+
+
+RESTORED = """
+import json, sys
+sys.path.insert(0, sys.argv[1])
+import bench_replay
+from pumpfun_sniper import executor, jupiter, strategy
+from pumpfun_sniper.config import settings
+from pumpfun_sniper.pricefeed import prices
+
+names = lambda: [strategy.scheduler, strategy.quotes, jupiter._quote,
+                 executor.get_prices, executor.bonding_pcts]
+before, sim = names(), settings.SIMULATION
+bench_replay.run(2)
+print(json.dumps({"restored": [a is b for a, b in zip(before, names())],
+                  "simulation": settings.SIMULATION == sim,
+                  "listeners": executor.on_price not in prices._listeners}))
+"""
+
+
+def test_replay_restores_what_it_patched():
+    env = {**os.environ, "ENV_PATH": "/dev/null", "SIMULATION": "false"}
+    env.pop("DB_DSN", None)
+    out = subprocess.run(
+        [sys.executable, "-c", RESTORED, str(ROOT / "benchmarks")],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    res = json.loads(out.stdout.strip().splitlines()[-1])
+    assert res == {"restored": [True] * 5, "simulation": True, "listeners": True}
@@ -0,0 +1,70 @@
+import datetime as dt
+import gzip
+
+import pytest
+from sqlalchemy import select, text
+
+
+@pytest.mark.asyncio
+async def test_init_adds_indexes_to_an_existing_table(db):
+    async with db.engine.begin() as conn:  # as created by an older release
+        await conn.execute(text("DROP INDEX ix_candidates_status_created"))
+    await db.init()
+    async with db.session_ctx() as s:
+        plan = (
+            await s.execute(
+                text("EXPLAIN QUERY PLAN SELECT * FROM candidates WHERE status = 'NEW'")
+            )
+        ).all()
+    assert "ix_candidates_status_created" in " ".join(str(r[-1]) for r in plan)
+
+
+@pytest.mark.asyncio
+async def test_retention_archives_and_prunes_in_batches(db, tmp_path, monkeypatch):
+    from pumpfun_sniper.config import settings
+    from pumpfun_sniper.retention import Retention
+
+    monkeypatch.setattr(settings, "RETENTION_BATCH", 3)
+    monkeypatch.setattr(settings, "RETENTION_LOGS_DAYS", 7)
+    monkeypatch.setattr(settings, "RETENTION_REJECTED_DAYS", 3)
+    old = dt.datetime.utcnow() - dt.timedelta(days=30)
+    new = dt.datetime.utcnow()
+    async with db.session_ctx() as s:
+        for i in range(10):
+            s.add(
+                db.LogEntry(
+                    ts=old + dt.timedelta(hours=i), level="INFO", msg=f"old {i}"
+                )
+            )
+        s.add(db.LogEntry(ts=new, level="INFO", msg="new"))
+        rows = [(old, "REJECTED")] * 4 + [(old, "BOUGHT"), (new, "REJECTED")]
+        for i, (ts, status) in enumerate(rows):
+            s.add(
+                db.Candidate(
+                    mint=f"m{i}",
+                    name=f"n{i}",
+                    symbol="S",
+                    creator="c",
+                    created_at=ts,
+                    status=status,
+                )
+            )
+        await s.commit()
+
+    archive = tmp_path / "archive"
+    assert await Retention(str(archive)).run_once() == {"logs": 10, "candidates": 4}
+    await db.log_sink.close()  # write the summary line
+    async with db.session_ctx() as s:
+        logs = (await s.scalars(select(db.LogEntry.msg))).all()
+        cands = (
+            await s.scalars(select(db.Candidate.mint).order_by(db.Candidate.mint))
+        ).all()
+    assert logs[0] == "new"  # the retention summary line follows it
+    assert cands == ["m4", "m5"]  # BOUGHT and recent REJECTED kept
+
+    archived = {}
+    for p in sorted(archive.iterdir()):
+        table = p.name.split("-")[0]
+        with gzip.open(p) as fh:
+            archived[table] = archived.get(table, 0) + len(fh.readlines())
+    assert archived == {"logs": 10, "candidates": 4}
@@ -22,6 +22,7 @@ import types
 
 sys.modules["pumpfun_sniper.db"] = types.SimpleNamespace(log=lambda *a, **k: None)
 import pumpfun_sniper.rugcheck as rugcheck
+import pumpfun_sniper.rules
 
 
 @pytest.mark.asyncio
@@ -108,3 +109,98 @@ async def test_wait_until_good_timeout(monkeypatch):
     monkeypatch.setattr(rugcheck.settings, "RUG_RECHECK_SEC", 1)
 
     assert not await rugcheck.wait_until_good("mint", timeout_sec=0)
+
+
+@pytest.mark.asyncio
+async def test_scheduler_dedupes_caches_and_orders_by_priority(monkeypatch):
+    order = []
+
+    async def fake_fetch(mint: str):
+        order.append(mint)
+        await asyncio.sleep(0.01)
+        return {"mint": mint}
+
+    monkeypatch.setattr(rugcheck, "fetch", fake_fetch)
+    sched = rugcheck.Scheduler(rate=100, burst=1, workers=1)
+    reqs = [
+        sched.report("old", rugcheck.priority(170, 4)),
+        sched.report("fresh", rugcheck.priority(5, 1)),
+        sched.report("fresh", rugcheck.priority(5, 1)),
+    ]
+    res = await asyncio.gather(*reqs)
+    assert [r["mint"] for r in res] == ["old", "fresh", "fresh"]
+    assert order == ["fresh", "old"]  # one fetch per mint, best candidate first
+    assert await sched.report("old") == {"mint": "old"}  # served from cache
+    st = sched.stats()
+    assert st["deduped"] == 1 and st["cache_hits"] == 1 and st["fetched"] == 2
+
+
+@pytest.mark.asyncio
+async def test_scheduler_backs_off_on_429(monkeypatch):
+    calls = 0
+
+    async def fake_fetch(mint: str):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            req = rugcheck.httpx.Request("GET", "https://rugcheck.test")
+            resp = rugcheck.httpx.Response(
+                429, headers={"Retry-After": "0.05"}, request=req
+            )
+            raise rugcheck.httpx.HTTPStatusError("429", request=req, response=resp)
+        return {"ok": True}
+
+    monkeypatch.setattr(rugcheck, "fetch", fake_fetch)
+    sched = rugcheck.Scheduler(rate=100, burst=5, workers=1)
+    assert await sched.report("mint") == {"ok": True}
+    assert calls == 2 and sched.stats()["throttled"] == 1
+
+
+def test_fatal_conditions():
+    assert rugcheck.fatal({"rugged": True}) == "rugged"
+    assert rugcheck.fatal({"freezeAuthority": "Auth111"}) == "freeze authority enabled"
+    assert rugcheck.fatal({"mintAuthority": None, "freezeAuthority": None}) is None
+
+
+def test_rules_batch_matches_single_reports():
+    rules = rugcheck.book.current()
+    good = {
+        "totalHolders": 60,
+        "lpLockedPct": 80,
+        "creatorBalance": 200000000000,
+        "price": 1,
+        "token": {"decimals": 9},
+        "markets": [{"lp": {"tokenSupply": 2000000000000}}],
+    }
+    reports = {"good": good, "few": {**good, "totalHolders": 3}, "junk": {"token": 1}}
+    first = rules.evaluate(reports)
+    assert first == {"good": None, "few": "holders", "junk": "holders"}
+    for mint, tok in reports.items():
+        assert rules.failures(tok)[:1] == ([first[mint]] if first[mint] else [])
+
+
+def test_unreadable_report_fails_every_rule_including_ne():
+    rules = pumpfun_sniper.rules.RuleSet(
+        pumpfun_sniper.rules.parse("risk_count != 3; holders >= 0")
+    )
+    junk = {"totalHolders": "many"}  # unparsable: every feature is NaN
+    assert rules.failures(junk) == ["risk_count", "holders"]
+    assert rules.failures({"risks": [{}]}) == []  # 1 != 3
+    ok = rules.passes(rules.matrix([junk, {"risks": [{}] * 3}, {}]))
+    assert ok.tolist() == [[False, False], [False, True], [True, True]]
+
+
+def test_rules_file_hot_reload(tmp_path, monkeypatch):
+    path = tmp_path / "rules.txt"
+    path.write_text("min_holders: holders >= 10  # comment\n")
+    monkeypatch.setattr(rugcheck.settings, "FILTER_RULES_RELOAD_SEC", 0)
+    book = pumpfun_sniper.rules.RuleBook(path=str(path))
+    assert book.current().failures({"totalHolders": 5}) == ["min_holders"]
+    path.write_text("holders >= 1; risk_count <= 0")
+    os.utime(path, (1, 1))  # force a visible mtime change
+    assert book.current().failures({"totalHolders": 5, "risks": [{}]}) == ["risk_count"]
+    path.write_text("holders >>= 1")  # broken edit keeps the last good rules
+    os.utime(path, (2, 2))
+    assert book.current().names == ["holders", "risk_count"]
+    with pytest.raises(ValueError):
+        pumpfun_sniper.rules.parse("holders >= 1; vibes > 3")
@@ -0,0 +1,56 @@
+import pytest
+from sqlalchemy import insert, select
+
+
+@pytest.mark.asyncio
+async def test_bloom_filter_has_no_false_negatives(db):
+    from pumpfun_sniper.seen_index import BloomFilter
+
+    f = BloomFilter(20_000, error_rate=0.01)
+    keys = [f"token {i}" for i in range(20_000)]
+    for k in keys:
+        f.add(k)
+    assert all(k in f for k in keys)
+    false_pos = sum(f"other {i}" in f for i in range(20_000))
+    assert false_pos / 20_000 < 0.03
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("bloom", [False, True])
+async def test_load_check_and_add_name(db, bloom):
+    from pumpfun_sniper.seen_index import SeenIndex
+
+    async with db.session_ctx() as s:
+        await s.execute(
+            insert(db.SeenName), [{"name": f"old {i:03d}"} for i in range(25)]
+        )
+        await s.execute(insert(db.BlockedCreator), [{"creator": "bad"}])
+        await s.commit()
+
+    idx = SeenIndex(bloom=bloom, capacity=1000)
+    await idx.load(batch=10)  # pages of 10: three reads
+    assert idx.loaded
+    # a Bloom hit is never final: it is confirmed against the DB (None)
+    hit = None if bloom else True
+    assert [idx.check(f"old {i:03d}", "good") for i in range(25)] == [hit] * 25
+    assert idx.check("fresh", "bad") is True
+    assert idx.check("fresh", "good") is False
+    idx.add_name("fresh")
+    assert idx.check("fresh", "good") is hit
+
+
+@pytest.mark.asyncio
+async def test_block_creator_writes_once_and_reloads(db):
+    from pumpfun_sniper.seen_index import SeenIndex
+
+    idx = SeenIndex(bloom=False)
+    await idx.block_creator("rugger")
+    await idx.block_creator("rugger")  # already blocked: no second write
+    assert idx.check("x", "rugger") is True
+
+    async with db.session_ctx() as s:
+        rows = (await s.scalars(select(db.BlockedCreator.creator))).all()
+    assert rows == ["rugger"]
+    again = SeenIndex(bloom=False)
+    await again.load()
+    assert again.check("x", "rugger") is True
@@ -0,0 +1,129 @@
+import asyncio
+import datetime as dt
+import json
+
+import pytest
+from sqlalchemy import delete, update
+
+T = dt.datetime(2026, 1, 1, 12, 0, 0, 250000)
+
+
+@pytest.fixture
+def hubs(db, monkeypatch):
+    """Candidate (windowed) and log (append) hubs with 2‑event queues."""
+    from pumpfun_sniper.config import settings
+    from pumpfun_sniper.sse_hub import StreamHub
+
+    monkeypatch.setattr(settings, "SSE_POLL_SEC", 0.01)
+    monkeypatch.setattr(settings, "SSE_QUEUE_SIZE", 2)
+    cands = StreamHub(
+        db.Candidate,
+        ["mint", "status", "created_at"],
+        db.Candidate.created_at,
+        key="mint",
+    )
+    logs = StreamHub(
+        db.LogEntry, ["ts", "level", "msg"], db.LogEntry.ts, key="id", append=True
+    )
+    return cands, logs
+
+
+async def _write(db, *items):
+    """Add ORM rows / run statements in one transaction."""
+    async with db.session_ctx() as s:
+        for it in items:
+            if isinstance(it, db.Base):
+                s.add(it)
+            else:
+                await s.execute(it)
+        await s.commit()
+
+
+async def _seed(db):
+    """25 candidates in pairs sharing a sub‑second timestamp, and 25 logs."""
+    await _write(
+        db,
+        *(
+            db.Candidate(
+                mint=f"m{i:02d}",
+                name="n",
+                symbol="s",
+                creator="c",
+                created_at=T + dt.timedelta(milliseconds=i // 2),
+            )
+            for i in range(25)
+        ),
+        *(db.LogEntry(level="INFO", msg=f"l{i}") for i in range(25)),
+    )
+
+
+def _next(client):
+    return asyncio.wait_for(anext(client), 5)
+
+
+async def _pages(hub, key):
+    out, before = [], None
+    while True:
+        page = await hub.history(before, 10)
+        out += [r[key] for r in page["rows"]]
+        before = page["next"]
+        if before is None:
+            return out
+
+
+@pytest.mark.asyncio
+async def test_history_pages_across_timestamp_ties(db, hubs):
+    cands, logs = hubs
+    await _seed(db)
+    # every row exactly once, newest first; a page boundary splits a tie
+    assert await _pages(cands, "mint") == [f"m{i:02d}" for i in reversed(range(25))]
+    assert await _pages(logs, "id") == list(range(25, 0, -1))
+
+
+@pytest.mark.asyncio
+async def test_one_payload_for_all_clients_and_slow_ones_dropped(db, hubs):
+    _, logs = hubs
+    await _seed(db)
+    a, b, slow = logs.subscribe(), logs.subscribe(), logs.subscribe()
+    for c in (a, b, slow):
+        assert len(json.loads((await _next(c))["data"])) == 25
+
+    await _write(db, db.LogEntry(level="INFO", msg="fresh"))
+    ev_a, ev_b = await _next(a), await _next(b)
+    assert ev_a is ev_b  # serialised once for every client
+    assert ev_a["event"] == "upsert"
+    assert [r["msg"] for r in json.loads(ev_a["data"])] == ["fresh"]
+
+    for i in range(3):  # `slow` never reads: its queue overflows
+        await _write(db, db.LogEntry(level="INFO", msg=f"more{i}"))
+        await _next(a), await _next(b)
+    assert [e["event"] async for e in slow] == ["upsert"]
+    assert len(logs._subs) == 2
+
+    for c in (a, b):
+        await c.aclose()
+    assert logs._task is None
+
+
+@pytest.mark.asyncio
+async def test_window_streams_updates_and_deletes(db, hubs):
+    cands, _ = hubs
+    await _seed(db)
+    c = cands.subscribe()
+    await _next(c)
+
+    await _write(
+        db,
+        update(db.Candidate).where(db.Candidate.mint == "m00").values(status="BOUGHT"),
+    )
+    ev = await _next(c)
+    assert ev["event"] == "upsert"
+    assert [(r["mint"], r["status"]) for r in json.loads(ev["data"])] == [
+        ("m00", "BOUGHT")
+    ]
+
+    await _write(db, delete(db.Candidate).where(db.Candidate.mint == "m01"))
+    ev = await _next(c)
+    assert [ev["event"], json.loads(ev["data"])] == ["delete", ["m01"]]
+    await c.aclose()
+    assert cands._task is None
@@ -0,0 +1,53 @@
+import datetime as dt
+
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_buying_status_blocks_a_second_buy(db, monkeypatch):
+    from pumpfun_sniper import strategy
+    from pumpfun_sniper.broadcast import TxExpired, TxUnconfirmed
+    from pumpfun_sniper.config import settings
+    from pumpfun_sniper.evaluator import Evaluator
+
+    buys = []
+
+    async def buy(sol, mint, route=None, tx=None, wallet=None):
+        buys.append(mint)
+        if mint == "lost":
+            raise TxUnconfirmed("sent, no confirmation yet")
+        if mint == "expired":
+            raise TxExpired("blockhash expired")
+        return 1e-6, "sig"
+
+    monkeypatch.setattr(settings, "SIMULATION", True)
+    monkeypatch.setattr(strategy, "buy", buy)
+    mints = ("ok", "lost", "expired")
+    async with db.session_ctx() as s:
+        for m in mints:
+            s.add(
+                db.Candidate(
+                    mint=m,
+                    name=m,
+                    symbol="S",
+                    creator="c",
+                    created_at=dt.datetime(2026, 1, 1),
+                )
+            )
+        await s.commit()
+        rows = {m: await s.get(db.Candidate, m) for m in mints}
+
+    with pytest.raises(TxUnconfirmed):
+        await strategy._open(rows["lost"])
+    with pytest.raises(TxExpired):
+        await strategy._open(rows["expired"])
+    await strategy._open(rows["ok"])
+    await strategy._open(rows["ok"])  # stale job: already bought
+    await strategy._open(rows["lost"])  # sweep must not rebuy either
+
+    async with db.session_ctx() as s:
+        status = {m: (await s.get(db.Candidate, m)).status for m in mints}
+    assert status == {"ok": "BOUGHT", "lost": "BUYING", "expired": "NEW"}
+    assert sorted(buys) == ["expired", "lost", "ok"]
+    # only the expired buy is evaluated again
+    assert await strategy.submit_new(Evaluator(strategy.step_candidate)) == 1
@@ -0,0 +1,152 @@
+import asyncio
+import os
+import pathlib
+import sys
+import types
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[2]))
+
+for var in [
+    "HELIUS_WSS",
+    "RUGCHECK_KEY",
+    "BIRDEYE_KEY",
+    "BASE_WALLET",
+    "KEYPAIR_PATH",
+    "DB_DSN",
+]:
+    os.environ.setdefault(var, "test")
+os.environ.setdefault("ENV_PATH", "/dev/null")
+
+
+async def _alog(*a, **k):
+    return None
+
+
+sys.modules["pumpfun_sniper.db"] = types.SimpleNamespace(log=_alog)
+sys.modules.pop("solders.keypair", None)  # test_simulation stubs it
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.message import MessageV0
+from solders.transaction import VersionedTransaction
+
+import pumpfun_sniper.jupiter as jupiter
+from pumpfun_sniper.broadcast import TxExpired, TxUnconfirmed
+from pumpfun_sniper.wallets import WalletPool
+
+
+def _unsigned(payer: Keypair) -> bytes:
+    msg = MessageV0.try_compile(payer.pubkey(), [], [], Hash.default())
+    return bytes(VersionedTransaction(msg, [payer]))
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(jupiter.settings, "SIMULATION", False)
+    monkeypatch.setattr(jupiter.settings, "WALLET_MAX_INFLIGHT", 1)
+    monkeypatch.setattr(jupiter.settings, "WALLET_ASSIGN", "least_loaded")
+    p = WalletPool([Keypair() for _ in range(3)])
+    monkeypatch.setattr(jupiter, "pool", p)
+    return p
+
+
+def test_pick_rotates_idle_wallets_and_skips_unfunded(pool, monkeypatch):
+    a, b, c = pool.wallets
+    assert {pool.pick("m").pubkey for _ in range(3)} == {a.pubkey, b.pubkey, c.pubkey}
+    a.inflight, b.inflight = 1, 1
+    assert pool.pick("m") is c
+    c.balance = 0.001  # cannot afford the buy
+    assert pool.pick("m", sol=0.01) in (a, b)
+    monkeypatch.setattr(jupiter.settings, "WALLET_ASSIGN", "sticky")
+    assert len({pool.pick("MINT").pubkey for _ in range(5)}) == 1
+    assert pool.get(None) is a and pool.get(b.pubkey) is b
+    with pytest.raises(KeyError):
+        pool.get(str(Keypair().pubkey()))
+
+
+@pytest.mark.asyncio
+async def test_swaps_sign_with_their_wallet_and_respect_inflight(pool, monkeypatch):
+    a, b, _ = pool.wallets
+    sent, running, peak = [], {}, {}
+
+    async def quote(inp, out, amt):
+        return {"outAmount": 2_000_000_000}
+
+    async def swap_tx(route, urgency="entry", wallet=None):
+        return _unsigned(wallet.keypair), None
+
+    async def send(raw, last_valid=None, wallet=None):
+        assert jupiter._payer(raw) == wallet.pubkey
+        running[wallet.pubkey] = running.get(wallet.pubkey, 0) + 1
+        peak[wallet.pubkey] = max(peak.get(wallet.pubkey, 0), running[wallet.pubkey])
+        await asyncio.sleep(0.01)
+        running[wallet.pubkey] -= 1
+        sent.append(wallet.pubkey)
+        return f"sig{len(sent)}"
+
+    monkeypatch.setattr(jupiter, "_quote", quote)
+    monkeypatch.setattr(jupiter, "_swap_tx", swap_tx)
+    monkeypatch.setattr(jupiter, "_send", send)
+
+    a.balance = 1.0
+    await asyncio.gather(*(jupiter.buy(0.1, "m", wallet=a) for _ in range(3)))
+    assert peak[a.pubkey] == 1 and a.swaps == 3  # queued, not concurrent
+    assert a.balance == pytest.approx(0.7)
+
+    # a swap prebuilt for another wallet is rebuilt for the assigned one
+    await jupiter.buy(0.1, "m", {"outAmount": 1}, (_unsigned(a.keypair), None), b)
+    assert sent[-1] == b.pubkey
+
+    await jupiter.sell("m", 10, wallet=b.pubkey)
+    assert sent[-1] == b.pubkey
+    await jupiter.sell("m", 10)  # positions recorded before the pool
+    assert sent[-1] == a.pubkey
+    assert a.balance == pytest.approx(2.7)
+
+
+@pytest.mark.asyncio
+async def test_swap_is_rebuilt_only_when_the_old_one_cannot_land(monkeypatch):
+    builds, outcomes = [], []
+
+    async def swap_tx(route, urgency="entry", wallet=None):
+        builds.append(route)
+        return b"raw", None
+
+    async def send(raw, last_valid=None, wallet=None):
+        raise outcomes.pop(0)
+
+    monkeypatch.setattr(jupiter, "_swap_tx", swap_tx)
+    monkeypatch.setattr(jupiter, "_send", send)
+    monkeypatch.setattr(jupiter.settings, "BACKOFF_SEC", 0)
+
+    outcomes[:] = [TxExpired("x"), TxUnconfirmed("y")]
+    with pytest.raises(TxUnconfirmed):
+        await jupiter._swap_and_send({})
+    assert len(builds) == 2  # rebuilt after expiry, never after "unknown"
+
+
+@pytest.mark.asyncio
+async def test_prebuilt_buy_falls_back_only_when_it_cannot_land(pool, monkeypatch):
+    a = pool.wallets[0]
+    a.balance = 1.0
+    rebuilt = []
+
+    async def send(raw, last_valid=None, wallet=None):
+        raise outcome
+
+    async def swap_and_send(route, urgency="entry", wallet=None):
+        rebuilt.append(wallet.pubkey)
+        return "rebuilt"
+
+    monkeypatch.setattr(jupiter, "_send", send)
+    monkeypatch.setattr(jupiter, "_swap_and_send", swap_and_send)
+    prebuilt = (_unsigned(a.keypair), None)
+
+    outcome = TxExpired("blockhash expired, not landed")
+    _, sig = await jupiter.buy(0.1, "m", {"outAmount": 1}, prebuilt, a)
+    assert sig == "rebuilt"
+
+    outcome = TxUnconfirmed("may still land")
+    with pytest.raises(TxUnconfirmed):
+        await jupiter.buy(0.1, "m", {"outAmount": 1}, prebuilt, a)
+    assert rebuilt == [a.pubkey]  # no second buy